@@ -31,17 +31,21 @@ Example:
         $ python countries_api.py
 """
 
-import requests
 import json
 import pandas as pd
+from APIs.http_cache import fetch
+
+COUNTRIES_URL = "https://raw.githubusercontent.com/mledoze/countries/master/countries.json"
 
 # Fetch data
 def fetch_countries_data():
-    """Fetches country data from the mledoze/countries GitHub repository."""
-    url = "https://raw.githubusercontent.com/mledoze/countries/master/countries.json"
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
+    """
+    Fetches country data from the mledoze/countries GitHub repository.
+    The file is cached and only downloaded again when it has changed (ETag).
+    """
+    result = fetch(COUNTRIES_URL)
+    print(f"countries.json: {result.source}")
+    data = result.json()
 
     # Parse relevant fields
     countries = []
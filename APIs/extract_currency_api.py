@@ -24,8 +24,11 @@ Output Structure:
 Functions:
     - get_currency_info(country): Queries the RESTCountries API and returns 
     currency metadata.
+    - get_currency_infos(countries): Same for many countries, with the
+    requests issued concurrently through `APIs/http_cache.py` (cached on
+    disk, revalidated by ETag, retried with backoff).
     - build_currency_json(): Builds the currency lookup dictionary and writes
-    it to a JSON file.
+    it to a JSON file, then prints which responses came from cache vs network.
 
 Output:
     - Creates a single JSON file `currency_lookup.json` containing currency data for:
@@ -42,8 +45,8 @@ Example:
         $ python currency_cache_generator.py
 """
 
-import requests
 import json
+from APIs.http_cache import fetch, fetch_many, report
 
 # List of countries from your LP and individual account scripts
 countries = list(set([
@@ -51,6 +54,30 @@ countries = list(set([
     "France", "Australia", "Netherlands", "Japan", "India", "Brazil"
 ]))
 
+FALLBACK = ("USD", "US Dollar", 1.0)
+
+
+def _country_url(country):
+    return f"https://restcountries.com/v3.1/name/{country}?fullText=true"
+
+
+def _fx_url(currency_code):
+    return f"https://api.frankfurter.app/latest?from={currency_code}&to=USD"
+
+
+def _parse_currency(result):
+    """(currency_code, currency_name) from a restcountries response."""
+    data = result.json()[0]
+    currency_code = list(data["currencies"].keys())[0]
+    return currency_code, data["currencies"][currency_code]["name"]
+
+
+def _parse_fx(result, currency_code):
+    """Rate to USD from a Frankfurter response (USD itself is not quoted)."""
+    if currency_code == "USD":
+        return 1.0
+    return round(result.json()["rates"]["USD"], 4)
+
 
 def get_currency_info(country):
     """
@@ -59,35 +86,69 @@ def get_currency_info(country):
     """
     try:
         if country == "Unknown":
-            return "USD", "US Dollar", 1.0
+            return FALLBACK
 
         # Get currency code from restcountries
-        r = requests.get(f"https://restcountries.com/v3.1/name/{country}?fullText=true")
-        r.raise_for_status()
-        data = r.json()[0]
-        currency_code = list(data["currencies"].keys())[0]
-        currency_name = data["currencies"][currency_code]["name"]
+        currency_code, currency_name = _parse_currency(fetch(_country_url(country)))
 
         # Use Frankfurter API
-        fx_url = f"https://api.frankfurter.app/latest?from={currency_code}&to=USD"
-        fx_res = requests.get(fx_url)
-        fx_res.raise_for_status()
-        fx_data = fx_res.json()
-        fx_to_usd = round(fx_data["rates"]["USD"], 4)
+        fx_to_usd = 1.0 if currency_code == "USD" else _parse_fx(fetch(_fx_url(currency_code)), currency_code)
 
         return currency_code, currency_name, fx_to_usd
 
     except Exception as e:
         print(f"[WARNING] Failed to get FX for {country}: {e}")
-        return "USD", "US Dollar", 1.0
+        return FALLBACK
+
+
+def get_currency_infos(country_names):
+    """
+    Currency info for many countries at once: all restcountries lookups run
+    concurrently, then one Frankfurter request per distinct currency (e.g.
+    Germany, France and the Netherlands share the EUR request).
+
+    Returns:
+        tuple: ({country: (currency_code, currency_name, fx_to_usd)}, [FetchResult, ...]).
+        Countries whose lookup failed get the USD fallback and are listed in a warning.
+    """
+    names = [c for c in dict.fromkeys(country_names) if c != "Unknown"]
+    country_results = fetch_many(_country_url(c) for c in names)
+
+    currencies, failed = {}, []
+    for country in names:
+        try:
+            currencies[country] = _parse_currency(country_results[_country_url(country)])
+        except Exception as e:
+            failed.append(f"{country} ({e})")
+
+    codes = {code for code, _ in currencies.values() if code != "USD"}
+    fx_results = fetch_many(_fx_url(code) for code in sorted(codes))
+
+    infos = {"Unknown": FALLBACK} if "Unknown" in country_names else {}
+    for country in names:
+        if country not in currencies:
+            infos[country] = FALLBACK
+            continue
+        code, name = currencies[country]
+        try:
+            infos[country] = (code, name, _parse_fx(fx_results.get(_fx_url(code)), code))
+        except Exception as e:
+            failed.append(f"{country} ({e})")
+            infos[country] = FALLBACK
+
+    if failed:
+        print(f"[WARNING] Using USD/1.0 for {len(failed)} countries: {', '.join(failed)}")
+    return infos, list(country_results.values()) + list(fx_results.values())
+
 
 def build_currency_json():
     """
     Build dictionary for all countries and save as JSON
     """
+    infos, results = get_currency_infos(countries)
     cache = {}
     for country in countries:
-        code, name, fx = get_currency_info(country)
+        code, name, fx = infos[country]
         cache[country] = {
             "currency_code": code,
             "currency_name": name,
@@ -96,6 +157,7 @@ def build_currency_json():
 
     with open("JSON/currency_lookup.json", "w") as f:
         json.dump(cache, f, indent=2)
+    print("\n".join(report(results)))
 
 if __name__ == "__main__":
     build_currency_json()
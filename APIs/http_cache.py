@@ -0,0 +1,221 @@
+"""
+Shared HTTP fetch layer for the APIs/ enrichment scripts.
+
+`countries_api.py`, `extract_currency_api.py` and `sectors.py` fetch through
+this module instead of calling `requests.get` / `pd.read_csv(url)` directly:
+
+- Requests run concurrently on a thread pool (`fetch_many`), so per-country
+  lookups no longer cost one serial round-trip each.
+- Every response is kept on disk (`JSON/http_cache/`) with its ETag and
+  Last-Modified headers. The next request sends If-None-Match /
+  If-Modified-Since; a `304 Not Modified` reuses the stored body instead of
+  downloading the file again.
+- Connection errors, timeouts, 429 and 5xx responses are retried with
+  exponential backoff. Other 4xx responses are not retried.
+- When every attempt fails, the cached copy is served (marked `stale`) with a
+  warning. Set HTTP_OFFLINE=1 to serve only from the cache.
+
+Every result records where its body came from:
+
+| Source        | Meaning                                                    |
+|---------------|------------------------------------------------------------|
+| `network`     | downloaded (200)                                           |
+| `revalidated` | server answered 304; cached body reused                    |
+| `cache`       | served from cache without a request (max_age, HTTP_OFFLINE) |
+| `stale`       | request failed; cached body served                         |
+| `failed`      | request failed and nothing was cached                      |
+
+Usage:
+    from APIs.http_cache import fetch, fetch_many, summarize
+
+    countries = fetch(COUNTRIES_URL).json()
+    results = fetch_many([url_a, url_b, url_c])      # {url: FetchResult}
+    print(summarize(results.values()))               # 1 network, 2 revalidated
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "JSON", "http_cache")
+OFFLINE = os.getenv("HTTP_OFFLINE", "0") == "1"
+
+DEFAULT_TIMEOUT = 10      # seconds per request
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0     # seconds, doubled after every failed attempt
+DEFAULT_WORKERS = 8
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+SOURCES = ["network", "revalidated", "cache", "stale", "failed"]
+
+
+@dataclass
+class FetchResult:
+    url: str
+    source: str
+    body: Optional[bytes] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.body is not None
+
+    def json(self):
+        if self.body is None:
+            raise LookupError(f"No response for {self.url}: {self.error}")
+        return json.loads(self.body)
+
+    def text(self) -> str:
+        if self.body is None:
+            raise LookupError(f"No response for {self.url}: {self.error}")
+        return self.body.decode("utf-8")
+
+
+class HttpCache:
+    """On-disk response cache: `<sha256(url)>.body` plus `<sha256(url)>.json` (headers, fetch time)."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(url.encode()).hexdigest()}.{ext}")
+
+    def read(self, url: str):
+        """(meta, body) for `url`, or (None, None) when it has not been cached."""
+        meta_path, body_path = self._path(url, "json"), self._path(url, "body")
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None, None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            return meta, f.read()
+
+    def write(self, url: str, body: bytes, headers) -> None:
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        # Write-then-rename, so concurrent readers never see a partial file
+        for ext, data, mode in (("body", body, "wb"), ("json", json.dumps(meta), "w")):
+            path = self._path(url, ext)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def touch(self, url: str) -> None:
+        """Record a successful revalidation (304) as a fresh fetch."""
+        meta, _ = self.read(url)
+        if meta is not None:
+            meta["fetched_at"] = time.time()
+            with open(self._path(url, "json"), "w") as f:
+                json.dump(meta, f)
+
+
+def _conditional_headers(meta) -> Dict[str, str]:
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def fetch(url: str, cache: Optional[HttpCache] = None, session=None, timeout: float = DEFAULT_TIMEOUT,
+          retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+          max_age: Optional[float] = None, offline: Optional[bool] = None) -> FetchResult:
+    """
+    GET `url` through the cache.
+
+    Parameters:
+        max_age: serve the cached body without a request if it was fetched or
+            revalidated less than `max_age` seconds ago (default: always revalidate)
+        offline: serve only from the cache (default: HTTP_OFFLINE)
+
+    Returns:
+        FetchResult: `source` says where the body came from; `failed` results
+        have no body and carry the last error
+    """
+    cache = cache or HttpCache()
+    offline = OFFLINE if offline is None else offline
+    meta, body = cache.read(url)
+
+    if body is not None and (offline or (max_age is not None and time.time() - meta["fetched_at"] < max_age)):
+        return FetchResult(url, "cache", body)
+    if offline:
+        return FetchResult(url, "failed", error="not cached (HTTP_OFFLINE=1)")
+
+    import requests
+
+    http = session or requests
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            r = http.get(url, headers=_conditional_headers(meta), timeout=timeout)
+            if r.status_code == 304 and body is not None:
+                cache.touch(url)
+                return FetchResult(url, "revalidated", body, 304)
+            if r.status_code not in RETRY_STATUS:
+                r.raise_for_status()
+                cache.write(url, r.content, r.headers)
+                return FetchResult(url, "network", r.content, r.status_code)
+            error = f"HTTP {r.status_code}"
+        except requests.HTTPError as e:  # 4xx other than 429: retrying will not help
+            error = str(e)
+            break
+        except requests.RequestException as e:
+            error = str(e)
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+
+    if body is not None:
+        print(f"[WARNING] Using cached response for {url}: {error}")
+        return FetchResult(url, "stale", body, error=error)
+    print(f"[WARNING] Failed to fetch {url}: {error}")
+    return FetchResult(url, "failed", error=error)
+
+
+def fetch_many(urls: Iterable[str], max_workers: int = DEFAULT_WORKERS, **kwargs) -> Dict[str, FetchResult]:
+    """
+    Fetch every distinct URL concurrently (see `fetch` for the keyword arguments).
+
+    Returns:
+        dict: {url: FetchResult}, in the order the URLs were given
+    """
+    import requests
+
+    urls = list(dict.fromkeys(urls))
+    cache = kwargs.pop("cache", None) or HttpCache()
+    if not urls:
+        return {}
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        with ThreadPoolExecutor(max_workers=max_workers) as workers:
+            futures = {url: workers.submit(fetch, url, cache, session, **kwargs) for url in urls}
+    return {url: future.result() for url, future in futures.items()}
+
+
+def summarize(results: Iterable[FetchResult]) -> str:
+    """One-line count of results per source, e.g. '12 requests: 3 network, 9 revalidated'."""
+    results = list(results)
+    counts = {s: sum(r.source == s for r in results) for s in SOURCES}
+    parts = [f"{n} {s}" for s, n in counts.items() if n]
+    return f"{len(results)} requests: {', '.join(parts) or 'none'}"
+
+
+def report(results: Iterable[FetchResult]) -> List[str]:
+    """One line per result (source and URL), followed by the summary."""
+    results = list(results)
+    lines = [f"{r.source:<12} {r.url}" + (f"  ({r.error})" if r.error else "") for r in results]
+    return lines + [summarize(results)]
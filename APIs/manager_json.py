@@ -1,12 +1,44 @@
 """
 Fetch manager information from an API and store it as JSON.
+
+The manager pool is kept as line-delimited JSON (`JSON/managers.jsonl`), one
+compact record per manager with only the fields `FundManagerAssigner` uses:
+
+    {"first": "Liam", "last": "Schmidt"}
+
+- `fetch_managers` requests the pool from randomuser.me in concurrent pages
+  (same seed, so pages never overlap), projecting the response to the name
+  fields (`inc=name`). Pages go through `APIs/http_cache.py`, so a re-run
+  revalidates instead of downloading again.
+- `sample_managers` draws k records by line offset: it scans the file for
+  line starts and parses only the sampled lines, never the whole pool.
+- `convert_manager_json` turns a full randomuser document (the older
+  `manager_data.json`) into the same line-delimited format.
+
+Usage:
+    python -m APIs.manager_json 50000        # fetch 50k managers into JSON/managers.jsonl
+
+    from APIs.manager_json import sample_managers
+    names = sample_managers("JSON/managers.jsonl", 80)
 """
 
-import requests
+import itertools
 import json
+import os
+import random
+import sys
+from typing import Dict, Iterable, List
+
+MANAGERS_PATH = "JSON/managers.jsonl"
+DEFAULT_MANAGERS = 2000
+PAGE_SIZE = 1000          # records per request (randomuser allows up to 5000)
+SEED = "vc-capstone"
+
 
 def fetch_manager_json(save_path="manager_data.json"):
         """Fetch manager information from API and store raw JSON and write to file."""
+        import requests
+
         r = requests.get(f"https://randomuser.me/api/?results={2000}&nat=us")
         r.raise_for_status()
         manager_json = r.json()["results"]
@@ -14,5 +46,84 @@ def fetch_manager_json(save_path="manager_data.json"):
             json.dump(manager_json, f, indent=2)
 
 
+def _project(user: Dict) -> Dict[str, str]:
+    """Keep only the fields the assigner uses."""
+    return {"first": user["name"]["first"], "last": user["name"]["last"]}
+
+
+def _write_jsonl(records: Iterable[Dict[str, str]], save_path: str) -> int:
+    n = 0
+    tmp = f"{save_path}.tmp"
+    with open(tmp, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            n += 1
+    os.replace(tmp, save_path)
+    return n
+
+
+def fetch_managers(n_managers=DEFAULT_MANAGERS, save_path=MANAGERS_PATH, page_size=PAGE_SIZE, seed=SEED):
+    """
+    Fetch `n_managers` records in concurrent pages and write them as JSONL.
+
+    Returns:
+        int: number of records written
+    """
+    from APIs.http_cache import fetch_many, summarize
+
+    pages = -(-n_managers // page_size)
+    urls = [f"https://randomuser.me/api/?results={page_size}&page={p}&seed={seed}&nat=us&inc=name"
+            for p in range(1, pages + 1)]
+    results = fetch_many(urls)
+    print(summarize(results.values()))
+    failed = [url for url in urls if not results[url].ok]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(urls)} manager pages could not be fetched")
+
+    # Page order, so the pool is the same on every run
+    users = (user for url in urls for user in results[url].json()["results"])
+    return _write_jsonl((_project(u) for u in itertools.islice(users, n_managers)), save_path)
+
+
+def convert_manager_json(json_path="JSON/manager_data.json", save_path=MANAGERS_PATH):
+    """Rewrite a full randomuser document as the projected JSONL pool, keeping record order."""
+    with open(json_path, "r") as f:
+        users = json.load(f)
+    return _write_jsonl((_project(u) for u in users), save_path)
+
+
+def line_offsets(path: str) -> List[int]:
+    """Byte offset of every line in `path`, found without parsing any JSON."""
+    offsets, pos = [], 0
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                offsets.append(pos)
+            pos += len(line)
+    return offsets
+
+
+def sample_managers(path=MANAGERS_PATH, k=DEFAULT_MANAGERS, rng=random) -> List[Dict[str, str]]:
+    """
+    Draw `k` records from a JSONL pool, parsing only the drawn lines.
+
+    Without replacement while `k` fits the pool; past its size, records are
+    drawn with replacement. Uses `rng` exactly as random.sample/choices on the
+    full list would, so results match loading the whole pool.
+    """
+    offsets = line_offsets(path)
+    if k <= len(offsets):
+        picks = rng.sample(range(len(offsets)), k)
+    else:
+        picks = rng.choices(range(len(offsets)), k=k)
+    records = {}
+    with open(path, "rb") as f:
+        for i in sorted(set(picks)):  # read forward through the file once
+            f.seek(offsets[i])
+            records[i] = json.loads(f.readline())
+    return [records[i] for i in picks]
+
+
 if __name__ == "__main__":
-    fetch_manager_json("manager_data.json")  
\ No newline at end of file
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MANAGERS
+    print(f"Wrote {fetch_managers(n)} managers to {MANAGERS_PATH}")
@@ -31,14 +31,19 @@ Example:
         $ python gics_sector_extractor.py
 """
 
+import io
 import pandas as pd
 # Use the functions from countries_api.py so we do not have to rewrite functions
 from APIs.countries_api import json_output
+from APIs.http_cache import fetch
+
+GICS_URL = "https://gist.githubusercontent.com/uknj/c9bcf66ab379a35fcc8758f9a6c86ceb/raw"
 
 def get_gics_sectors():
-# Load full GICS classification from GitHub Gist
-    url = "https://gist.githubusercontent.com/uknj/c9bcf66ab379a35fcc8758f9a6c86ceb/raw"
-    df = pd.read_csv(url)
+# Load full GICS classification from GitHub Gist (cached; revalidated by ETag)
+    result = fetch(GICS_URL)
+    print(f"GICS classification: {result.source}")
+    df = pd.read_csv(io.StringIO(result.text()))
 
     # Extract unique top-level sectors
     sectors_df = df[['Sector Code', 'Sector']].drop_duplicates().sort_values('Sector Code').reset_index(drop=True)
@@ -35,18 +35,14 @@ association is unique.
 
 import pandas as pd
 import random
-import os
-from path_helpers import get_csv_path
+from table_io import read_table, write_table
+from scale import account_ids
 
 # Import the necessary information
-benchmark_general_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'benchmark_general.csv')
-benchmark_general_path = os.path.abspath(benchmark_general_path)
+df_benchmark_general = read_table('benchmark_general')
 
-df_benchmark_general = pd.read_csv(benchmark_general_path)
-
-# 1. Simulate 50 account IDs (ACC0001, ACC0002, ...)
-NUM_ACCOUNTS = 50
-ACCOUNT_IDS = [f"ACC{i+1:04}" for i in range(NUM_ACCOUNTS)]
+# 1. Account IDs (ACC0001, ACC0002, ...) matching the accounts table at this scale factor
+ACCOUNT_IDS = account_ids()
 
 BENCHMARK_CODES = df_benchmark_general["BENCHMARK_CODE"].tolist()
 
@@ -73,8 +69,7 @@ if df_benchmark_account_association.duplicated(subset=["ACCOUNT_ID", "BENCHMARK_
 print("BENCHMARK_ACCOUNT_ASSOCIATION")
 print(df_benchmark_account_association.head())
 
-output_file_path = get_csv_path('benchmark_account_association.csv')
-df_benchmark_account_association.to_csv(output_file_path, index=False)
+write_table(df_benchmark_account_association, 'benchmark_account_association')
 
 # -- Snowflake SQL table creation
 
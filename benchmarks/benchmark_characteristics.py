@@ -22,7 +22,7 @@ inferred from benchmark names and regional mapping.
 | `CATEGORY_NAME`         | String    | `Venture Capital` | Always set as 'Venture Capital'                      |
 | `CHARACTERISTIC_NAME`   | String    | `Median IRR`      | Statistic label (e.g., Median IRR, Mean MOIC, etc.)  |
 | `STATISTIC_TYPE`        | String    | `Median`          | Underlying type (Median, Count, NumSecurities, etc.) |
-| `UNIT`                  | String    | `%`               | Unit for the value (%, #, etc.)                      |
+| `UNIT`                  | String    | `%`               | Unit of the summarized metric: % (IRR), x (MOIC, DPI), # (counts) |
 | `CHARACTERISTIC_VALUE`  | Float/Int | `10.5`            | Simulated value, type depends on characteristic      |
 | `HISTORY_DATE`          | Date      | `2025-07-30`      | As-of date (current date or snapshot)                |
 
@@ -35,37 +35,39 @@ inferred from benchmark names and regional mapping.
 | **2. Name-Based Metadata Extraction**  | Currency, region, and sector are inferred from benchmark name if possible, otherwise assigned randomly with controlled weights.          |
 | **3. Simulation Logic**                | All values (e.g., IRR, MOIC, COUNT, NUM_SECURITIES) are simulated using business logic and controlled random distributions.              |
 | **4. Range Validation**                | Ranges and types enforced for realism and clean data (e.g., IRR 5–25%, FUND_COUNT 40–150, NUM_SECURITIES 20–500, S&P 500 set to 500, etc.) |
+| **5. Data-Driven Mode**                | With `BENCHMARK_CHARACTERISTICS_MODE=data` (or `streaming`), Median IRR, Mean MOIC, Top Quartile DPI, Fund Count and Std Dev IRR are computed from the fund universe by `benchmark_universe_stats.py`; benchmarks with no member holdings fall back to simulation. |
 """
 
 import pandas as pd
 import numpy as np
 import random
-import yfinance as yf
 from datetime import datetime
 import os
-from path_helpers import get_csv_path
+from table_io import read_table, write_table
+from scale import size
+from benchmarks.benchmark_universe_stats import compute_universe_stats, compute_universe_stats_streaming
+from benchmarks.index_fetch import fetch_infos
 
 # Ensure reproducibility
 random.seed(42)
 np.random.seed(42)
 
-# Define paths to the CSV files
-benchmark_general_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'benchmark_general.csv')
-benchmark_general_path = os.path.abspath(benchmark_general_path)
-
-df_benchmark_general = pd.read_csv(benchmark_general_path)
+# Load the benchmark list
+df_benchmark_general = read_table('benchmark_general')
 
 BENCHMARK_CODES = df_benchmark_general["BENCHMARK_CODE"].tolist()
 BENCHMARK_NAMES = df_benchmark_general["BENCHMARK_NAME"].tolist()
 
-UNIT_MAP = {
-    "Median":     "%",
-    "Mean":       "%",
-    "Percentile": "%",
-    "Count":      "#",
-    "StdDevIRR":  "%",
-    "NumSecurities": "#"
+# Unit of a characteristic comes from the metric it summarizes (a median IRR is
+# a %, a mean MOIC a multiple); counts carry no metric
+METRIC_UNITS = {
+    "IRR":  "%",
+    "MOIC": "x",
+    "TVPI": "x",
+    "DPI":  "x",
+    "RVPI": "x",
 }
+COUNT_UNIT = "#"
 
 # SHOULD THESE BE CALLS TO OUR APIS!!!!!!
 
@@ -81,15 +83,23 @@ REGION_CURRENCY_MAP = {
 }
 
 CHAR_DEFS = [
-    {"name": "Median IRR",      "type": "Median"},
-    {"name": "Mean MOIC",       "type": "Mean"},
-    {"name": "Top Quartile DPI","type": "Percentile"},
-    {"name": "Fund Count",      "type": "Count"},
-    {"name": "Std Dev IRR",     "type": "StdDevIRR"},
-    {"name": "# of Securities", "type": "NumSecurities"}
+    {"name": "Median IRR",      "type": "Median",        "metric": "IRR"},
+    {"name": "Mean MOIC",       "type": "Mean",          "metric": "MOIC"},
+    {"name": "Top Quartile DPI","type": "Percentile",    "metric": "DPI"},
+    {"name": "Fund Count",      "type": "Count",         "metric": None},
+    {"name": "Std Dev IRR",     "type": "StdDevIRR",     "metric": "IRR"},
+    {"name": "# of Securities", "type": "NumSecurities", "metric": None}
 ]
 
-INCEPTION_YEARS = list(range(2010, 2023))
+# Source of the fund statistics (Median IRR, Mean MOIC, Top Quartile DPI,
+# Fund Count, Std Dev IRR):
+#   "simulated" - random draws (original behaviour)
+#   "data"      - grouped quantiles over holdings_metrics joined to holdings
+#   "streaming" - same statistics via a chunked quantile sketch
+CHARACTERISTICS_MODE = os.getenv("BENCHMARK_CHARACTERISTICS_MODE", "simulated")
+
+# 2010-2022 at SCALE_FACTOR=1; larger scale factors reach further back for longer histories
+INCEPTION_YEARS = list(range(2022 - size("history_quarters") // 4, 2023))
 TODAY = datetime.today().strftime('%Y-%m-%d')
 
 # Fixed securities for known indices
@@ -105,10 +115,14 @@ INDEX_META = {
     "R2500":    {"yf": "^R25I"},  # Note: "R25I" is not always present; "IWM" or "^RUT" are common proxies for Russell 2000
     "MSCI_WD":  {"yf": "URTH"},   # MSCI World ETF as proxy; "URTH" trades in USD; for exact, use "MXWO.L" for GBP
 }
+# All index metadata is requested concurrently (timeouts, retries, local cache)
+INDEX_INFO = fetch_infos([INDEX_META[c]["yf"] for c in BENCHMARK_CODES if c in INDEX_META])
+
 def get_index_info(bench_code):
     yf_code = INDEX_META[bench_code]["yf"]
-    ticker = yf.Ticker(yf_code)
-    info = ticker.info
+    if yf_code not in INDEX_INFO:
+        raise LookupError(f"No metadata for {yf_code}")
+    info = INDEX_INFO[yf_code]
 
     # Inception year: get first available data or fund inception
     if "firstTradeDateEpochUtc" in info:
@@ -125,7 +139,24 @@ def get_index_info(bench_code):
     currency_name = CURRENCY_NAME_MAP.get(currency_code, "Unknown")
     return year, currency_code, currency_name
 
-# --- 2. Main Simulation ---
+# --- 2. Fund universe statistics (data-driven modes) ---
+UNIVERSE_STATS = {}
+if CHARACTERISTICS_MODE == "data":
+    stats_df = compute_universe_stats(BENCHMARK_CODES)
+elif CHARACTERISTICS_MODE == "streaming":
+    stats_df = compute_universe_stats_streaming(BENCHMARK_CODES)
+elif CHARACTERISTICS_MODE == "simulated":
+    stats_df = None
+else:
+    raise ValueError(f"Unknown BENCHMARK_CHARACTERISTICS_MODE: {CHARACTERISTICS_MODE}")
+
+if stats_df is not None:
+    UNIVERSE_STATS = {
+        (code, name): value for code, name, value in
+        stats_df[["BENCHMARK_CODE", "CHARACTERISTIC_NAME", "CHARACTERISTIC_VALUE"]].itertuples(index=False)
+    }
+
+# --- 3. Main Simulation ---
 char_records = []
 for bench_code, bench_name in zip(BENCHMARK_CODES, BENCHMARK_NAMES):
     if bench_code in INDEX_META:
@@ -148,7 +179,10 @@ for bench_code, bench_name in zip(BENCHMARK_CODES, BENCHMARK_NAMES):
         currency_name = CURRENCY_NAME_MAP[currency_code]
 
     for char in CHAR_DEFS:
-        if char["type"] == "Count":
+        if (bench_code, char["name"]) in UNIVERSE_STATS:
+            # Computed from the fund universe
+            value = UNIVERSE_STATS[(bench_code, char["name"])]
+        elif char["type"] == "Count":
             value = np.random.randint(40, 150)
         elif char["type"] == "NumSecurities":
             # Use fixed value if known benchmark, else randomize
@@ -168,7 +202,7 @@ for bench_code, bench_name in zip(BENCHMARK_CODES, BENCHMARK_NAMES):
             "CATEGORY_NAME":          "Venture Capital",
             "CHARACTERISTIC_NAME":    char["name"],
             "STATISTIC_TYPE":         char["type"],
-            "UNIT":                   UNIT_MAP[char["type"]],
+            "UNIT":                   METRIC_UNITS[char["metric"]] if char["metric"] else COUNT_UNIT,
             "CHARACTERISTIC_VALUE":   value,
             "HISTORY_DATE":           TODAY
         })
@@ -178,8 +212,7 @@ print("\nBENCHMARK_CHARACTERISTICS")
 print(df_benchmark_characteristics.head())
 
 # Write the product_master_df to a CSV file in the CSVs folder
-output_file_path = get_csv_path('benchmark_characteristics.csv')
-df_benchmark_characteristics.to_csv(output_file_path, index=False)
+write_table(df_benchmark_characteristics, 'benchmark_characteristics')
 
 
 # -- Snowflake SQL table creation
@@ -0,0 +1,233 @@
+"""
+The `BENCHMARK_COMPOSITE` tables hold the blended benchmark series that each
+LP account is actually measured against. `BENCHMARK_ACCOUNT_ASSOCIATION`
+assigns every account 2–3 benchmarks with a `RANK`; this module turns those
+ranked sets into a single composite price index per distinct benchmark mix.
+
+### Composite Logic
+
+| Step                      | Description                                                                                                   |
+|---------------------------|---------------------------------------------------------------------------------------------------------------|
+| 1. Common Calendar        | Daily public indices are resampled to quarter-end (`QE-DEC`, last close) so they line up with the synthetic quarterly VC series. |
+| 2. Quarterly Returns      | Each benchmark's quarter-end level is converted to a simple quarterly return.                                 |
+| 3. Rank Weights           | `RANK` is mapped to a weight via `DEFAULT_RANK_WEIGHTS` (configurable). Weights are normalized per account.     |
+| 4. Blending               | Composite return = weighted sum of constituent returns; weights are re-normalized over the constituents that have data in that quarter. |
+| 5. Index Construction     | Composite returns are compounded into a price-level index starting at 100.                                    |
+| 6. Materialization        | Accounts with the same (benchmark, weight) mix share one `COMPOSITE_CODE`, so each composite is built once.    |
+| 7. Cache Invalidation     | Each composite is fingerprinted from its weights and constituent quarterly levels; only composites whose fingerprint changed are rebuilt. |
+
+### Output Schema: `benchmark_composite_performance.csv`
+
+| Column           | Description                                   | Example      |
+|------------------|-----------------------------------------------|--------------|
+| `COMPOSITE_CODE` | Stable code derived from the benchmark mix    | CMP_1A2B3C4D |
+| `HISTORY_DATE`   | Quarter-end date                              | 2022-09-30   |
+| `RETURN`         | Blended quarterly return                      | 0.0213       |
+| `VALUE`          | Composite index level (base = 100)            | 131.07       |
+
+### Output Schema: `benchmark_composite_account_map.csv`
+
+| Column           | Description                                   | Example      |
+|------------------|-----------------------------------------------|--------------|
+| `ACCOUNT_ID`     | Account code (FK to `ACCOUNTS_MASTER`)        | ACC0001      |
+| `COMPOSITE_CODE` | Composite the account is measured against     | CMP_1A2B3C4D |
+| `BENCHMARK_CODE` | Constituent benchmark                         | SP_500       |
+| `RANK`           | Constituent rank from the association table   | 1            |
+| `WEIGHT`         | Normalized constituent weight                 | 0.6          |
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from path_helpers import get_csv_path
+from instrument import instrumented
+
+# Weight given to each RANK before per-account normalization
+DEFAULT_RANK_WEIGHTS = {1: 0.6, 2: 0.3, 3: 0.1}
+
+# Calendar every series is aligned onto (quarter-end, December year end)
+COMPOSITE_FREQUENCY = "QE-DEC"
+
+COMPOSITE_PERFORMANCE_FILE = "benchmark_composite_performance.csv"
+COMPOSITE_ACCOUNT_MAP_FILE = "benchmark_composite_account_map.csv"
+COMPOSITE_MANIFEST_FILE = "benchmark_composite_manifest.json"
+
+
+def align_benchmark_levels(df_performance, freq=COMPOSITE_FREQUENCY):
+    """
+    Pivot BENCHMARK_PERFORMANCE into a wide (date x benchmark) frame of
+    period-end levels. Daily series are resampled to `freq` using the last
+    available close; quarterly series simply land on their quarter-end.
+    """
+    df = df_performance[["BENCHMARK_CODE", "HISTORY_DATE", "VALUE"]].copy()
+    df["HISTORY_DATE"] = pd.to_datetime(df["HISTORY_DATE"])
+    wide = df.pivot_table(index="HISTORY_DATE", columns="BENCHMARK_CODE",
+                          values="VALUE", aggfunc="last").sort_index()
+    return wide.resample(freq).last()
+
+
+def build_composite_definitions(df_association, rank_weights=None):
+    """
+    Attach a normalized WEIGHT to every association row and group accounts
+    that share the same (benchmark, weight) mix under one COMPOSITE_CODE.
+
+    Returns:
+        pd.DataFrame: ACCOUNT_ID, COMPOSITE_CODE, BENCHMARK_CODE, RANK, WEIGHT
+    """
+    rank_weights = rank_weights or DEFAULT_RANK_WEIGHTS
+    df = df_association[["ACCOUNT_ID", "BENCHMARK_CODE", "RANK"]].copy()
+
+    unknown = set(df["RANK"]) - set(rank_weights)
+    if unknown:
+        raise ValueError(f"No weight configured for RANK values: {sorted(unknown)}")
+
+    df["WEIGHT"] = df["RANK"].map(rank_weights).astype(float)
+    df["WEIGHT"] = df["WEIGHT"] / df.groupby("ACCOUNT_ID")["WEIGHT"].transform("sum")
+
+    # Signature of each account's mix, independent of row order
+    df = df.sort_values(["ACCOUNT_ID", "BENCHMARK_CODE"])
+    signatures = df.groupby("ACCOUNT_ID").apply(
+        lambda x: ";".join(f"{c}:{w:.6f}" for c, w in zip(x["BENCHMARK_CODE"], x["WEIGHT"])),
+        include_groups=False
+    )
+    codes = {
+        sig: "CMP_" + hashlib.sha1(sig.encode("utf-8")).hexdigest()[:8].upper()
+        for sig in signatures.unique()
+    }
+    df["COMPOSITE_CODE"] = df["ACCOUNT_ID"].map(signatures.map(codes))
+
+    return df[["ACCOUNT_ID", "COMPOSITE_CODE", "BENCHMARK_CODE", "RANK", "WEIGHT"]] \
+        .sort_values(["ACCOUNT_ID", "RANK"]).reset_index(drop=True)
+
+
+def blend_composite(levels, weights):
+    """
+    Blend aligned benchmark levels into one composite series.
+
+    Parameters:
+        levels (pd.DataFrame): Wide period-end levels from `align_benchmark_levels`.
+        weights (pd.Series): Normalized weights indexed by BENCHMARK_CODE.
+
+    Returns:
+        pd.DataFrame: HISTORY_DATE, RETURN, VALUE
+    """
+    missing = set(weights.index) - set(levels.columns)
+    if missing:
+        raise ValueError(f"No performance history for benchmarks: {sorted(missing)}")
+
+    returns = levels[weights.index].pct_change(fill_method=None)
+    w = weights.to_numpy()
+
+    # Re-normalize the weights over the constituents reporting in each period
+    available = returns.notna().to_numpy()
+    weight_sum = (available * w).sum(axis=1)
+    blended = np.nansum(returns.to_numpy() * w, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        blended = np.where(weight_sum > 0, blended / weight_sum, np.nan)
+
+    composite = pd.Series(blended, index=levels.index).dropna()
+    value = 100 * (1 + composite).cumprod()
+
+    return pd.DataFrame({
+        "HISTORY_DATE": composite.index.date,
+        "RETURN": composite.round(6).to_numpy(),
+        "VALUE": value.round(2).to_numpy()
+    })
+
+
+def _composite_fingerprint(levels, weights):
+    """Hash the weights and constituent levels a composite is built from."""
+    h = hashlib.sha256()
+    for code, weight in weights.sort_index().items():
+        series = levels[code].dropna()
+        h.update(f"{code}:{weight:.6f}".encode("utf-8"))
+        h.update(series.index.asi8.tobytes())
+        h.update(series.to_numpy(dtype="float64").tobytes())
+    return h.hexdigest()
+
+
+@instrumented()
+def materialize_composites(df_performance, df_association, rank_weights=None,
+                           freq=COMPOSITE_FREQUENCY, output_dir=None):
+    """
+    Build every distinct composite once and write the composite series and
+    account map next to the other CSVs. A manifest of fingerprints is kept so
+    that re-running only rebuilds composites whose inputs changed.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (composite performance, account map)
+    """
+    def out_path(name):
+        return os.path.join(output_dir, name) if output_dir else get_csv_path(name)
+
+    levels = align_benchmark_levels(df_performance, freq=freq)
+    account_map = build_composite_definitions(df_association, rank_weights)
+
+    manifest_path = out_path(COMPOSITE_MANIFEST_FILE)
+    performance_path = out_path(COMPOSITE_PERFORMANCE_FILE)
+    manifest, cached = {}, pd.DataFrame()
+    if os.path.exists(manifest_path) and os.path.exists(performance_path):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("freq") == freq:
+            cached = pd.read_csv(performance_path)
+        else:
+            manifest = {}
+    fingerprints = manifest.get("fingerprints", {})
+
+    definitions = account_map.drop_duplicates(["COMPOSITE_CODE", "BENCHMARK_CODE"])
+    frames, new_fingerprints, rebuilt = [], {}, 0
+    for composite_code, members in definitions.groupby("COMPOSITE_CODE"):
+        weights = members.set_index("BENCHMARK_CODE")["WEIGHT"]
+        missing = sorted(set(weights.index) - set(levels.columns))
+        if missing:
+            print(f"[WARNING] Skipping {composite_code}: no performance history for {missing}")
+            continue
+        fingerprint = _composite_fingerprint(levels, weights)
+        new_fingerprints[composite_code] = fingerprint
+
+        if fingerprints.get(composite_code) == fingerprint and not cached.empty:
+            series = cached[cached["COMPOSITE_CODE"] == composite_code]
+            if not series.empty:
+                frames.append(series)
+                continue
+
+        series = blend_composite(levels, weights)
+        series.insert(0, "COMPOSITE_CODE", composite_code)
+        frames.append(series)
+        rebuilt += 1
+
+    df_composite_performance = pd.concat(frames, ignore_index=True)[[
+        "COMPOSITE_CODE", "HISTORY_DATE", "RETURN", "VALUE"
+    ]]
+
+    df_composite_performance.to_csv(performance_path, index=False)
+    account_map.to_csv(out_path(COMPOSITE_ACCOUNT_MAP_FILE), index=False)
+    with open(manifest_path, "w") as f:
+        json.dump({"freq": freq, "fingerprints": new_fingerprints}, f, indent=2)
+
+    print(f"Composites: {len(new_fingerprints)} total, {rebuilt} rebuilt, "
+          f"{len(new_fingerprints) - rebuilt} reused from cache.")
+    return df_composite_performance, account_map
+
+
+def get_account_composite(account_id, df_composite_performance, account_map):
+    """Return the materialized composite series for a single account."""
+    codes = account_map.loc[account_map["ACCOUNT_ID"] == account_id, "COMPOSITE_CODE"].unique()
+    if len(codes) == 0:
+        raise ValueError(f"No benchmark composite defined for account {account_id}.")
+    return df_composite_performance[df_composite_performance["COMPOSITE_CODE"] == codes[0]]
+
+
+if __name__ == "__main__":
+    df_benchmark_performance = pd.read_csv(get_csv_path('benchmark_performance.csv'))
+    df_benchmark_account_association = pd.read_csv(get_csv_path('benchmark_account_association.csv'))
+
+    df_composite_performance, df_composite_account_map = materialize_composites(
+        df_benchmark_performance, df_benchmark_account_association
+    )
+
+    print("\nBENCHMARK_COMPOSITE_PERFORMANCE")
+    print(df_composite_performance.head())
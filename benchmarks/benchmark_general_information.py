@@ -37,15 +37,9 @@ We generate 7 unique synthetic records using one of three patterns:
 | 6. Uniqueness**          | Appends numeric suffixes (`_2`, `_3`, etc.) if a generated code already exists                |
 """
 
-import pandas as pd
-import numpy as np
 import random
 import re
-from path_helpers import get_csv_path
-
-# Ensure reproducibility
-random.seed(42)
-np.random.seed(42)
+from scale import size
 
 def get_provider_prefix(name: str) -> str:
     """
@@ -90,73 +84,95 @@ GEO_SUFFIXES     = ["Venture Capital Index", "VC Benchmark", "Private Equity Ind
 SECTOR_SUFFIXES  = ["VC Performance Index", "Venture Capital Index", "Private Equity Index", "Growth Equity Benchmark"]
 COMBO_SUFFIXES   = ["Venture Capital Index", "Growth Index", "VC Performance Index"]
 
-BENCHMARK_NAMES = []
-BENCHMARK_CODES = []
-USED_CODES      = set()
-
-# Add 3 traditional benchmarks
+# The 3 traditional benchmarks
 TRADITIONAL = [
     ("SP_500",  "S&P 500 Index"),
     ("R2500",   "Russell 2500 Index"),
     ("MSCI_WD", "MSCI World Index")
 ]
-for code, name in TRADITIONAL:
-    USED_CODES.add(code)
-    BENCHMARK_CODES.append(code)
-    BENCHMARK_NAMES.append(name)
-
-# Generate exactly 7 synthetic benchmark entries
-for _ in range(7):  # Change n here if more benchmarks are needed
-    provider = random.choice(PROVIDERS)
-    pattern  = random.choice(["geo", "sector", "combo"])
-
-    if pattern == "geo":
-        region_full = random.choice(GEOGRAPHIES)
-        suffix      = random.choice(GEO_SUFFIXES)
-        name        = f"{provider} {region_full} {suffix}"
-        pfx = get_provider_prefix(provider)
-        rfx = REGION_MAP[region_full]
-        base_code = f"{pfx}_{rfx}"
-
-    elif pattern == "sector":
-        sector_full = random.choice(SECTORS)
-        suffix      = random.choice(SECTOR_SUFFIXES)
-        name        = f"{provider} {sector_full} {suffix}"
-        pfx = get_provider_prefix(provider)
-        sfx = SECTOR_CODE_MAP[sector_full]
-        base_code = f"{pfx}_{sfx}"
-
-    else:
-        region_full = random.choice(GEOGRAPHIES)
-        sector_full = random.choice(SECTORS)
-        suffix      = random.choice(COMBO_SUFFIXES)
-        name        = f"{provider} {region_full} {sector_full} {suffix}"
-        pfx = get_provider_prefix(provider)
-        rfx = REGION_MAP[region_full]
-        sfx = SECTOR_CODE_MAP[sector_full]
-        base_code = f"{pfx}_{rfx}_{sfx}"
-
-    # Ensure uniqueness
-    code = base_code
-    counter = 1
-    while code in USED_CODES:
-        counter += 1
-        code = f"{base_code}_{counter}"
-    USED_CODES.add(code)
-
-    BENCHMARK_NAMES.append(name)
-    BENCHMARK_CODES.append(code)
-
-# Assemble into a DataFrame with UPPER_SNAKE_CASE column names
-df_benchmark_general = pd.DataFrame({
-    "BENCHMARK_CODE":  BENCHMARK_CODES,
-    "BENCHMARK_NAME":  BENCHMARK_NAMES
-})
-
-
-print("BENCHMARK_GENERAL_INFORMATION")
-print(df_benchmark_general.head())
-
-# Write the product_master_df to a CSV file in the CSVs folder
-output_file_path = get_csv_path('benchmark_general.csv')
-df_benchmark_general.to_csv(output_file_path, index=False)
\ No newline at end of file
+
+
+def generate_benchmark_general():
+    """
+    Build the BENCHMARK_GENERAL_INFORMATION table: the traditional benchmarks
+    followed by the synthetic ones (7 at SCALE_FACTOR=1).
+
+    Returns:
+        pd.DataFrame: BENCHMARK_CODE, BENCHMARK_NAME
+    """
+    import pandas as pd
+
+    # Ensure reproducibility
+    random.seed(42)
+
+    benchmark_names = []
+    benchmark_codes = []
+    used_codes      = set()
+
+    # Add 3 traditional benchmarks
+    for code, name in TRADITIONAL:
+        used_codes.add(code)
+        benchmark_codes.append(code)
+        benchmark_names.append(name)
+
+    # Generate the synthetic benchmark entries (7 at SCALE_FACTOR=1)
+    for _ in range(size("synthetic_benchmarks")):
+        provider = random.choice(PROVIDERS)
+        pattern  = random.choice(["geo", "sector", "combo"])
+
+        if pattern == "geo":
+            region_full = random.choice(GEOGRAPHIES)
+            suffix      = random.choice(GEO_SUFFIXES)
+            name        = f"{provider} {region_full} {suffix}"
+            pfx = get_provider_prefix(provider)
+            rfx = REGION_MAP[region_full]
+            base_code = f"{pfx}_{rfx}"
+
+        elif pattern == "sector":
+            sector_full = random.choice(SECTORS)
+            suffix      = random.choice(SECTOR_SUFFIXES)
+            name        = f"{provider} {sector_full} {suffix}"
+            pfx = get_provider_prefix(provider)
+            sfx = SECTOR_CODE_MAP[sector_full]
+            base_code = f"{pfx}_{sfx}"
+
+        else:
+            region_full = random.choice(GEOGRAPHIES)
+            sector_full = random.choice(SECTORS)
+            suffix      = random.choice(COMBO_SUFFIXES)
+            name        = f"{provider} {region_full} {sector_full} {suffix}"
+            pfx = get_provider_prefix(provider)
+            rfx = REGION_MAP[region_full]
+            sfx = SECTOR_CODE_MAP[sector_full]
+            base_code = f"{pfx}_{rfx}_{sfx}"
+
+        # Ensure uniqueness
+        code = base_code
+        counter = 1
+        while code in used_codes:
+            counter += 1
+            code = f"{base_code}_{counter}"
+        used_codes.add(code)
+
+        benchmark_names.append(name)
+        benchmark_codes.append(code)
+
+    # Assemble into a DataFrame with UPPER_SNAKE_CASE column names
+    df_benchmark_general = pd.DataFrame({
+        "BENCHMARK_CODE":  benchmark_codes,
+        "BENCHMARK_NAME":  benchmark_names
+    })
+
+    return df_benchmark_general
+
+
+if __name__ == "__main__":
+    from table_io import write_table
+
+    df_benchmark_general = generate_benchmark_general()
+
+    print("BENCHMARK_GENERAL_INFORMATION")
+    print(df_benchmark_general.head())
+
+    # Write the product_master_df to a CSV file in the CSVs folder
+    write_table(df_benchmark_general, 'benchmark_general')
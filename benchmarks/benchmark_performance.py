@@ -58,21 +58,16 @@ warnings.filterwarnings("ignore")
 import pandas as pd
 import numpy as np
 import random
-import yfinance as yf
 from datetime import datetime
-from path_helpers import get_csv_path
+from table_io import read_table, write_table
+from scale import size
+from benchmarks.index_fetch import fetch_histories
+from benchmarks.benchmark_store import write_benchmark_store
+from instrument import instrumented
 
 random.seed(42)
 np.random.seed(42)
 
-# Bring in the information
-df_benchmark_characteristics = pd.read_csv("CSVs/benchmark_characteristics.csv")
-df_benchmark_general = pd.read_csv("CSVs/benchmark_general.csv")
-
-# Mapping: BENCHMARK_CODE -> INCEPTION_YEAR
-INCEPTION_MAP = df_benchmark_characteristics.drop_duplicates("BENCHMARK_CODE") \
-    .set_index("BENCHMARK_CODE")["INCEPTION_YEAR"].to_dict()
-
 # yfinance tickers for real indices
 REAL_INDEX_MAP = {
     "SP_500":  "^GSPC",
@@ -80,26 +75,24 @@ REAL_INDEX_MAP = {
     "MSCI_WD": "URTH"    # URTH = MSCI World ETF
 }
 
-def get_daily_prices_yf(ticker, start, end):
-    """Download daily close prices from yfinance and return as list of (price, date)."""
-    df = yf.download(ticker, start=start, end=end, progress=False)
-    if df.empty or "Close" not in df.columns:
+def to_price_list(df):
+    """Convert a Close-price frame into a list of (price, date)."""
+    if df is None or df.empty or "Close" not in df.columns:
         return []
     prices = df["Close"].round(2).values
     dates = [d.date() for d in df.index]
     return [(float(np.asarray(price).squeeze()), dt) for price, dt in zip(prices, dates)]
 
+def get_daily_prices_yf(ticker, start, end):
+    """Download daily close prices (with retries and local cache) and return as list of (price, date)."""
+    return to_price_list(fetch_histories([ticker], start, end).get(ticker))
+
 def get_quarterly_prices_yf(ticker, start, end):
     """(Retained for possible future use) Download quarterly prices if needed."""
-    df = yf.download(ticker, start=start, end=end, progress=False)
-    if df.empty or "Close" not in df.columns:
-        return []
-    df_q = df.resample('Q-DEC').last()
-    if df_q.empty or "Close" not in df_q.columns:
+    df = fetch_histories([ticker], start, end).get(ticker)
+    if df is None or df.empty:
         return []
-    prices = df_q["Close"].round(2).values
-    dates = [d.date() for d in df_q.index]
-    return [(float(np.asarray(price).squeeze()), dt) for price, dt in zip(prices, dates)]
+    return to_price_list(df.resample('QE-DEC').last().dropna())
 
 def simulate_vc_price_series(n, base=100):
     """Quarterly price simulation for synthetic VC/PE benchmarks."""
@@ -124,82 +117,119 @@ def simulate_vc_price_series(n, base=100):
 #         prices.append(prices[-1] * (1 + d_return))
 #     return [round(x, 2) for x in prices[1:]]
 
-performance_records = []
-today = datetime.today()
-currency_code_default = "USD"
-currency_name_default = "US Dollar"
-
-for _, row in df_benchmark_general.iterrows():
-    code = row["BENCHMARK_CODE"]
-    currency_code = row.get("CURRENCY_CODE", currency_code_default)
-    currency_name = row.get("CURRENCY", currency_name_default)
-    performance_frequency = "Daily" if code in REAL_INDEX_MAP else "Quarterly"
-    inception = INCEPTION_MAP.get(code, 2012)
-    start_date = datetime(int(inception), 3, 31)  # First Q-end from inception year
-
-    if code in REAL_INDEX_MAP:
-        # Use daily prices from this inception year forward
-        start = f"{inception}-01-01"
-        end = today.strftime("%Y-%m-%d")
-        yf_ticker = REAL_INDEX_MAP[code]
-        d_data = get_daily_prices_yf(yf_ticker, start, end)
-        for price, dt in d_data:
-            if dt >= start_date.date():
+@instrumented()
+def build_benchmark_performance(df_benchmark_general, inception_map, today=None):
+    """
+    Build the price history of every benchmark: daily closes for public
+    indices, simulated quarterly prices for synthetic VC/PE benchmarks.
+
+    Parameters:
+        df_benchmark_general (pd.DataFrame): BENCHMARK_CODE (and optional currency columns)
+        inception_map (dict): BENCHMARK_CODE -> INCEPTION_YEAR
+        today (datetime): end of the history
+
+    Returns:
+        pd.DataFrame: BENCHMARK_PERFORMANCE rows
+    """
+    performance_records = []
+    today = today or datetime.today()
+    currency_code_default = "USD"
+    currency_name_default = "US Dollar"
+
+    # Fetch every public index up front in one batched download (retries with
+    # backoff, falls back to the local cache when offline)
+    public_codes = [c for c in df_benchmark_general["BENCHMARK_CODE"] if c in REAL_INDEX_MAP]
+    daily_histories = {}
+    if public_codes:
+        earliest_inception = min(int(inception_map.get(c, 2012)) for c in public_codes)
+        daily_histories = fetch_histories(
+            [REAL_INDEX_MAP[c] for c in public_codes],
+            start=f"{earliest_inception}-01-01",
+            end=today.strftime("%Y-%m-%d")
+        )
+
+    for _, row in df_benchmark_general.iterrows():
+        code = row["BENCHMARK_CODE"]
+        currency_code = row.get("CURRENCY_CODE", currency_code_default)
+        currency_name = row.get("CURRENCY", currency_name_default)
+        inception = inception_map.get(code, 2012)
+        start_date = datetime(int(inception), 3, 31)  # First Q-end from inception year
+
+        if code in REAL_INDEX_MAP:
+            # Use daily prices from this inception year forward
+            yf_ticker = REAL_INDEX_MAP[code]
+            d_data = to_price_list(daily_histories.get(yf_ticker))
+            for price, dt in d_data:
+                if dt >= start_date.date():
+                    performance_records.append({
+                        "BENCHMARK_CODE": code,
+                        "PERFORMANCE_DATA_TYPE": "PRICE",
+                        "CURRENCY_CODE": currency_code,
+                        "CURRENCY": currency_name,
+                        "PERFORMANCE_FREQUENCY": "Daily",
+                        "VALUE": price,
+                        "HISTORY_DATE": dt
+                    })
+        else:
+            # Quarterly simulation for synthetic benchmarks (VC/PE)
+            n_quarters = min(size("history_quarters"), (today.year - int(inception)) * 4 + today.month // 3)
+            price_series = simulate_vc_price_series(n_quarters, base=100)
+            for i in range(n_quarters):
+                q_date = start_date + pd.DateOffset(months=3*i)
                 performance_records.append({
                     "BENCHMARK_CODE": code,
                     "PERFORMANCE_DATA_TYPE": "PRICE",
                     "CURRENCY_CODE": currency_code,
                     "CURRENCY": currency_name,
-                    "PERFORMANCE_FREQUENCY": "Daily",
-                    "VALUE": price,
-                    "HISTORY_DATE": dt
+                    "PERFORMANCE_FREQUENCY": "Quarterly",
+                    "VALUE": price_series[i],
+                    "HISTORY_DATE": q_date.date()
                 })
-    else:
-        # Quarterly simulation for synthetic benchmarks (VC/PE)
-        n_quarters = min(48, (today.year - int(inception)) * 4 + today.month // 3)
-        price_series = simulate_vc_price_series(n_quarters, base=100)
-        for i in range(n_quarters):
-            q_date = start_date + pd.DateOffset(months=3*i)
-            performance_records.append({
-                "BENCHMARK_CODE": code,
-                "PERFORMANCE_DATA_TYPE": "PRICE",
-                "CURRENCY_CODE": currency_code,
-                "CURRENCY": currency_name,
-                "PERFORMANCE_FREQUENCY": "Quarterly",
-                "VALUE": price_series[i],
-                "HISTORY_DATE": q_date.date()
-            })
-        # --- Placeholder for future daily synthetic logic ---
-        # If daily synthetic simulation is needed, use the code below:
-        # n_days = (today - start_date).days
-        # price_series = simulate_vc_price_series_daily(n_days, base=100)
-        # for i in range(n_days):
-        #     d_date = start_date + pd.DateOffset(days=i)
-        #     performance_records.append({
-        #         "BENCHMARK_CODE": code,
-        #         "PERFORMANCE_DATA_TYPE": "PRICE",
-        #         "CURRENCY_CODE": currency_code,
-        #         "CURRENCY": currency_name,
-        #         "PERFORMANCE_FREQUENCY": "Daily",
-        #         "VALUE": price_series[i],
-        #         "HISTORY_DATE": d_date.date()
-        #     })
-
-df_benchmark_performance = pd.DataFrame(performance_records)[[
-    "BENCHMARK_CODE",
-    "PERFORMANCE_DATA_TYPE",
-    "CURRENCY_CODE",
-    "CURRENCY",
-    "PERFORMANCE_FREQUENCY",
-    "VALUE",
-    "HISTORY_DATE"
-]]
-
-print("\nBENCHMARK_PERFORMANCE")
-print(df_benchmark_performance.head())
-
-output_file_path = get_csv_path('benchmark_performance.csv')
-df_benchmark_performance.to_csv(output_file_path, index=False)
+            # --- Placeholder for future daily synthetic logic ---
+            # If daily synthetic simulation is needed, use the code below:
+            # n_days = (today - start_date).days
+            # price_series = simulate_vc_price_series_daily(n_days, base=100)
+            # for i in range(n_days):
+            #     d_date = start_date + pd.DateOffset(days=i)
+            #     performance_records.append({
+            #         "BENCHMARK_CODE": code,
+            #         "PERFORMANCE_DATA_TYPE": "PRICE",
+            #         "CURRENCY_CODE": currency_code,
+            #         "CURRENCY": currency_name,
+            #         "PERFORMANCE_FREQUENCY": "Daily",
+            #         "VALUE": price_series[i],
+            #         "HISTORY_DATE": d_date.date()
+            #     })
+
+    return pd.DataFrame(performance_records, columns=[
+        "BENCHMARK_CODE",
+        "PERFORMANCE_DATA_TYPE",
+        "CURRENCY_CODE",
+        "CURRENCY",
+        "PERFORMANCE_FREQUENCY",
+        "VALUE",
+        "HISTORY_DATE"
+    ])
+
+
+if __name__ == "__main__":
+    # Bring in the information
+    df_benchmark_characteristics = read_table('benchmark_characteristics', columns=["BENCHMARK_CODE", "INCEPTION_YEAR"])
+    df_benchmark_general = read_table('benchmark_general')
+
+    # Mapping: BENCHMARK_CODE -> INCEPTION_YEAR
+    INCEPTION_MAP = df_benchmark_characteristics.drop_duplicates("BENCHMARK_CODE") \
+        .set_index("BENCHMARK_CODE")["INCEPTION_YEAR"].to_dict()
+
+    df_benchmark_performance = build_benchmark_performance(df_benchmark_general, INCEPTION_MAP)
+
+    print("\nBENCHMARK_PERFORMANCE")
+    print(df_benchmark_performance.head())
+
+    write_table(df_benchmark_performance, 'benchmark_performance')
+
+    # Compact store (int32 days + float64 values, memory-mappable) for local consumers
+    write_benchmark_store(df_benchmark_performance)
 
 # -- Snowflake SQL table creation
 
@@ -214,14 +244,3 @@ df_benchmark_performance.to_csv(output_file_path, index=False)
 
 #     FOREIGN KEY (BENCHMARK_CODE) REFERENCES BENCHMARK_GENERAL_INFORMATION(BENCHMARK_CODE)
 # );
-
-
-"""
-1 Failed download:
-['^GSPC']: Timeout('Failed to perform, curl: (28) Operation timed out after 10001 
-milliseconds with 70715 bytes received. See https://curl.se/libcurl/c/libcurl-errors.html first for more details.')
-
-This is the error that gets thrown if you are offline due to the connection to 
-the yfinance API. Would we quickly be able to get this information as a CSV
-just in case there is a problem in the future?
-"""
\ No newline at end of file
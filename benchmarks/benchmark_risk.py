@@ -0,0 +1,213 @@
+"""
+Risk analytics for benchmark, fund and composite price series.
+
+All functions take a wide frame of levels (rows = dates, columns = series)
+and work on every column at once: rolling moments are built from cumulative
+sums over the whole 2-D (or 3-D, for series × benchmark pairs) array, so
+there are no per-series Python loops.
+
+### Statistics
+
+| Statistic        | Definition                                                                 |
+|------------------|----------------------------------------------------------------------------|
+| `VOLATILITY`     | Rolling std of simple returns × √(periods per year)                        |
+| `MAX_DRAWDOWN`   | Worst peak-to-trough decline inside the rolling window (negative fraction) |
+| `BETA`           | Rolling cov(series, benchmark) / var(benchmark)                            |
+| `TRACKING_ERROR` | Rolling std of (series − benchmark) returns × √(periods per year)          |
+
+Windows are expressed in periods: e.g. 252 for one year of daily prices,
+12 for three years of quarterly VC marks. A window is only reported when
+every period in it has data for the series (and, for pairs, the benchmark).
+
+### Output Schema: `benchmark_risk.csv`
+
+| Column           | Description                                    | Example    |
+|------------------|------------------------------------------------|------------|
+| `SERIES_CODE`    | Benchmark, fund or composite code              | CMP_1A2B3C |
+| `BENCHMARK_CODE` | Reference benchmark (`NONE` for standalone stats) | SP_500  |
+| `FREQUENCY`      | Daily or Quarterly                             | Quarterly  |
+| `WINDOW`         | Window length in periods                       | 12         |
+| `HISTORY_DATE`   | As-of date (last date of the window)           | 2025-06-30 |
+| `VOLATILITY`     | Annualized volatility                          | 0.1834     |
+| `MAX_DRAWDOWN`   | Rolling max drawdown                           | -0.2110    |
+| `BETA`           | Beta vs `BENCHMARK_CODE`                       | 0.87       |
+| `TRACKING_ERROR` | Annualized tracking error vs `BENCHMARK_CODE`  | 0.0642     |
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from path_helpers import get_csv_path
+from instrument import instrumented
+from snowflake.schema_registry import NO_PARENT
+
+PERIODS_PER_YEAR = {"Daily": 252, "Quarterly": 4}
+
+# Default windows: one year of daily prices, three years of quarterly marks
+DEFAULT_WINDOWS = {"Daily": 252, "Quarterly": 12}
+
+# BENCHMARK_CODE of standalone rows (volatility, drawdown); it is part of the key, so not NULL
+NO_BENCHMARK = NO_PARENT[("BENCHMARK_RISK", "BENCHMARK_CODE")]
+
+
+def _rolling_sum(values, window):
+    """Rolling sum along axis 0 via cumulative sums; the first window-1 rows are NaN."""
+    cum = np.cumsum(values, axis=0, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    out[window - 1:] = cum[window - 1:]
+    out[window:] -= cum[:-window]
+    return out
+
+
+def to_returns(levels):
+    """Simple period returns of a wide level frame (gaps stay NaN)."""
+    return levels.pct_change(fill_method=None)
+
+
+def rolling_volatility(levels, window, periods_per_year):
+    """Annualized rolling volatility of every column."""
+    returns = to_returns(levels)
+    r = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(r)
+    r0 = np.where(valid, r, 0.0)
+
+    n = _rolling_sum(valid.astype(np.float64), window)
+    s1 = _rolling_sum(r0, window)
+    s2 = _rolling_sum(r0 * r0, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (s2 - s1 * s1 / n) / (n - 1)
+    var = np.where(n == window, np.clip(var, 0, None), np.nan)
+    return pd.DataFrame(np.sqrt(var * periods_per_year), index=levels.index, columns=levels.columns)
+
+
+def rolling_max_drawdown(levels, window):
+    """
+    Exact rolling max drawdown of every column. All windows advance together:
+    step k adds the k-th level of every window, updating each window's running
+    peak and worst drawdown so far. Memory is two (dates, series) arrays, not
+    one value per date, series and window position.
+    """
+    x = levels.to_numpy(dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        starts = len(x) - window + 1
+        peak = x[:starts].copy()
+        drawdown = np.zeros_like(peak)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for k in range(1, window):
+                level = x[k:k + starts]
+                np.fmax(peak, level, out=peak)
+                np.fmin(drawdown, level / peak - 1, out=drawdown)
+        complete = _rolling_sum(np.isnan(x).astype(np.float64), window)[window - 1:] == 0
+        out[window - 1:] = np.where(complete, drawdown, np.nan)
+    return pd.DataFrame(out, index=levels.index, columns=levels.columns)
+
+
+def rolling_beta_tracking_error(levels, benchmark_levels, window, periods_per_year):
+    """
+    Rolling beta and annualized tracking error of every series vs every
+    benchmark. Both frames must share the same index (use `align_levels`).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: arrays of shape (dates, series, benchmarks)
+    """
+    ra = to_returns(levels).to_numpy(dtype=np.float64)[:, :, None]
+    rb = to_returns(benchmark_levels).to_numpy(dtype=np.float64)[:, None, :]
+    valid = ~np.isnan(ra) & ~np.isnan(rb)
+    a = np.where(valid, ra, 0.0)
+    b = np.where(valid, rb, 0.0)
+
+    n = _rolling_sum(valid.astype(np.float64), window)
+    sa, sb = _rolling_sum(a, window), _rolling_sum(b, window)
+    sab = _rolling_sum(a * b, window)
+    sbb = _rolling_sum(b * b, window)
+    saa = _rolling_sum(a * a, window)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (sab - sa * sb / n) / (n - 1)
+        var_a = (saa - sa * sa / n) / (n - 1)
+        var_b = (sbb - sb * sb / n) / (n - 1)
+        beta = cov / var_b
+        te = np.sqrt(np.clip(var_a + var_b - 2 * cov, 0, None) * periods_per_year)
+
+    full = n == window
+    return np.where(full, beta, np.nan), np.where(full, te, np.nan)
+
+
+def align_levels(levels, benchmark_levels):
+    """Put series and benchmarks on one shared date index."""
+    index = levels.index.union(benchmark_levels.index)
+    return levels.reindex(index), benchmark_levels.reindex(index)
+
+
+@instrumented()
+def compute_risk_table(levels, benchmark_levels, window, frequency):
+    """
+    Long-format risk table for all series (and all series × benchmark pairs)
+    at one window length.
+    """
+    ppy = PERIODS_PER_YEAR[frequency]
+    levels, benchmark_levels = align_levels(levels, benchmark_levels)
+
+    vol = rolling_volatility(levels, window, ppy).stack().rename("VOLATILITY")
+    mdd = rolling_max_drawdown(levels, window).stack().rename("MAX_DRAWDOWN")
+    standalone = pd.concat([vol, mdd], axis=1).reset_index()
+    standalone.columns = ["HISTORY_DATE", "SERIES_CODE", "VOLATILITY", "MAX_DRAWDOWN"]
+    standalone["BENCHMARK_CODE"] = NO_BENCHMARK
+
+    beta, te = rolling_beta_tracking_error(levels, benchmark_levels, window, ppy)
+    t_idx, s_idx, b_idx = np.nonzero(~np.isnan(beta))
+    pairs = pd.DataFrame({
+        "HISTORY_DATE": levels.index[t_idx],
+        "SERIES_CODE": levels.columns[s_idx],
+        "BENCHMARK_CODE": benchmark_levels.columns[b_idx],
+        "BETA": beta[t_idx, s_idx, b_idx],
+        "TRACKING_ERROR": te[t_idx, s_idx, b_idx],
+    })
+    pairs = pairs[pairs["SERIES_CODE"] != pairs["BENCHMARK_CODE"]]
+
+    table = pd.concat([standalone, pairs], ignore_index=True)
+    table["FREQUENCY"] = frequency
+    table["WINDOW"] = window
+    table["HISTORY_DATE"] = pd.to_datetime(table["HISTORY_DATE"]).dt.date
+    return table[[
+        "SERIES_CODE", "BENCHMARK_CODE", "FREQUENCY", "WINDOW", "HISTORY_DATE",
+        "VOLATILITY", "MAX_DRAWDOWN", "BETA", "TRACKING_ERROR"
+    ]].round(6)
+
+
+def pivot_performance(df_performance, frequency):
+    """Wide level frame of the BENCHMARK_PERFORMANCE rows with the given frequency."""
+    df = df_performance[df_performance["PERFORMANCE_FREQUENCY"] == frequency]
+    wide = df.pivot_table(index="HISTORY_DATE", columns="BENCHMARK_CODE",
+                          values="VALUE", aggfunc="last")
+    wide.index = pd.to_datetime(wide.index)
+    return wide.sort_index()
+
+
+if __name__ == "__main__":
+    from benchmarks.benchmark_composite import align_benchmark_levels, COMPOSITE_PERFORMANCE_FILE
+
+    df_benchmark_performance = pd.read_csv(get_csv_path('benchmark_performance.csv'))
+
+    # Daily: public indices against each other
+    daily = pivot_performance(df_benchmark_performance, "Daily")
+    tables = [compute_risk_table(daily, daily, DEFAULT_WINDOWS["Daily"], "Daily")]
+
+    # Quarterly: benchmarks and materialized composites against every benchmark
+    quarterly_benchmarks = align_benchmark_levels(df_benchmark_performance)
+    quarterly_series = quarterly_benchmarks
+    composite_path = get_csv_path(COMPOSITE_PERFORMANCE_FILE)
+    if os.path.exists(composite_path):
+        composites = pd.read_csv(composite_path, parse_dates=["HISTORY_DATE"]) \
+            .pivot(index="HISTORY_DATE", columns="COMPOSITE_CODE", values="VALUE")
+        quarterly_series = pd.concat([quarterly_benchmarks, composites], axis=1)
+    tables.append(compute_risk_table(quarterly_series, quarterly_benchmarks,
+                                     DEFAULT_WINDOWS["Quarterly"], "Quarterly"))
+
+    df_benchmark_risk = pd.concat(tables, ignore_index=True)
+    print("\nBENCHMARK_RISK")
+    print(df_benchmark_risk.head())
+
+    output_file_path = get_csv_path('benchmark_risk.csv')
+    df_benchmark_risk.to_csv(output_file_path, index=False)
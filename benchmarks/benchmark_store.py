@@ -0,0 +1,165 @@
+"""
+Compact on-disk storage for the `BENCHMARK_PERFORMANCE` time series.
+
+`benchmark_performance.csv` repeats BENCHMARK_CODE, PERFORMANCE_DATA_TYPE,
+CURRENCY_CODE, CURRENCY and PERFORMANCE_FREQUENCY on every row and stores
+HISTORY_DATE as text, so every consumer re-parses dates. The store keeps the
+same data as three files in one directory:
+
+| File            | Contents                                                                 |
+|-----------------|--------------------------------------------------------------------------|
+| `metadata.json` | Per-field string dictionaries and one entry per benchmark (dictionary indexes, offset, length) |
+| `days.npy`      | `int32` day offsets from 1970-01-01, contiguous per benchmark, sorted by date |
+| `values.npy`    | `float64` index levels aligned with `days.npy`                           |
+
+Both arrays are plain `.npy` files, so `load_benchmark_store` memory-maps
+them (`mmap_mode="r"`) and a benchmark's series is a zero-copy slice —
+nothing is parsed on load.
+
+Usage:
+    from benchmarks.benchmark_store import write_benchmark_store, load_benchmark_store
+
+    write_benchmark_store(df_benchmark_performance, get_csv_path('benchmark_performance_store'))
+    store = load_benchmark_store(get_csv_path('benchmark_performance_store'))
+    days, values = store.series("SP_500")
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from path_helpers import get_csv_path
+from instrument import instrumented, record_bytes
+
+STORE_VERSION = 1
+STORE_DIRNAME = "benchmark_performance_store"
+
+# Per-benchmark metadata fields stored once through string dictionaries
+META_FIELDS = ["PERFORMANCE_DATA_TYPE", "CURRENCY_CODE", "CURRENCY", "PERFORMANCE_FREQUENCY"]
+PERFORMANCE_COLUMNS = ["BENCHMARK_CODE"] + META_FIELDS + ["VALUE", "HISTORY_DATE"]
+
+
+@instrumented()
+def write_benchmark_store(df_performance, path=None):
+    """
+    Write a BENCHMARK_PERFORMANCE frame to the compact store at `path`.
+
+    Metadata must be constant within a benchmark; a benchmark with mixed
+    currencies or frequencies raises ValueError.
+    """
+    path = path or get_csv_path(STORE_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+
+    df = df_performance[PERFORMANCE_COLUMNS].copy()
+    df["HISTORY_DATE"] = pd.to_datetime(df["HISTORY_DATE"])
+    df = df.sort_values(["BENCHMARK_CODE", "HISTORY_DATE"], kind="stable").reset_index(drop=True)
+
+    per_bench = df.groupby("BENCHMARK_CODE", sort=False)[META_FIELDS].nunique()
+    inconsistent = per_bench[(per_bench > 1).any(axis=1)].index.tolist()
+    if inconsistent:
+        raise ValueError(f"Metadata varies within benchmarks: {inconsistent}")
+
+    dictionaries = {field: sorted(df[field].astype(str).unique()) for field in META_FIELDS}
+    lookups = {field: {v: i for i, v in enumerate(values)} for field, values in dictionaries.items()}
+
+    benchmarks = []
+    offset = 0
+    for code, rows in df.groupby("BENCHMARK_CODE", sort=False):
+        first = rows.iloc[0]
+        entry = {"BENCHMARK_CODE": code, "offset": offset, "length": len(rows)}
+        for field in META_FIELDS:
+            entry[field] = lookups[field][str(first[field])]
+        benchmarks.append(entry)
+        offset += len(rows)
+
+    days = df["HISTORY_DATE"].values.astype("datetime64[D]").astype("int64")
+    if len(days) and (days.min() < np.iinfo(np.int32).min or days.max() > np.iinfo(np.int32).max):
+        raise ValueError("HISTORY_DATE out of range for int32 day offsets.")
+
+    np.save(os.path.join(path, "days.npy"), days.astype(np.int32))
+    np.save(os.path.join(path, "values.npy"), df["VALUE"].to_numpy(dtype=np.float64))
+    with open(os.path.join(path, "metadata.json"), "w") as f:
+        json.dump({
+            "version": STORE_VERSION,
+            "epoch": "1970-01-01",
+            "dictionaries": dictionaries,
+            "benchmarks": benchmarks
+        }, f)
+    for name in ("days.npy", "values.npy", "metadata.json"):
+        record_bytes(os.path.join(path, name))
+    return path
+
+
+class BenchmarkStore:
+    """Read-only view over a compact benchmark performance store."""
+
+    def __init__(self, metadata, days, values):
+        if metadata.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported benchmark store version: {metadata.get('version')}")
+        self.dictionaries = metadata["dictionaries"]
+        self.days = days
+        self.values = values
+        self._index = {b["BENCHMARK_CODE"]: b for b in metadata["benchmarks"]}
+
+    @property
+    def benchmark_codes(self):
+        return list(self._index)
+
+    def _entry(self, code):
+        if code not in self._index:
+            raise KeyError(f"Benchmark {code} not found in store.")
+        return self._index[code]
+
+    def metadata(self, code):
+        """Decoded metadata (currency, frequency, ...) for one benchmark."""
+        entry = self._entry(code)
+        return {field: self.dictionaries[field][entry[field]] for field in META_FIELDS}
+
+    def series(self, code):
+        """Zero-copy (days, values) slices for one benchmark."""
+        entry = self._entry(code)
+        sl = slice(entry["offset"], entry["offset"] + entry["length"])
+        return self.days[sl], self.values[sl]
+
+    def dates(self, code):
+        """HISTORY_DATE of one benchmark as datetime64[D]."""
+        days, _ = self.series(code)
+        return days.astype("datetime64[D]")
+
+    def to_frame(self, codes=None):
+        """Rebuild the BENCHMARK_PERFORMANCE layout for the given benchmarks (default all)."""
+        codes = self.benchmark_codes if codes is None else list(codes)
+        entries = [self._entry(c) for c in codes]
+        lengths = np.array([e["length"] for e in entries], dtype=np.int64)
+        if len(entries):
+            idx = np.concatenate([np.arange(e["offset"], e["offset"] + e["length"]) for e in entries])
+        else:
+            idx = np.array([], dtype=np.int64)
+
+        frame = {"BENCHMARK_CODE": np.repeat(codes, lengths)}
+        for field in META_FIELDS:
+            frame[field] = np.repeat([self.dictionaries[field][e[field]] for e in entries], lengths)
+        frame["VALUE"] = np.asarray(self.values[idx])
+        frame["HISTORY_DATE"] = np.asarray(self.days[idx]).astype("datetime64[D]")
+        return pd.DataFrame(frame)[PERFORMANCE_COLUMNS]
+
+
+def load_benchmark_store(path=None, mmap=True):
+    """Open a store written by `write_benchmark_store`; arrays are memory-mapped by default."""
+    path = path or get_csv_path(STORE_DIRNAME)
+    mode = "r" if mmap else None
+    with open(os.path.join(path, "metadata.json"), "r") as f:
+        metadata = json.load(f)
+    days = np.load(os.path.join(path, "days.npy"), mmap_mode=mode)
+    values = np.load(os.path.join(path, "values.npy"), mmap_mode=mode)
+    return BenchmarkStore(metadata, days, values)
+
+
+if __name__ == "__main__":
+    # Convert the existing CSV into the compact store
+    df_benchmark_performance = pd.read_csv(get_csv_path('benchmark_performance.csv'))
+    store_path = write_benchmark_store(df_benchmark_performance)
+
+    store = load_benchmark_store(store_path)
+    print(f"Stored {len(store.days)} observations for {len(store.benchmark_codes)} benchmarks in {store_path}")
+    print(store.to_frame().head())
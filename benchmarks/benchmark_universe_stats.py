@@ -0,0 +1,292 @@
+"""
+Data-driven statistics for `BENCHMARK_CHARACTERISTICS`.
+
+Instead of sampling Median IRR, Mean MOIC, Top Quartile DPI and Std Dev IRR
+from `np.random.normal(10, 2)`, this module computes them from the company
+metrics in `holdings_metrics.csv`, joined to `holdings.csv` for region and
+sector, and grouped by which benchmarks each holding belongs to.
+
+### Benchmark Membership
+
+| Benchmark part      | Matched against             | Example                                        |
+|---------------------|-----------------------------|------------------------------------------------|
+| Region code         | Holdings `REGIONNAME`       | `EU` → Europe, `AP` → Asia + Oceania           |
+| Sector code         | Holdings `PRIMARYSECTORNAME`| `HC` → Health Care, `TE` → Information Technology + Communication Services |
+| Public index        | Fixed region list           | `SP_500` → Americas, `MSCI_WD` → all regions   |
+
+Codes without a region (e.g. `PR_CT`) cover every region, codes without a
+sector (e.g. `PB_EU`, or the `GE` growth-equity strategy) cover every sector.
+
+### Statistics
+
+| CHARACTERISTIC_NAME | Computation                                 | Unit |
+|---------------------|---------------------------------------------|------|
+| Median IRR          | 50th percentile of member IRR × 100         | %    |
+| Mean MOIC           | Mean of member MOIC                         | x    |
+| Top Quartile DPI    | 75th percentile of member DPI               | x    |
+| Fund Count          | Distinct member `PORTFOLIOCODE`s            | #    |
+| Std Dev IRR         | Sample standard deviation of IRR × 100      | %    |
+
+### Modes
+
+- `compute_universe_stats` — in memory: observations are joined to the
+  membership table once and all statistics come from a single grouped
+  aggregation (`groupby().quantile()`), no per-benchmark loops over rows.
+- `compute_universe_stats_streaming` — for universes that do not fit in
+  memory: `holdings_metrics.csv` is read in chunks and folded into a
+  `GroupedQuantileSketch` (fixed-bin histograms per benchmark plus exact
+  running sums for mean/std). Quantile error is bounded by the bin width.
+"""
+
+import numpy as np
+import pandas as pd
+from path_helpers import get_csv_path
+from table_io import read_table
+from instrument import instrumented
+
+# Benchmark region code -> holdings REGIONNAME values
+REGION_MEMBERSHIP = {
+    "US": ["Americas"],
+    "NA": ["Americas"],
+    "CA": ["Americas"],
+    "EU": ["Europe"],
+    "AP": ["Asia", "Oceania"],
+    "EM": ["Africa", "Asia"],
+    "GL": None,  # None = every region
+}
+
+# Benchmark sector code -> GICS PRIMARYSECTORNAME values
+SECTOR_MEMBERSHIP = {
+    "TE": ["Information Technology", "Communication Services"],
+    "HC": ["Health Care"],
+    "CT": ["Utilities", "Energy"],
+    "AI": ["Information Technology"],
+    "LS": ["Health Care"],
+    "GE": None,  # Growth Equity is a strategy, not a sector
+}
+
+# Public indices are not built from code parts
+PUBLIC_INDEX_MEMBERSHIP = {
+    "SP_500":  {"regions": ["Americas"], "sectors": None},
+    "R2500":   {"regions": ["Americas"], "sectors": None},
+    "MSCI_WD": {"regions": None, "sectors": None},
+}
+
+STAT_NAMES = ["Median IRR", "Mean MOIC", "Top Quartile DPI", "Fund Count", "Std Dev IRR"]
+
+# Bin layout of the streaming sketch per metric: (low, high, number of bins)
+SKETCH_BINS = {
+    "IRR":  (-1.0, 5.0, 6000),
+    "MOIC": (0.0, 20.0, 4000),
+    "DPI":  (0.0, 20.0, 4000),
+}
+
+
+def parse_benchmark_membership(bench_code):
+    """
+    Return (regions, sectors) covered by a benchmark code, where None means
+    unrestricted. Numeric uniqueness suffixes (e.g. `_2`) are ignored.
+    """
+    if bench_code in PUBLIC_INDEX_MEMBERSHIP:
+        meta = PUBLIC_INDEX_MEMBERSHIP[bench_code]
+        return meta["regions"], meta["sectors"]
+
+    regions, sectors = None, None
+    for part in bench_code.split("_")[1:]:
+        if part in REGION_MEMBERSHIP:
+            regions = REGION_MEMBERSHIP[part]
+        elif part in SECTOR_MEMBERSHIP:
+            sectors = SECTOR_MEMBERSHIP[part]
+    return regions, sectors
+
+
+def build_membership_table(benchmark_codes, regions, sectors):
+    """
+    Expand every benchmark to the (REGIONNAME, PRIMARYSECTORNAME) cells it
+    covers, so observations can be attached to benchmarks with one merge.
+    """
+    rows = []
+    for code in benchmark_codes:
+        bench_regions, bench_sectors = parse_benchmark_membership(code)
+        for region in (bench_regions or regions):
+            for sector in (bench_sectors or sectors):
+                rows.append((code, region, sector))
+    return pd.DataFrame(rows, columns=["BENCHMARK_CODE", "REGIONNAME", "PRIMARYSECTORNAME"])
+
+
+def load_fund_universe(holdings_df=None, metrics_df=None):
+    """Join company metrics to holdings for region, sector and fund code."""
+    if holdings_df is None:
+        holdings_df = read_table('holdings', columns=["TICKER", "PORTFOLIOCODE", "REGIONNAME", "PRIMARYSECTORNAME"])
+    if metrics_df is None:
+        metrics_df = read_table('holdings_metrics', columns=["TICKER", "IRR", "MOIC", "DPI"])
+
+    lookup = holdings_df[["TICKER", "PORTFOLIOCODE", "REGIONNAME", "PRIMARYSECTORNAME"]]
+    universe = metrics_df[["TICKER", "IRR", "MOIC", "DPI"]].merge(lookup, on="TICKER", how="inner")
+    for col in ["IRR", "MOIC", "DPI"]:
+        universe[col] = pd.to_numeric(universe[col], errors="coerce")
+    return universe
+
+
+def _to_characteristic_rows(stats):
+    """Melt a wide per-benchmark stats frame into CHARACTERISTIC_NAME rows."""
+    stats = stats.reindex(columns=STAT_NAMES)
+    long = stats.reset_index().melt(id_vars="BENCHMARK_CODE",
+                                    var_name="CHARACTERISTIC_NAME",
+                                    value_name="CHARACTERISTIC_VALUE")
+    return long.dropna(subset=["CHARACTERISTIC_VALUE"]).reset_index(drop=True)
+
+
+@instrumented()
+def compute_universe_stats(benchmark_codes, universe=None):
+    """
+    Compute benchmark statistics from the full fund universe in memory.
+
+    Returns:
+        pd.DataFrame: BENCHMARK_CODE, CHARACTERISTIC_NAME, CHARACTERISTIC_VALUE
+    """
+    if universe is None:
+        universe = load_fund_universe()
+
+    membership = build_membership_table(
+        benchmark_codes,
+        universe["REGIONNAME"].dropna().unique(),
+        universe["PRIMARYSECTORNAME"].dropna().unique()
+    )
+    members = universe.merge(membership, on=["REGIONNAME", "PRIMARYSECTORNAME"], how="inner")
+    grouped = members.groupby("BENCHMARK_CODE")
+
+    quantiles = grouped[["IRR", "DPI"]].quantile([0.5, 0.75]).unstack()
+    stats = pd.DataFrame({
+        "Median IRR":       quantiles[("IRR", 0.5)] * 100,
+        "Mean MOIC":        grouped["MOIC"].mean(),
+        "Top Quartile DPI": quantiles[("DPI", 0.75)],
+        "Fund Count":       grouped["PORTFOLIOCODE"].nunique(),
+        "Std Dev IRR":      grouped["IRR"].std() * 100,
+    })
+    stats.index.name = "BENCHMARK_CODE"
+    return _to_characteristic_rows(stats.round(4))
+
+
+class GroupedQuantileSketch:
+    """
+    Mergeable fixed-bin histogram sketch for per-group quantiles.
+
+    Counts for every (group, bin) pair live in one 2-D array and are updated
+    with `np.add.at`, so a chunk of any size is folded in with a handful of
+    vectorized calls. Running count, sum and sum of squares give exact means
+    and standard deviations; quantiles are interpolated within a bin.
+    """
+
+    def __init__(self, n_groups, low, high, n_bins):
+        self.low = low
+        self.high = high
+        self.n_bins = n_bins
+        self.width = (high - low) / n_bins
+        self.counts = np.zeros((n_groups, n_bins), dtype=np.int64)
+        self.n = np.zeros(n_groups, dtype=np.int64)
+        self.total = np.zeros(n_groups, dtype=np.float64)
+        self.total_sq = np.zeros(n_groups, dtype=np.float64)
+
+    def update(self, groups, values):
+        """Fold (group index, value) pairs into the sketch; NaNs are skipped."""
+        groups = np.asarray(groups, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values)
+        groups, values = groups[keep], values[keep]
+
+        bins = ((values - self.low) / self.width).astype(np.int64)
+        bins = np.clip(bins, 0, self.n_bins - 1)
+        np.add.at(self.counts, (groups, bins), 1)
+        np.add.at(self.n, groups, 1)
+        np.add.at(self.total, groups, values)
+        np.add.at(self.total_sq, groups, values * values)
+
+    def merge(self, other):
+        """Combine another sketch with the same layout into this one."""
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+        self.total_sq += other.total_sq
+        return self
+
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 0, self.total / self.n, np.nan)
+
+    def std(self):
+        """Sample standard deviation (ddof=1), matching pandas."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (self.total_sq - self.total ** 2 / self.n) / (self.n - 1)
+        return np.where(self.n > 1, np.sqrt(np.clip(var, 0, None)), np.nan)
+
+    def quantile(self, q):
+        """Approximate q-quantile per group, interpolated inside the target bin."""
+        cum = np.cumsum(self.counts, axis=1)
+        target = q * self.n
+        idx = (cum < target[:, None]).sum(axis=1)
+        idx = np.clip(idx, 0, self.n_bins - 1)
+
+        rows = np.arange(len(self.n))
+        below = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0)
+        in_bin = self.counts[rows, idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(in_bin > 0, (target - below) / in_bin, 0.5)
+        result = self.low + (idx + np.clip(frac, 0, 1)) * self.width
+        return np.where(self.n > 0, result, np.nan)
+
+
+@instrumented()
+def compute_universe_stats_streaming(benchmark_codes, holdings_df=None,
+                                     metrics_path=None, chunksize=1_000_000):
+    """
+    Compute the same statistics as `compute_universe_stats` by streaming
+    `holdings_metrics.csv` in chunks through a `GroupedQuantileSketch`.
+
+    The holdings lookup (TICKER → fund, region, sector) is kept in memory;
+    metrics rows are never held in full.
+    """
+    if holdings_df is None:
+        holdings_df = read_table('holdings', columns=["TICKER", "PORTFOLIOCODE", "REGIONNAME", "PRIMARYSECTORNAME"])
+    if metrics_path is None:
+        metrics_path = get_csv_path('holdings_metrics.csv')
+
+    codes = list(benchmark_codes)
+    membership = build_membership_table(
+        codes,
+        holdings_df["REGIONNAME"].dropna().unique(),
+        holdings_df["PRIMARYSECTORNAME"].dropna().unique()
+    )
+    membership["GROUP"] = membership["BENCHMARK_CODE"].map({c: i for i, c in enumerate(codes)})
+    lookup = holdings_df[["TICKER", "PORTFOLIOCODE", "REGIONNAME", "PRIMARYSECTORNAME"]]
+
+    sketches = {metric: GroupedQuantileSketch(len(codes), *SKETCH_BINS[metric]) for metric in SKETCH_BINS}
+    funds = [set() for _ in codes]
+
+    for chunk in pd.read_csv(metrics_path, usecols=["TICKER", "IRR", "MOIC", "DPI"], chunksize=chunksize):
+        members = chunk.merge(lookup, on="TICKER", how="inner") \
+                       .merge(membership, on=["REGIONNAME", "PRIMARYSECTORNAME"], how="inner")
+        if members.empty:
+            continue
+        groups = members["GROUP"].to_numpy()
+        for metric, sketch in sketches.items():
+            sketch.update(groups, pd.to_numeric(members[metric], errors="coerce").to_numpy())
+        for group, fund_codes in members.groupby("GROUP")["PORTFOLIOCODE"]:
+            funds[group].update(fund_codes.unique())
+
+    stats = pd.DataFrame({
+        "Median IRR":       sketches["IRR"].quantile(0.5) * 100,
+        "Mean MOIC":        sketches["MOIC"].mean(),
+        "Top Quartile DPI": sketches["DPI"].quantile(0.75),
+        "Fund Count":       [len(f) if f else np.nan for f in funds],
+        "Std Dev IRR":      sketches["IRR"].std() * 100,
+    }, index=pd.Index(codes, name="BENCHMARK_CODE"))
+    return _to_characteristic_rows(stats.round(4))
+
+
+if __name__ == "__main__":
+    df_benchmark_general = pd.read_csv(get_csv_path('benchmark_general.csv'))
+    codes = df_benchmark_general["BENCHMARK_CODE"].tolist()
+
+    print(compute_universe_stats(codes).head(10))
+    print(compute_universe_stats_streaming(codes, chunksize=25).head(10))
@@ -0,0 +1,264 @@
+"""
+Fetch layer for public index prices and metadata.
+
+`benchmark_performance.py` and `benchmark_characteristics.py` use this module
+instead of calling yfinance ticker by ticker:
+
+- Prices for all tickers are requested in one batched `yf.download` call;
+  tickers that come back empty are retried (only those) with exponential
+  backoff.
+- Metadata (`.info`) requests run concurrently on a thread pool, each with a
+  wall-clock timeout and retry/backoff.
+- Every successful response is written through to a local cache
+  (`CSVs/index_cache/`). When the network is unavailable, cached copies are
+  served instead, so a run never silently loses a public benchmark.
+- Providers are pluggable: `YFinanceProvider` talks to Yahoo Finance,
+  `LocalProvider` only reads the cache (offline runs and tests). Set
+  `INDEX_DATA_PROVIDER=local` to select it without code changes.
+
+Usage:
+    from benchmarks.index_fetch import fetch_histories, fetch_infos
+
+    histories = fetch_histories(["^GSPC", "IWM"], start="2010-01-01", end="2025-01-01")
+    infos = fetch_infos(["^GSPC", "URTH"])
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from path_helpers import get_csv_path
+
+DEFAULT_TIMEOUT = 10      # seconds per request
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0     # seconds, doubled after every failed attempt
+DEFAULT_WORKERS = 8
+
+
+class IndexCache:
+    """Write-through cache of price histories (CSV) and metadata (JSON) per ticker."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or get_csv_path('index_cache')
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, ticker, ext):
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)
+        return os.path.join(self.cache_dir, f"{safe}.{ext}")
+
+    def read_history(self, ticker):
+        path = self._path(ticker, "csv")
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    def write_history(self, ticker, df):
+        df[["Close"]].to_csv(self._path(ticker, "csv"))
+
+    def read_info(self, ticker):
+        path = self._path(ticker, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def write_info(self, ticker, info):
+        with open(self._path(ticker, "json"), "w") as f:
+            json.dump(info, f, default=str)
+
+
+class YFinanceProvider:
+    """Live provider backed by yfinance."""
+
+    def download(self, tickers, start, end, timeout=DEFAULT_TIMEOUT):
+        """Batched daily download; returns {ticker: DataFrame with a Close column}."""
+        import yfinance as yf
+
+        df = yf.download(tickers, start=start, end=end, group_by="ticker",
+                         threads=True, timeout=timeout, progress=False)
+        results = {}
+        if df is None or df.empty:
+            return results
+        for ticker in tickers:
+            if isinstance(df.columns, pd.MultiIndex):
+                if ticker not in df.columns.get_level_values(0):
+                    continue
+                frame = df[ticker]
+            else:
+                frame = df
+            if "Close" in frame.columns:
+                close = frame[["Close"]].dropna()
+                if not close.empty:
+                    results[ticker] = close
+        return results
+
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+
+class LocalProvider:
+    """Offline stand-in that serves only what is already in the cache."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or IndexCache()
+
+    def download(self, tickers, start, end, timeout=DEFAULT_TIMEOUT):
+        results = {}
+        for ticker in tickers:
+            df = self.cache.read_history(ticker)
+            if df is not None:
+                results[ticker] = _clip(df, start, end)
+        return results
+
+    def info(self, ticker):
+        info = self.cache.read_info(ticker)
+        if info is None:
+            raise LookupError(f"No cached metadata for {ticker}.")
+        return info
+
+
+def get_default_provider():
+    """Provider selected by the INDEX_DATA_PROVIDER env var ('yfinance' or 'local')."""
+    name = os.getenv("INDEX_DATA_PROVIDER", "yfinance").lower()
+    if name == "local":
+        return LocalProvider()
+    if name == "yfinance":
+        return YFinanceProvider()
+    raise ValueError(f"Unknown INDEX_DATA_PROVIDER: {name}")
+
+
+def _clip(df, start, end):
+    """Restrict a history to [start, end), matching yfinance semantics."""
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df.index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df.index < pd.Timestamp(end)
+    return df[mask.values]
+
+
+def fetch_histories(tickers, start, end, provider=None, cache=None,
+                    timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """
+    Download daily Close prices for all tickers at once.
+
+    Returns:
+        dict: {ticker: DataFrame indexed by date with a Close column}. Tickers
+        that fail every attempt and have no cached copy are omitted.
+    """
+    provider = provider or get_default_provider()
+    cache = cache or IndexCache()
+    pending = list(dict.fromkeys(tickers))
+    results = {}
+
+    for attempt in range(retries + 1):
+        try:
+            fetched = provider.download(pending, start, end, timeout=timeout)
+        except Exception as e:
+            print(f"[WARNING] Index download failed (attempt {attempt + 1}): {e}")
+            fetched = {}
+
+        for ticker, df in fetched.items():
+            results[ticker] = df
+            if not isinstance(provider, LocalProvider):
+                cache.write_history(ticker, df)
+
+        pending = [t for t in pending if t not in results]
+        if not pending or isinstance(provider, LocalProvider):
+            break
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+
+    # Serve cached copies for anything the provider could not deliver
+    for ticker in pending:
+        cached = cache.read_history(ticker)
+        if cached is not None:
+            print(f"[WARNING] Using cached prices for {ticker}.")
+            results[ticker] = _clip(cached, start, end)
+        else:
+            print(f"[WARNING] No prices available for {ticker}.")
+    return results
+
+
+def _call_with_timeout(fn, arg, timeout):
+    """
+    fn(arg) on a daemon thread, giving up after `timeout` seconds. A call that
+    hangs is left running in the background; being a daemon, it does not keep
+    the interpreter alive at exit.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = fn(arg)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name=f"index-info-{arg}", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"no response after {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def _call_with_retries(fn, arg, timeout, retries, backoff):
+    """fn(arg) with up to `retries` retries, each attempt limited to `timeout` seconds."""
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            return _call_with_timeout(fn, arg, timeout)
+        except Exception as e:
+            error = e
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    raise error
+
+
+def fetch_infos(tickers, provider=None, cache=None, timeout=DEFAULT_TIMEOUT,
+                retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, max_workers=DEFAULT_WORKERS):
+    """
+    Fetch `.info` metadata for all tickers concurrently.
+
+    Returns:
+        dict: {ticker: info dict}. Tickers that fail every attempt fall back to
+        the cached copy, or are omitted if there is none.
+    """
+    provider = provider or get_default_provider()
+    cache = cache or IndexCache()
+    tickers = list(dict.fromkeys(tickers))
+    results = {}
+    if isinstance(provider, LocalProvider):
+        retries = 0  # the cache either has it or it does not
+
+    if not tickers:
+        return results
+
+    # `workers` only waits; each request runs on its own daemon thread (see
+    # _call_with_timeout), so a hung request neither holds a worker past its
+    # timeout nor blocks interpreter exit.
+    with ThreadPoolExecutor(max_workers=max_workers) as workers:
+        futures = {
+            ticker: workers.submit(_call_with_retries, provider.info, ticker, timeout, retries, backoff)
+            for ticker in tickers
+        }
+
+    for ticker, future in futures.items():
+        try:
+            results[ticker] = future.result()
+            if not isinstance(provider, LocalProvider):
+                cache.write_info(ticker, results[ticker])
+        except Exception as e:
+            cached = cache.read_info(ticker)
+            if cached is not None:
+                print(f"[WARNING] Using cached metadata for {ticker}: {e}")
+                results[ticker] = cached
+            else:
+                print(f"[WARNING] No metadata available for {ticker}: {e}")
+    return results
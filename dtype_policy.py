@@ -0,0 +1,150 @@
+"""
+dtype_policy.py
+
+Memory-lean in-memory types for the generated tables. Every table keys on
+strings (36-character UUID TICKERs, FND0001, ACC0001, ...) and repeats
+low-cardinality text (currencies, sectors, regions, strategies) as object
+columns, so joins hash Python strings and each row holds several Python
+objects. The policy, declared in `snowflake/schema_registry.py`:
+
+| Column kind                 | In memory                            | Declared by                  |
+|-----------------------------|--------------------------------------|------------------------------|
+| Low-cardinality text        | `category`                           | `categorical=[...]`          |
+| Integer NUMBER(p,0)         | smallest nullable Int for p (Int16)  | column precision             |
+| Join key (fund, company...) | extra int64 `<DOMAIN>_SK` column     | KEY_DOMAINS + FOREIGN_KEYS   |
+
+Floats stay float64: NUMBER(18,2) amounts do not fit float32 exactly.
+
+Surrogate keys:
+- A key's surrogate is the 64-bit hash of its external ID
+  (`pd.util.hash_pandas_object`), so it is the same in every table and needs
+  no lookup table to assign: HOLDINGS.PORTFOLIOCODE and
+  PORTFOLIO_GENERAL_INFO.PORTFOLIOCODE both get the same FUND_SK.
+- `write_table` adds the SK columns to the Parquet copy (the CSV export is
+  unchanged), and `read_table` computes them for CSV reads.
+- Writing a domain's owning table fails if two IDs hash to the same SK.
+- `key_map(domain)` is the mapping table from SK back to the external ID.
+
+Usage:
+    python dtype_policy.py            # memory report: raw CSV read vs. policy read, per table
+
+    from dtype_policy import add_surrogate_keys, key_map
+    df = add_surrogate_keys(df, 'holdings')     # adds FUND_SK, COMPANY_SK
+    tickers = key_map('COMPANY')                # COMPANY_SK -> TICKER
+"""
+
+import os
+import sys
+from typing import TYPE_CHECKING, Dict, List, Optional
+from snowflake.schema_registry import KEY_DOMAINS, NO_PARENT, TABLE_SCHEMAS, get_table_schema, key_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MISSING_SK = 0
+
+
+def sk_column(domain: str) -> str:
+    return f"{domain}_SK"
+
+
+def surrogate_columns(table: str) -> Dict[str, str]:
+    """SK columns of `table`: `<DOMAIN>_SK` -> the (registry) key column it is derived from."""
+    schema = get_table_schema(table)
+    if schema is None:
+        return {}
+    return {sk_column(domain): column for column, domain in key_columns(schema.name).items()}
+
+
+def surrogate_key(values: "pd.Series") -> "pd.Series":
+    """
+    int64 surrogate key per external ID; missing IDs map to MISSING_SK.
+    """
+    import pandas as pd
+
+    text = values.astype("string")
+    sk = pd.util.hash_pandas_object(text.fillna(""), index=False).to_numpy().view("int64")
+    return pd.Series(sk, index=values.index).where(text.notna().to_numpy(), MISSING_SK)
+
+
+def add_surrogate_keys(df: "pd.DataFrame", table: str) -> "pd.DataFrame":
+    """
+    Add a `<DOMAIN>_SK` column for every join key of `table` present in `df`.
+
+    Raises:
+        ValueError: if `table` owns a domain and two of its IDs share a surrogate key
+    """
+    schema = get_table_schema(table)
+    if schema is None:
+        return df
+    by_upper = {str(c).upper(): c for c in df.columns}
+    added = {}
+    for sk, column in surrogate_columns(schema.name).items():
+        if column in by_upper and sk not in df.columns:
+            values = df[by_upper[column]]
+            added[sk] = surrogate_key(values)
+            placeholder = NO_PARENT.get((schema.name, column))
+            if placeholder is not None:  # "no parent" is a missing key, not an ID
+                is_placeholder = (values.astype("string") == placeholder).fillna(False).to_numpy()
+                added[sk] = added[sk].where(~is_placeholder, MISSING_SK)
+    for domain, (owner, column) in KEY_DOMAINS.items():
+        sk = added.get(sk_column(domain))
+        if owner == schema.name and sk is not None and sk.nunique() != df[by_upper[column]].nunique():
+            raise ValueError(f"Surrogate key collision in {owner}.{column}")
+    return df.assign(**added) if added else df
+
+
+def key_map(domain: str) -> "pd.DataFrame":
+    """
+    Mapping table for a key domain: one row per external ID of its owning table.
+
+    Returns:
+        pd.DataFrame: columns `<DOMAIN>_SK` and the owner's key column
+    """
+    from table_io import read_table, table_columns
+
+    owner, column = KEY_DOMAINS[domain]
+    stem = TABLE_SCHEMAS[owner].file[:-len(".csv")]
+    header = next(c for c in table_columns(stem) if c.upper() == column)
+    ids = read_table(stem, columns=[header])
+    return (ids.assign(**{sk_column(domain): surrogate_key(ids[header])})
+               [[sk_column(domain), header]].drop_duplicates().reset_index(drop=True))
+
+
+def memory_report(tables: Optional[List[str]] = None) -> List[Dict[str, object]]:
+    """
+    Deep memory of each generated table read as plain CSV (object columns)
+    versus read under the policy (registered types, categoricals, SK columns).
+    """
+    import pandas as pd
+    from path_helpers import get_csv_path
+    from snowflake.schema_registry import read_table_csv
+
+    rows = []
+    for name in tables or list(TABLE_SCHEMAS):
+        schema = TABLE_SCHEMAS[name.upper()]
+        path = get_csv_path(schema.file)
+        if not os.path.exists(path):
+            continue
+        raw = pd.read_csv(path)
+        typed = add_surrogate_keys(read_table_csv(schema.name, path), schema.name)
+        raw_mb = raw.memory_usage(deep=True).sum() / 1e6
+        typed_mb = typed.memory_usage(deep=True).sum() / 1e6
+        rows.append({
+            "table": schema.name,
+            "rows": len(raw),
+            "raw_mb": round(raw_mb, 3),
+            "typed_mb": round(typed_mb, 3),
+            "saved_pct": round(100 * (1 - typed_mb / raw_mb), 1) if raw_mb else 0.0,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    report = memory_report(sys.argv[1:] or None)
+    print(f"{'Table':<34}{'Rows':>10}{'Raw MB':>10}{'Typed MB':>10}{'Saved':>8}")
+    for r in report:
+        print(f"{r['table']:<34}{r['rows']:>10}{r['raw_mb']:>10.3f}{r['typed_mb']:>10.3f}{r['saved_pct']:>7.1f}%")
+    raw = sum(r["raw_mb"] for r in report)
+    typed = sum(r["typed_mb"] for r in report)
+    print(f"{'TOTAL':<34}{'':>10}{raw:>10.3f}{typed:>10.3f}{100 * (1 - typed / raw) if raw else 0:>7.1f}%")
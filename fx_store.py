@@ -0,0 +1,228 @@
+"""
+fx_store.py
+
+Dated FX rates and vectorized currency conversion.
+
+`currency_lookup.json` holds one static rate per country. This module keeps a
+time series of rates per currency (the `FX_RATES` table: CURRENCY_CODE,
+HISTORY_DATE, RATE_TO_USD = USD per one unit of the currency) and converts
+any amount column to a reporting currency at the rate in force on each row's
+date (the last rate on or before it).
+
+How conversion works:
+- All series are held in two flat arrays sorted by (currency, day): an int64
+  key `currency_index << 32 | day` and the rates. One `np.searchsorted` over
+  the keys finds the as-of rate for every row at once, whatever the mix of
+  currencies, so millions of cashflows need no per-row lookups.
+- Cross rates go through USD: amount * rate(from) / rate(to). USD is always 1.
+- Rows dated before a currency's first rate, and unknown currencies,
+  convert to NaN (with a warning naming the currencies).
+
+Providers (FX_PROVIDER):
+
+| Provider      | Source                                                                   |
+|---------------|--------------------------------------------------------------------------|
+| `synthetic`   | Default. Seeded random walk per currency in `currency_lookup.json`, ending at its static rate |
+| `file`        | A CSV with CURRENCY_CODE, HISTORY_DATE, RATE_TO_USD (FX_RATES_FILE)      |
+| `frankfurter` | ECB reference rates from api.frankfurter.app, through `APIs/http_cache.py` |
+
+Usage:
+    python fx_store.py                         # write CSVs/fx_rates.csv (+ Parquet) from FX_PROVIDER
+
+    from fx_store import load_fx_store
+    fx = load_fx_store()                       # reads the fx_rates table
+    usd = fx.convert(df['AMOUNT'], df['CURRENCYCODE'], df['DATE'], to='USD')
+"""
+
+import json
+import os
+import zlib
+from typing import Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from instrument import instrumented, record_rows
+
+FX_PROVIDER = os.getenv("FX_PROVIDER", "synthetic").lower()
+FX_RATES_FILE = os.getenv("FX_RATES_FILE", "JSON/fx_rates.csv")
+CURRENCY_LOOKUP = "JSON/currency_lookup.json"
+
+BASE = "USD"
+START_DATE = "2010-01-01"
+END_DATE = "2025-12-31"
+ANNUAL_VOL = 0.08         # synthetic provider: yearly volatility of log rates
+SEED = 42
+FX_COLUMNS = ["CURRENCY_CODE", "HISTORY_DATE", "RATE_TO_USD"]
+
+# Days are counted from 1900-01-01 so they stay non-negative in the low 32 bits of a key
+_EPOCH_DAY = int(np.datetime64("1900-01-01", "D").astype(np.int64))
+
+
+def _days(dates) -> np.ndarray:
+    """Day numbers since _EPOCH_DAY; missing or earlier dates map to day 0."""
+    days = pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]").astype(np.int64)
+    return np.clip(days - _EPOCH_DAY, 0, None)
+
+
+class SyntheticFxProvider:
+    """Offline stand-in: a business-daily random walk per currency, ending at the static lookup rate."""
+
+    def __init__(self, lookup_path: str = CURRENCY_LOOKUP, seed: int = SEED):
+        with open(lookup_path, "r") as f:
+            lookup = json.load(f)
+        self.anchors = {v["currency_code"]: float(v["fx_to_usd"]) for v in lookup.values()}
+        self.seed = seed
+
+    def rates(self, start: str = START_DATE, end: str = END_DATE) -> pd.DataFrame:
+        days = pd.bdate_range(start, end)
+        step_vol = ANNUAL_VOL / np.sqrt(252)
+        frames = []
+        for code, anchor in sorted(self.anchors.items()):
+            if code == BASE:
+                continue
+            # Seeded per currency, so adding a currency does not change the others
+            rng = np.random.default_rng([self.seed, zlib.crc32(code.encode())])
+            walk = np.cumsum(rng.normal(0.0, step_vol, len(days)))
+            frames.append(pd.DataFrame({
+                "CURRENCY_CODE": code,
+                "HISTORY_DATE": days,
+                "RATE_TO_USD": np.round(anchor * np.exp(walk - walk[-1]), 6),
+            }))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FX_COLUMNS)
+
+
+class FileFxProvider:
+    """Rates seeded from a local CSV (CURRENCY_CODE, HISTORY_DATE, RATE_TO_USD)."""
+
+    def __init__(self, path: str = FX_RATES_FILE):
+        self.path = path
+
+    def rates(self, start: str = START_DATE, end: str = END_DATE) -> pd.DataFrame:
+        df = pd.read_csv(self.path, usecols=FX_COLUMNS, parse_dates=["HISTORY_DATE"])
+        return df[(df["HISTORY_DATE"] >= start) & (df["HISTORY_DATE"] <= end)].reset_index(drop=True)
+
+
+class FrankfurterFxProvider:
+    """ECB reference rates for the lookup currencies, fetched (and cached) through APIs/http_cache.py."""
+
+    def __init__(self, lookup_path: str = CURRENCY_LOOKUP):
+        with open(lookup_path, "r") as f:
+            self.currencies = sorted({v["currency_code"] for v in json.load(f).values()} - {BASE})
+
+    def rates(self, start: str = START_DATE, end: str = END_DATE) -> pd.DataFrame:
+        from APIs.http_cache import fetch
+
+        url = f"https://api.frankfurter.app/{start}..{end}?from={BASE}&to={','.join(self.currencies)}"
+        quotes = fetch(url).json()["rates"]  # {date: {currency: units per USD}}
+        rows = [(code, day, 1.0 / per_usd) for day, by_code in quotes.items() for code, per_usd in by_code.items()]
+        df = pd.DataFrame(rows, columns=FX_COLUMNS)
+        df["HISTORY_DATE"] = pd.to_datetime(df["HISTORY_DATE"])
+        df["RATE_TO_USD"] = df["RATE_TO_USD"].round(6)
+        return df
+
+
+def get_default_provider():
+    """Provider selected by the FX_PROVIDER env var ('synthetic', 'file' or 'frankfurter')."""
+    if FX_PROVIDER == "synthetic":
+        return SyntheticFxProvider()
+    if FX_PROVIDER == "file":
+        return FileFxProvider()
+    if FX_PROVIDER == "frankfurter":
+        return FrankfurterFxProvider()
+    raise ValueError(f"Unknown FX_PROVIDER: {FX_PROVIDER}")
+
+
+class FxStore:
+    """As-of FX rates for many currencies in two flat sorted arrays (see module docstring)."""
+
+    def __init__(self, rates: pd.DataFrame):
+        df = rates[FX_COLUMNS].dropna()
+        df = df[df["CURRENCY_CODE"].astype(str) != BASE]
+        self.currencies: List[str] = sorted(df["CURRENCY_CODE"].astype(str).unique())
+        ccy = pd.Categorical(df["CURRENCY_CODE"].astype(str), categories=self.currencies).codes.astype(np.int64)
+        keys = (ccy << 32) | _days(df["HISTORY_DATE"])
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.rates = df["RATE_TO_USD"].to_numpy(dtype=np.float64)[order]
+
+    def _currency_index(self, currencies) -> np.ndarray:
+        """Index of each currency in self.currencies; -1 for USD, -2 when unknown."""
+        # Resolve each distinct code once, then broadcast back to the rows
+        rows, uniques = pd.factorize(pd.Series(currencies).astype("string"))
+        uniques = np.asarray(uniques, dtype=object)
+        pos = pd.Index(self.currencies).get_indexer(uniques)
+        pos = np.where(uniques == BASE, -1, np.where(pos < 0, -2, pos))
+        unknown = sorted(str(u) for u in uniques[pos == -2])
+        if unknown:
+            print(f"[WARNING] No FX rates for {', '.join(unknown)}; converted to NaN")
+        # Missing codes factorize to -1, which picks the trailing "unknown" entry
+        return np.append(pos, -2).astype(np.int64)[rows]
+
+    def rate_to_usd(self, currencies, dates) -> np.ndarray:
+        """
+        USD per unit of each row's currency, as of each row's date.
+
+        Returns:
+            np.ndarray: float64; 1.0 for USD, NaN before a currency's first rate or when unknown
+        """
+        idx = self._currency_index(currencies)
+        if not len(self.keys):
+            return np.where(idx == -1, 1.0, np.nan)
+        query = (np.maximum(idx, 0) << 32) | _days(dates)
+        pos = np.searchsorted(self.keys, query, side="right") - 1
+        found = (pos >= 0) & (self.keys[np.maximum(pos, 0)] >> 32 == np.maximum(idx, 0)) & (idx >= 0)
+        out = np.where(found, self.rates[np.maximum(pos, 0)], np.nan)
+        out[idx == -1] = 1.0
+        return out
+
+    def convert(self, amounts, currencies, dates, to: str = BASE) -> np.ndarray:
+        """
+        Convert `amounts` (in each row's currency) to `to` at each row's as-of rate.
+
+        Parameters:
+            amounts: numeric array-like
+            currencies: currency code per row
+            dates: date per row (anything pd.to_datetime accepts)
+            to: reporting currency
+
+        Returns:
+            np.ndarray: float64 amounts in `to`
+        """
+        amounts = pd.to_numeric(pd.Series(amounts), errors="coerce").to_numpy(dtype=np.float64)
+        converted = amounts * self.rate_to_usd(currencies, dates)
+        if to != BASE:
+            converted = converted / self.rate_to_usd(np.full(len(amounts), to, dtype=object), dates)
+        return converted
+
+
+@instrumented()
+def build_fx_rates(provider=None, start: str = START_DATE, end: str = END_DATE) -> pd.DataFrame:
+    """Rates from `provider` (default: FX_PROVIDER) in the FX_RATES layout, sorted by currency and date."""
+    provider = provider or get_default_provider()
+    df = provider.rates(start, end)[FX_COLUMNS]
+    df = df.sort_values(["CURRENCY_CODE", "HISTORY_DATE"], kind="stable").reset_index(drop=True)
+    record_rows(rows_out=len(df))
+    return df
+
+
+def load_fx_store(rates: Optional[pd.DataFrame] = None, currencies: Optional[Iterable[str]] = None) -> FxStore:
+    """
+    Build an FxStore from `rates`, or from the generated fx_rates table.
+
+    Parameters:
+        currencies: only load these currencies' series (filter pushed into the read)
+    """
+    if rates is None:
+        from table_io import read_table
+
+        filters = [("CURRENCY_CODE", "in", list(currencies))] if currencies is not None else None
+        rates = read_table("fx_rates", columns=FX_COLUMNS, filters=filters)
+    return FxStore(rates)
+
+
+if __name__ == "__main__":
+    from table_io import write_table
+
+    df_fx_rates = build_fx_rates()
+    write_table(df_fx_rates, "fx_rates")
+    print(f"✅ {len(df_fx_rates)} FX rates for {df_fx_rates['CURRENCY_CODE'].nunique()} currencies "
+          f"({FX_PROVIDER} provider)")
@@ -0,0 +1,158 @@
+"""
+gics_index.py
+
+Code-based index over the GICS hierarchy in `JSON/gics.json`, built once per
+process. GICS codes are fixed-width prefixes of each other, so every level of
+a code's ancestry is an integer division:
+
+| Level           | Digits | Example  | Name                        |
+|-----------------|--------|----------|-----------------------------|
+| SECTOR          | 2      | 45       | Information Technology      |
+| INDUSTRY_GROUP  | 4      | 4510     | Software & Services         |
+| INDUSTRY        | 6      | 451030   | Software                    |
+| SUB_INDUSTRY    | 8      | 45103010 | Application Software        |
+
+The index keeps one sorted code array and one aligned name array per level.
+Lookups take any mix of codes (any level) as an integer array: the prefix at
+each level is `code // 10**(digits - width)`, and its name is found by binary
+search (`np.searchsorted`) in that level's code array. There is no
+per-row dictionary lookup or string matching, so millions of holdings are
+resolved in a few array passes, and aggregations can group by the integer
+prefix (e.g. `gics.prefix(codes, "SECTOR")`) instead of by name.
+
+Unknown codes (not in gics.json, or not 2/4/6/8 digits) resolve to code -1
+and a missing name.
+
+Usage:
+    from gics_index import load_gics_index
+
+    gics = load_gics_index()
+    gics.lookup([45103010, 3510])          # DataFrame: code and name at every level
+    gics.prefix(codes, "SECTOR")           # int64 sector code per input code
+    gics.children(45)                      # sub-industry codes under a sector
+"""
+
+import functools
+import json
+from typing import Dict, Iterable, List
+import numpy as np
+
+GICS_PATH = "JSON/gics.json"
+
+LEVELS: Dict[str, int] = {"SECTOR": 2, "INDUSTRY_GROUP": 4, "INDUSTRY": 6, "SUB_INDUSTRY": 8}
+
+# Level -> (code field, name field) in gics.json
+_JSON_FIELDS = {
+    "SECTOR":         ("Sector Code", "Sector"),
+    "INDUSTRY_GROUP": ("Industry Group Code", "Industry Group"),
+    "INDUSTRY":       ("Industry Code", "Industry"),
+    "SUB_INDUSTRY":   ("Sub-Industry Code", "Sub-Industry"),
+}
+
+MISSING = -1
+
+
+class GicsIndex:
+    """Sorted code and name arrays per GICS level (see module docstring)."""
+
+    def __init__(self, rows: List[dict]):
+        self.codes: Dict[str, np.ndarray] = {}
+        self.names: Dict[str, np.ndarray] = {}
+        for level, (code_field, name_field) in _JSON_FIELDS.items():
+            pairs = sorted({(int(r[code_field]), r[name_field]) for r in rows})
+            self.codes[level] = np.array([c for c, _ in pairs], dtype=np.int64)
+            self.names[level] = np.array([n for _, n in pairs], dtype=object)
+
+    @staticmethod
+    def digits(codes) -> np.ndarray:
+        """Width of each code (2, 4, 6 or 8); 0 for anything that is not a GICS-shaped code."""
+        codes = np.asarray(codes, dtype=np.int64)
+        conditions = [(codes >= 10 ** (w - 1)) & (codes < 10 ** w) for w in LEVELS.values()]
+        return np.select(conditions, list(LEVELS.values()), default=0)
+
+    def positions(self, codes, level: str) -> np.ndarray:
+        """Row of each code in `level`'s arrays, or MISSING."""
+        codes = np.asarray(codes, dtype=np.int64)
+        table = self.codes[level]
+        pos = np.searchsorted(table, codes)
+        pos = np.minimum(pos, len(table) - 1)
+        return np.where(table[pos] == codes, pos, MISSING)
+
+    def _known(self, codes: np.ndarray, digits: np.ndarray) -> np.ndarray:
+        """True where a code exists at its own level."""
+        known = np.zeros(len(codes), dtype=bool)
+        for level, width in LEVELS.items():
+            at_level = digits == width
+            if at_level.any():
+                known[at_level] = self.positions(codes[at_level], level) != MISSING
+        return known
+
+    def _prefix(self, codes: np.ndarray, digits: np.ndarray, known: np.ndarray, level: str) -> np.ndarray:
+        width = LEVELS[level]
+        ancestor = codes // (10 ** np.clip(digits - width, 0, None))
+        return np.where(known & (digits >= width), ancestor, MISSING)
+
+    def prefix(self, codes, level: str) -> np.ndarray:
+        """
+        The `level` ancestor of each code (the code itself at its own level).
+
+        Returns:
+            np.ndarray: int64 codes; MISSING where the code is unknown or above `level`
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        digits = self.digits(codes)
+        return self._prefix(codes, digits, self._known(codes, digits), level)
+
+    def lookup(self, codes):
+        """
+        Full ancestry of each code.
+
+        Returns:
+            pd.DataFrame: <LEVEL>_CODE (Int64) and <LEVEL> (categorical name) for
+            every level, one row per input code
+        """
+        import pandas as pd
+
+        codes = np.asarray(codes, dtype=np.int64)
+        digits = self.digits(codes)
+        known = self._known(codes, digits)
+        out = {}
+        for level in LEVELS:
+            ancestor = self._prefix(codes, digits, known, level)
+            found = ancestor != MISSING
+            pos = np.searchsorted(self.codes[level], ancestor)  # every ancestor of a known code exists
+            out[f"{level}_CODE"] = pd.arrays.IntegerArray(np.where(found, ancestor, 0), ~found)
+            out[level] = pd.Categorical.from_codes(np.where(found, pos, -1), self.names[level])
+        return pd.DataFrame(out)
+
+    def name(self, code: int):
+        """Name of one code at its own level, or None."""
+        for level, width in LEVELS.items():
+            if self.digits([code])[0] == width:
+                pos = self.positions([code], level)[0]
+                return self.names[level][pos] if pos != MISSING else None
+        return None
+
+    def children(self, code: int) -> List[int]:
+        """Sub-industry codes under `code` (any level), in code order."""
+        width = int(self.digits([code])[0])
+        if width == 0:
+            return []
+        scale = 10 ** (LEVELS["SUB_INDUSTRY"] - width)
+        subs = self.codes["SUB_INDUSTRY"]
+        lo, hi = np.searchsorted(subs, [code * scale, (code + 1) * scale])
+        return subs[lo:hi].tolist()
+
+    def codes_for_names(self, names: Iterable[str], level: str) -> np.ndarray:
+        """Codes for names at one level (e.g. PRIMARYSECTORNAME values); MISSING if unknown."""
+        import pandas as pd
+
+        pos = pd.Index(self.names[level]).get_indexer(list(names))
+        return np.where(pos != MISSING, self.codes[level][pos], MISSING)
+
+
+@functools.lru_cache(maxsize=None)
+def load_gics_index(path: str = GICS_PATH) -> GicsIndex:
+    """Build the index from gics.json once per process."""
+    with open(path, "r") as f:
+        return GicsIndex(json.load(f))
@@ -42,93 +42,103 @@ import pandas as pd
 import numpy as np
 import random
 from datetime import datetime, timedelta
-import os
-from path_helpers import get_csv_path
+from table_io import read_table
+from instrument import instrumented
 
 # Exit settings
 exit_types = ['IPO', 'Acquisition', 'Write-off']
 acquirer_types = ['Strategic', 'Financial Sponsor']
-today = datetime.today()
 
-vc_exit_events = []
 
-# Load holdings DataFrame and portfolio general info DataFrame
-holdings_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'holdings.csv')
-portfolio_general_info_path  = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'portfolio_general_info.csv')
+@instrumented()
+def simulate_exits(holdings_df, portfolio_general_info_df, today=None):
+    """
+    Simulate exit events for companies held by ~20% of the funds.
 
-holdings_path = os.path.abspath(holdings_path)
-portfolio_general_info_path  = os.path.abspath(portfolio_general_info_path)
+    Parameters:
+        holdings_df (pd.DataFrame): PORTFOLIOCODE, TICKER and ISSUENAME per holding
+        portfolio_general_info_df (pd.DataFrame): PORTFOLIOCODE and CLOSE_DATE per fund
+        today (datetime): exits later than this are pulled back into the past year
 
-holdings_df = pd.read_csv(holdings_path)
-portfolio_general_info_df = pd.read_csv(portfolio_general_info_path)
+    Returns:
+        pd.DataFrame: one row per exit event (see Output Schema above)
+    """
+    today = today or datetime.today()
+    vc_exit_events = []
 
-for _, row in portfolio_general_info_df.iterrows():
-    fund_id = row["PORTFOLIOCODE"]
-    close_date = datetime.strptime(str(row["CLOSE_DATE"]), "%Y-%m-%d")
+    # Group holdings by fund once instead of filtering the whole table per fund
+    holdings_by_fund = dict(tuple(holdings_df.groupby("PORTFOLIOCODE", sort=False)))
 
-    # Filter holdings belonging to this fund
-    fund_holdings = holdings_df[holdings_df["PORTFOLIOCODE"] == fund_id]
+    for _, row in portfolio_general_info_df.iterrows():
+        fund_id = row["PORTFOLIOCODE"]
+        close_date = pd.Timestamp(row["CLOSE_DATE"]).to_pydatetime()
 
-    # Skip if no holdings available
-    if fund_holdings.empty:
-        continue
+        # Holdings belonging to this fund; skip if none
+        fund_holdings = holdings_by_fund.get(fund_id)
+        if fund_holdings is None:
+            continue
 
-    # ~20% of funds have exits
-    if random.random() > 0.8:  # Keep ~20%
-        num_exits = random.randint(1, 5)
+        # ~20% of funds have exits
+        if random.random() > 0.8:  # Keep ~20%
+            num_exits = random.randint(1, 5)
 
-        # Prevent sampling more exits than companies
-        num_exits = min(num_exits, len(fund_holdings))
+            # Prevent sampling more exits than companies
+            num_exits = min(num_exits, len(fund_holdings))
 
-        # Randomly select companies to exit
-        exited_companies = fund_holdings.sample(n=num_exits)
+            # Randomly select companies to exit
+            exited_companies = fund_holdings.sample(n=num_exits)
 
-        for _, company_row in exited_companies.iterrows():
-            company_id = company_row["TICKER"]
-            company_name = company_row["ISSUENAME"]
+            for _, company_row in exited_companies.iterrows():
+                company_id = company_row["TICKER"]
+                company_name = company_row["ISSUENAME"]
 
-            # Generate realistic exit date
-            exit_years = int(np.random.choice(
-                [3, 4, 5, 6, 7, 8, 9],
-                p=[0.05, 0.1, 0.2, 0.25, 0.25, 0.1, 0.05]
-            ))
-            exit_date = close_date + timedelta(days=exit_years * 365)
+                # Generate realistic exit date
+                exit_years = int(np.random.choice(
+                    [3, 4, 5, 6, 7, 8, 9],
+                    p=[0.05, 0.1, 0.2, 0.25, 0.25, 0.1, 0.05]
+                ))
+                exit_date = close_date + timedelta(days=exit_years * 365)
 
-            # Cap to today if in future
-            if exit_date > today:
-                exit_date = today - timedelta(days=random.randint(0, 365))
+                # Cap to today if in future
+                if exit_date > today:
+                    exit_date = today - timedelta(days=random.randint(0, 365))
 
-            exit_type = random.choice(exit_types)
+                exit_type = random.choice(exit_types)
 
-            if exit_type == "Write-off":
-                moic = 0.0
-                exit_value = 0.0
-            else:
-                moic = round(np.random.uniform(0.5, 5.0), 2)
-                exit_value = round(np.random.uniform(10, 500), 2)
+                if exit_type == "Write-off":
+                    moic = 0.0
+                    exit_value = 0.0
+                else:
+                    moic = round(np.random.uniform(0.5, 5.0), 2)
+                    exit_value = round(np.random.uniform(10, 500), 2)
 
-            exit_event = {
-                "PORTFOLIOCODE": fund_id,
-                "TICKER": company_id,
-                "COMPANY": company_name,
-                "EXITTYPE": exit_type,
-                "ACQUIRERTYPE": random.choice(acquirer_types),
-                "MOIC": moic,
-                "EXITVALUE_MILLION_USD": exit_value,
-                "EXITDATE": exit_date.strftime("%Y-%m-%d")
-            }
+                exit_event = {
+                    "PORTFOLIOCODE": fund_id,
+                    "TICKER": company_id,
+                    "COMPANY": company_name,
+                    "EXITTYPE": exit_type,
+                    "ACQUIRERTYPE": random.choice(acquirer_types),
+                    "MOIC": moic,
+                    "EXITVALUE_MILLION_USD": exit_value,
+                    "EXITDATE": exit_date.strftime("%Y-%m-%d")
+                }
 
-            vc_exit_events.append(exit_event)
+                vc_exit_events.append(exit_event)
+
+    # Convert to DataFrame
+    return pd.DataFrame(vc_exit_events)
 
-# Convert to DataFrame
-vc_exit_df = pd.DataFrame(vc_exit_events)
 
 if __name__ == "__main__":
+    # Load holdings DataFrame and portfolio general info DataFrame
+    holdings_df = read_table('holdings', columns=["PORTFOLIOCODE", "TICKER", "ISSUENAME"])
+    portfolio_general_info_df = read_table('portfolio_general_info', columns=["PORTFOLIOCODE", "CLOSE_DATE"])
+
     # Simulate exit events and export to CSV
-    vc_exit_df = pd.DataFrame(vc_exit_events)
+    vc_exit_df = simulate_exits(holdings_df, portfolio_general_info_df)
     #vc_exit_df.to_csv("vc_exit.csv", index=False)
     print(vc_exit_df.head())  # Display first few rows for verification
 
     # Save the generated holdings data to a CSV file
     # output_file_path = get_csv_path('exits.csv')
-    # vc_exit_df.to_csv(output_file_path, index=False) 
\ No newline at end of file
+    # vc_exit_df.to_csv(output_file_path, index=False)
\ No newline at end of file
@@ -12,36 +12,54 @@ This is intended to simulate the data that would feed the HOLDINGSDETAILS
 table. This table will connect via the 
 
 Assumptions:
-- Funds are labeled as FUND_001 to FUND_005
+- Funds are the PORTFOLIOCODEs of portfolio_general_info (FND0001, ...) at the
+  current SCALE_FACTOR, with ~10 holdings per fund (`scale.py`)
 - Companies are randomly generated using the Faker package
 - Valuations, positions, and geographic exposures are randomized within realistic ranges
+- Sectors are drawn uniformly from GICS, then a real sub-industry of that
+  sector (`gics_index.py`); PRIMARYINDUSTRYCODE is its 8-digit GICS code, so
+  any level of the hierarchy can be recovered with `gics.prefix(...)`
 """
 
-import pandas as pd
-import numpy as np
+import functools
 import random
-from faker import Faker
 import json
 import uuid
-from path_helpers import get_csv_path
+from scale import fund_codes, size
+from instrument import instrumented
 
 # Initialize random number generators for reproducibility
-fake = Faker()
-np.random.seed(42)
 random.seed(42)
 
-def generate_holdings_data(n=100):
+
+@functools.lru_cache(maxsize=None)
+def _faker():
+    """Faker is slow to import and construct, so build it on first use."""
+    from faker import Faker
+    return Faker()
+
+
+@instrumented()
+def generate_holdings_data(n=None, portfolio_codes=None):
     """
     Generate n synthetic PE/VC holdings for simulated portfolio companies.
 
     Parameters:
-        n (int): Number of synthetic holdings to generate.
+        n (int): Number of synthetic holdings to generate; defaults to
+            holdings_per_fund for every fund at the current scale factor.
+        portfolio_codes (list): Funds to spread the holdings over; defaults to
+            every fund at the current scale factor.
 
     Returns:
         pd.DataFrame: A DataFrame representing the synthetic holdings.
     """
+    import pandas as pd
+
     # Define sample pools for random selection
-    portfolio_codes = [f"FUND_{i:03d}" for i in range(1, 6)] # FUND_001 to FUND_005
+    if portfolio_codes is None:
+        portfolio_codes = fund_codes()
+    if n is None:
+        n = len(portfolio_codes) * size("holdings_per_fund")
 
     # Read in the JSON File for country metadata
     with open('JSON/synthetic_countries.json', "r") as f:
@@ -53,17 +71,19 @@ def generate_holdings_data(n=100):
         for entry in countries_json
     ]
 
-    # Read in the JSON File for sectors metadata
-    with open('JSON/sectors.json', "r") as f:
-        sectors_json = json.load(f)
+    # GICS hierarchy: sectors in code order, and the real sub-industries of each
+    from gics_index import load_gics_index
 
-    sectors = [entry["Sector"] for entry in sectors_json]
+    gics = load_gics_index()
+    sectors = gics.codes["SECTOR"].tolist()
+    sub_industries = {sector: gics.children(sector) for sector in sectors}
 
     # Read in the JSON File for currency metadata
     with open('JSON/currency_lookup.json', "r") as f:
         currency_json = json.load(f)
 
     # Generate synthetic holdings data
+    fake = _faker()
     records = []
     for _ in range(n):
         # Random fund assignment
@@ -79,6 +99,7 @@ def generate_holdings_data(n=100):
         # Geographic and sector metadata
         risk_country_code, risk_country, region = random.choice(countries_regions)
         sector = random.choice(sectors)
+        sub_industry = random.choice(sub_industries[sector])
         
         # Look up currency details
         if risk_country in currency_json:
@@ -99,8 +120,9 @@ def generate_holdings_data(n=100):
             "ISSUENAME": issuername,
             "ISSUEDISPLAYNAME": issuername,
             "ASSETCLASSNAME": "Private Equity",
-            "PRIMARYSECTORNAME": sector,
-            "PRIMARYINDUSTRYNAME": f"{sector} Services",
+            "PRIMARYSECTORNAME": gics.name(sector),
+            "PRIMARYINDUSTRYNAME": gics.name(sub_industry),
+            "PRIMARYINDUSTRYCODE": sub_industry,
             "RISKCOUNTRYCODE": risk_country_code,
             "RISKCOUNTRY": risk_country,
             "REGIONNAME": region
@@ -110,8 +132,9 @@ def generate_holdings_data(n=100):
 
 # Main block to allow standalone script execution
 if __name__ == "__main__":
-    df_holdings = generate_holdings_data(n=100)
+    from table_io import write_table
+
+    df_holdings = generate_holdings_data()
 
     # Save the generated holdings data to a CSV file
-    output_file_path = get_csv_path('holdings.csv')
-    df_holdings.to_csv(output_file_path, index=False)
+    write_table(df_holdings, 'holdings')
@@ -22,13 +22,12 @@ where general information (e.g., sector, region, currency) is handled
 separately. Here, we focus solely on the financials.
 """
 
-import numpy as np
-import numpy_financial as npf
-import pandas as pd
 from datetime import datetime, timedelta
 import random
-from path_helpers import get_csv_path
-import os
+from instrument import instrumented
+
+# numpy, numpy_financial and pandas are imported where they are used, so a
+# caller that only needs compute_irr or the generators starts up quickly
 
 def generate_distributions(investment_date, total_investment, max_years=7):
     """
@@ -49,7 +48,8 @@ def generate_distributions(investment_date, total_investment, max_years=7):
 
 def generate_nav(investment_date, distributions, amounts, total_investment):
     """Estimate NAV as residual unrealized value, keeping MOIC realistic."""
-    max_nav = total_investment * 2 - sum(amounts)
+    # Up to 4 distributions of 0.6x can exceed the 2x cap; NAV is then zero, never negative
+    max_nav = max(total_investment * 2 - sum(amounts), 0)
     nav = round(random.uniform(0, max_nav), 2)
     if distributions:
      latest_date = max(distributions)
@@ -60,12 +60,12 @@ def generate_nav(investment_date, distributions, amounts, total_investment):
 
 def compute_irr(cash_flows):
     """Compute IRR given a list of (amount, date) cash flows. Returns None if invalid."""
+    import numpy_financial as npf
+
     try:
         if not cash_flows or len(cash_flows) < 2:
             return None
         amounts, dates = zip(*cash_flows)
-        days = np.array([(d - dates[0]).days for d in dates])
-        years = days / 365.25
         return round(npf.irr(amounts), 4)
     except:
         return None
@@ -110,6 +110,7 @@ def build_company_record(company_id):
         #"history_date": # history
     }
 
+@instrumented()
 def validate_performance(df):
     """
         Checks that MOIC, DPI, and TVPI values in the DataFrame are consistent with
@@ -123,6 +124,8 @@ def validate_performance(df):
             Must include columns: 'investment_amount', 'distribution_amounts',
             'current_nav', 'moic', 'dpi', and 'tvpi'.
     """
+    import numpy as np
+
     for i, row in df.iterrows():
         investment = row['INVESTMENT_AMOUNT']
         nav = row['CURRENT_NAV']
@@ -144,33 +147,34 @@ def validate_performance(df):
 
     print("All performance metrics are internally consistent!")
 
-def generate_portfolio_company_financials(n=100):
+@instrumented()
+def generate_portfolio_company_financials(holdings_df):
     """
     Generate synthetic financials for a batch of portfolio companies.
 
     Parameters:
-    n (int): Number of companies to generate
+    holdings_df (pd.DataFrame): Holdings; one company per unique TICKER
 
     Returns:
     pd.DataFrame: Tabular output with one row per company
     """
+    import pandas as pd
+
     # Gets the tickers from the holdings DataFrame
     tickers = holdings_df["TICKER"].unique()
     records = [build_company_record(ticker) for ticker in tickers]
     return pd.DataFrame(records)   
 
 if __name__ == "__main__":
+    from table_io import read_table, write_table
+
     # 100 has to be entered so that the company names are coming over correctly
     # from the holdings module
-    holdings_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'holdings.csv')
-    holdings_path = os.path.abspath(holdings_path)
-
-    holdings_df = pd.read_csv(holdings_path)
+    holdings_df = read_table('holdings')
     metrics_df = generate_portfolio_company_financials(holdings_df)
 
     # Run the validation
     validate_performance(metrics_df)
     
     # Save the generated holdings data to a CSV file
-    output_file_path = get_csv_path('holdings_metrics.csv')
-    metrics_df.to_csv(output_file_path, index=False)
\ No newline at end of file
+    write_table(metrics_df, 'holdings_metrics')
\ No newline at end of file
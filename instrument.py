@@ -0,0 +1,282 @@
+"""
+instrument.py
+
+Lightweight instrumentation for the generators, loaders and analyzers.
+Wrap a function with `@instrumented()` or a block with `with step(...)` and
+every call appends one JSON line to the run report:
+
+| Field            | Meaning                                                        |
+|------------------|----------------------------------------------------------------|
+| `run_id`         | One id per run; pipeline.py shares it across all its stages    |
+| `stage`          | Pipeline stage (INSTRUMENT_STAGE) or the script name           |
+| `step`           | Dotted path of nested steps, e.g. `simulate_exits` or `write_table` |
+| `wall_s`         | Elapsed wall-clock seconds                                     |
+| `cpu_s`          | Process CPU seconds (user + system) spent during the step      |
+| `peak_rss_mb`    | Process peak resident memory at the end of the step            |
+| `rss_growth_mb`  | How much the step raised that peak                             |
+| `rows_in`        | Rows of the DataFrames/Arrow tables passed in                  |
+| `rows_out`       | Rows of the DataFrame/Arrow table returned (or set explicitly) |
+| `bytes_written`  | Bytes of files written during the step (table_io, bulk loads)  |
+| `status`         | `ok` or `error` (with the exception type in `error`)           |
+
+Reports go to `.run_reports/<run_id>.jsonl`. Pipeline stages also write one
+`<process>` record per stage: CPU time and peak memory for the whole script.
+
+Environment:
+- INSTRUMENT=0          disable (the decorators become plain calls)
+- INSTRUMENT_PROFILE=1  also run cProfile for the whole process and dump
+                        `.run_reports/<run_id>/<stage>.prof` (open with pstats/snakeviz)
+- RUN_ID, INSTRUMENT_STAGE are set by pipeline.py
+
+Usage:
+    from instrument import annotate, instrumented, record_bytes, record_rows, step
+
+    @instrumented()
+    def simulate_exits(holdings_df, portfolio_general_info_df): ...
+
+    with step("load", table="holdings") as s:
+        ...
+        s.rows_out = len(df)
+
+    # inside an instrumented function
+    annotate(table=name); record_bytes(path); record_rows(rows_out=n)
+
+    python instrument.py                          # summarize the latest report
+    python instrument.py .run_reports/<run_id>.jsonl
+"""
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows; memory fields are left empty
+    resource = None
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+ENABLED = os.getenv("INSTRUMENT", "1") != "0"
+REPORT_DIR = os.path.join(ROOT, os.getenv("INSTRUMENT_DIR", ".run_reports"))
+RUN_ID = os.getenv("RUN_ID") or f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+STAGE = os.getenv("INSTRUMENT_STAGE") or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+PROFILE = os.getenv("INSTRUMENT_PROFILE") == "1"
+
+_PROCESS_START = time.perf_counter()
+_active: contextvars.ContextVar = contextvars.ContextVar("instrument_active", default=())
+
+
+def report_path(run_id: Optional[str] = None) -> str:
+    return os.path.join(REPORT_DIR, f"{run_id or RUN_ID}.jsonl")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system
+
+
+def _emit(record: Dict[str, object]) -> None:
+    """Append one record; a single write per line keeps parallel stages from interleaving."""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(report_path(), "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+class Step:
+    """Mutable handle of a running step; set rows_in/rows_out or extra fields on it."""
+
+    def __init__(self, path: str, extra: Dict[str, object]):
+        self.path = path
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.bytes_written = 0
+        self.extra = dict(extra)
+
+
+@contextlib.contextmanager
+def step(name: str, **extra) -> Iterator[Step]:
+    """
+    Measure the enclosed block as one step (nested steps get dotted paths).
+
+    Parameters:
+        name: step name
+        extra: additional JSON-serializable fields for the record (e.g. table='holdings')
+    """
+    parents = _active.get()
+    s = Step(f"{parents[-1].path}.{name}" if parents else name, extra)
+    if not ENABLED:
+        yield s
+        return
+
+    token = _active.set(parents + (s,))
+    started = datetime.now()
+    wall0, cpu0, rss0 = time.perf_counter(), _cpu_seconds(), _peak_rss_mb()
+    status, error = "ok", None
+    try:
+        yield s
+    except BaseException as e:
+        status, error = "error", type(e).__name__
+        raise
+    finally:
+        _active.reset(token)
+        rss1 = _peak_rss_mb()
+        _emit({
+            "run_id": RUN_ID, "stage": STAGE, "step": s.path, "pid": os.getpid(),
+            "started": started.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - wall0, 6),
+            "cpu_s": round(_cpu_seconds() - cpu0, 6),
+            "peak_rss_mb": None if rss1 is None else round(rss1, 1),
+            "rss_growth_mb": None if rss1 is None else round(rss1 - rss0, 1),
+            "rows_in": s.rows_in, "rows_out": s.rows_out,
+            "bytes_written": s.bytes_written,
+            "status": status, "error": error, **s.extra,
+        })
+
+
+def _rows(obj) -> Optional[int]:
+    """Row count of a DataFrame/Series/Arrow table (or a tuple of them), else None."""
+    if isinstance(obj, tuple):
+        counts = [c for c in (_rows(o) for o in obj) if c is not None]
+        return sum(counts) if counts else None
+    if hasattr(obj, "num_rows"):
+        return int(obj.num_rows)
+    if hasattr(obj, "shape") and hasattr(obj, "index"):
+        return len(obj)
+    return None
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """
+    Decorator: run the function inside step(name or its qualified name),
+    counting rows of DataFrame arguments and of the returned value.
+    """
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with step(label) as s:
+                s.rows_in = _rows(tuple(args) + tuple(kwargs.values()))
+                result = fn(*args, **kwargs)
+                if s.rows_out is None:
+                    s.rows_out = _rows(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def record_rows(rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+    """Set row counts on the innermost running step (for functions that return nothing)."""
+    active = _active.get()
+    if active:
+        if rows_in is not None:
+            active[-1].rows_in = rows_in
+        if rows_out is not None:
+            active[-1].rows_out = rows_out
+
+
+def annotate(**fields) -> None:
+    """Add fields (e.g. table='holdings') to the innermost running step's record."""
+    active = _active.get()
+    if active:
+        active[-1].extra.update(fields)
+
+
+def record_bytes(path_or_size) -> None:
+    """Add a written file's size (or a byte count) to every running step."""
+    n = os.path.getsize(path_or_size) if isinstance(path_or_size, str) else int(path_or_size)
+    for s in _active.get():
+        s.bytes_written += n
+
+
+# --------------- Process record and profiler ----------------
+_profiler = None
+if ENABLED and PROFILE:
+    import cProfile
+
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+
+@atexit.register
+def _finish_process() -> None:
+    if not ENABLED:
+        return
+    if _profiler is not None:
+        _profiler.disable()
+        out_dir = os.path.join(REPORT_DIR, RUN_ID)
+        os.makedirs(out_dir, exist_ok=True)
+        _profiler.dump_stats(os.path.join(out_dir, f"{STAGE}.prof"))
+    if os.getenv("INSTRUMENT_STAGE"):
+        rss = _peak_rss_mb()
+        _emit({
+            "run_id": RUN_ID, "stage": STAGE, "step": "<process>", "pid": os.getpid(),
+            "wall_s": round(time.perf_counter() - _PROCESS_START, 6),
+            "cpu_s": round(_cpu_seconds(), 6),
+            "peak_rss_mb": None if rss is None else round(rss, 1),
+            "status": "ok",
+        })
+
+
+# --------------- Reports ----------------
+def load_report(path: Optional[str] = None) -> List[Dict[str, object]]:
+    """Records of a report file (default: this run's)."""
+    with open(path or report_path(), "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_report() -> Optional[str]:
+    if not os.path.isdir(REPORT_DIR):
+        return None
+    files = [os.path.join(REPORT_DIR, f) for f in os.listdir(REPORT_DIR) if f.endswith(".jsonl")]
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def format_report(records: List[Dict[str, object]]) -> str:
+    """Plain-text table of a report, slowest stages first."""
+    def fmt(v, spec):
+        width = int(spec.split(".")[0].rstrip("df"))
+        return format("-", f">{width}") if v is None else format(v, spec)
+
+    def label(r):
+        return f"{r['step']}[{r['table']}]" if r.get("table") else r["step"]
+
+    stage_wall: Dict[str, float] = {}
+    for r in records:
+        stage_wall[r["stage"]] = max(stage_wall.get(r["stage"], 0.0), r.get("wall_s") or 0.0)
+    ordered = sorted(records, key=lambda r: (-stage_wall[r["stage"]], r["stage"], r.get("started", "")))
+
+    lines = [f"{'stage':<30} {'step':<52} {'wall s':>9} {'cpu s':>9} {'peak MB':>8} "
+             f"{'rows in':>9} {'rows out':>9} {'bytes':>11} status"]
+    for r in ordered:
+        lines.append(
+            f"{r['stage']:<30} {label(r):<52} {fmt(r.get('wall_s'), '9.3f')} {fmt(r.get('cpu_s'), '9.3f')} "
+            f"{fmt(r.get('peak_rss_mb'), '8.1f')} {fmt(r.get('rows_in'), '9d')} {fmt(r.get('rows_out'), '9d')} "
+            f"{fmt(r.get('bytes_written') or None, '11d')} {r.get('status', '')}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else latest_report()
+    if not path:
+        print(f"[WARNING] No run reports in {REPORT_DIR}")
+        sys.exit(1)
+    print(f"Run report: {path}")
+    print(format_report(load_report(path)))
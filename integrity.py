@@ -0,0 +1,328 @@
+"""
+integrity.py
+
+Cross-table referential integrity and quality checks for the generated tables.
+A key that has no parent row is silently dropped by every inner join
+downstream (e.g. holdings whose PORTFOLIOCODE is not a fund), so these rules
+are checked after the tables are built:
+
+| Rule          | Declared in                              | Violation                                |
+|---------------|------------------------------------------|------------------------------------------|
+| `unique`      | primary keys in `schema_registry.py`     | key on more than one row                 |
+| `not_null`    | NOT NULL columns in `schema_registry.py` | missing value                            |
+| `foreign_key` | FOREIGN_KEYS in `schema_registry.py`     | child key with no row in the parent table (NO_PARENT placeholders excepted) |
+| `range`       | RANGES below                             | value outside [low, high]                |
+
+How it runs:
+- Key columns are hashed to uint64 per row (`pd.util.hash_pandas_object`), so
+  multi-column and string keys are compared as integers.
+- A foreign key is an anti-join: the child's key hashes are looked up in a
+  hash index of the parent's key hashes (`pd.Index.get_indexer`), with no
+  sort and no merge of the string columns.
+- Every table is streamed once (`table_io.iter_table`: Parquet row groups or
+  CSV chunks), decoding only the columns the rules use. Tables are visited
+  parents first, so each partition's foreign keys are checked as soon as it
+  is read; null and range rules are checked per partition; uniqueness is
+  decided over all key hashes at the end. Only when duplicates exist is the
+  table's key read a second time, to show example values.
+
+Rules on tables that have not been generated (e.g. EXITS) are reported as
+`skipped`. The report goes to `CSVs/integrity_report.json`.
+
+Usage:
+    python integrity.py                 # check every table; exit code 1 on violations
+    python integrity.py HOLDINGS ACCOUNTS
+
+    from integrity import check_integrity
+    results = check_integrity()
+"""
+
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from path_helpers import get_csv_path
+from snowflake.schema_registry import FOREIGN_KEYS, NO_PARENT, TABLE_SCHEMAS
+from table_io import iter_table, table_columns, table_exists
+from instrument import annotate, instrumented, record_rows
+
+MAX_EXAMPLES = 5
+REPORT_FILE = "integrity_report.json"
+
+# (table, column): inclusive (low, high); None leaves that side open
+RANGES: Dict[Tuple[str, str], Tuple[Optional[float], Optional[float]]] = {
+    ("ACCOUNTS", "FX TO USD"):                            (0, None),
+    ("ACCOUNTS", "COMMITTED CAPITAL (USD)"):              (0, None),
+    ("ACCOUNTS", "NAV (USD)"):                            (0, None),
+    ("ACCOUNTS", "NUMBER OF FUNDS"):                      (1, None),
+    ("PORTFOLIO_GENERAL_INFO", "VINTAGE_YEAR"):           (1950, 2100),
+    ("PORTFOLIO_GENERAL_INFO", "FUND_SIZE_MILLIONS"):     (0, None),
+    ("FUND_MANAGERS", "RANK"):                            (1, None),
+    ("FUND_MANAGERS", "YEARSONFUND"):                     (0, None),
+    ("FUND_MANAGERS", "YEARSEXPERIENCE"):                 (0, None),
+    ("HOLDINGS_METRICS", "INVESTMENT_AMOUNT"):            (0, None),
+    ("HOLDINGS_METRICS", "CURRENT_NAV"):                  (0, None),
+    ("HOLDINGS_METRICS", "IRR"):                          (-1, None),
+    ("HOLDINGS_METRICS", "MOIC"):                         (0, None),
+    ("HOLDINGS_METRICS", "DPI"):                          (0, None),
+    ("HOLDINGS_METRICS", "TVPI"):                         (0, None),
+    ("EXITS", "MOIC"):                                    (0, None),
+    ("EXITS", "EXITVALUE_MILLION_USD"):                   (0, None),
+    ("BENCHMARK_PERFORMANCE", "VALUE"):                   (0, None),
+    ("BENCHMARK_ACCOUNT_ASSOCIATION", "RANK"):            (1, None),
+    ("BENCHMARK_COMPOSITE_ACCOUNT_MAP", "RANK"):          (1, None),
+    ("BENCHMARK_COMPOSITE_ACCOUNT_MAP", "WEIGHT"):        (0, 1),
+    ("BENCHMARK_RISK", "VOLATILITY"):                     (0, None),
+    ("BENCHMARK_RISK", "MAX_DRAWDOWN"):                   (-1, 0),
+    ("FX_RATES", "RATE_TO_USD"):                          (0, None),
+}
+
+
+@dataclass
+class Rule:
+    kind: str  # unique, not_null, foreign_key or range
+    table: str
+    columns: Tuple[str, ...]
+    ref_table: Optional[str] = None
+    ref_columns: Tuple[str, ...] = ()
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        cols = ", ".join(self.columns)
+        if self.kind == "foreign_key":
+            return f"{self.table}({cols}) -> {self.ref_table}({', '.join(self.ref_columns)})"
+        if self.kind == "range":
+            return f"{self.table}.{cols} in [{self.low}, {self.high}]"
+        return f"{self.kind} {self.table}({cols})"
+
+
+def build_rules(tables: Optional[List[str]] = None) -> List[Rule]:
+    """Every rule on the given child tables (default: all registered tables)."""
+    wanted = {t.upper() for t in tables} if tables else set(TABLE_SCHEMAS)
+    rules = []
+    for name, schema in TABLE_SCHEMAS.items():
+        if name not in wanted:
+            continue
+        if schema.primary_key:
+            rules.append(Rule("unique", name, tuple(schema.primary_key)))
+        rules += [Rule("not_null", name, (c.name,)) for c in schema.columns if not c.nullable]
+    rules += [Rule("foreign_key", t, cols, ref, ref_cols)
+              for t, cols, ref, ref_cols in FOREIGN_KEYS if t in wanted]
+    rules += [Rule("range", t, (col,), low=lo, high=hi)
+              for (t, col), (lo, hi) in RANGES.items() if t in wanted]
+    return rules
+
+
+# --------------- Hashing ----------------
+def _hash_keys(frame: pd.DataFrame) -> np.ndarray:
+    """uint64 hash per row of the key columns; non-string keys are hashed as text."""
+    frame = frame.astype({c: str for c in frame.columns if frame[c].dtype != object})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _key_labels(frame: pd.DataFrame) -> List[str]:
+    """Display values of key rows, e.g. 'FUND_001' or 'ACC0001|SP_500'."""
+    return ["|".join(map(str, row)) for row in frame.itertuples(index=False)]
+
+
+def _stem(table: str) -> str:
+    return os.path.splitext(TABLE_SCHEMAS[table].file)[0]
+
+
+def _resolve(table: str, columns: Tuple[str, ...]) -> Optional[List[str]]:
+    """Map registry column names to the file's own spelling (e.g. 'Account ID'), None if missing."""
+    by_upper = {c.upper(): c for c in table_columns(_stem(table))}
+    if not all(c in by_upper for c in columns):
+        return None
+    return [by_upper[c] for c in columns]
+
+
+def _visit_order(tables: List[str]) -> List[str]:
+    """Parents before children, so foreign keys can be checked while a child streams."""
+    parents = {t: {ref for child, _, ref, _ in FOREIGN_KEYS if child == t and ref in tables} for t in tables}
+    order = []
+    while parents:
+        ready = sorted(t for t, refs in parents.items() if not refs - set(order))
+        if not ready:  # cycle: fall back to declaration order for the rest
+            ready = [t for t in tables if t in parents]
+        for t in ready:
+            order.append(t)
+            del parents[t]
+    return order
+
+
+def _result(rule: Rule, status: str, rows: int = 0, violations: int = 0,
+            examples: Optional[list] = None, note: Optional[str] = None) -> Dict[str, object]:
+    return {"rule": rule.name, "kind": rule.kind, "table": rule.table, "status": status,
+            "rows_checked": rows, "violations": violations,
+            "examples": examples or [], "note": note}
+
+
+# --------------- Checking ----------------
+@instrumented()
+def _check_table(table: str, rules: List[Rule], parent_keys: Dict[Tuple[str, Tuple[str, ...]], pd.Index],
+                 keys_needed: List[Tuple[str, ...]], batch_rows: int) -> List[Dict[str, object]]:
+    """
+    Stream one table once, evaluating its rules and collecting the key hash
+    sets its children will need (stored into `parent_keys`).
+    """
+    annotate(table=table)
+    stem = _stem(table)
+    resolved, results = {}, []
+    for rule in rules:
+        cols = _resolve(table, rule.columns)
+        if cols is None:
+            results.append(_result(rule, "skipped", note=f"column(s) {', '.join(rule.columns)} not in {stem}"))
+        elif rule.kind == "foreign_key" and (rule.ref_table, rule.ref_columns) not in parent_keys:
+            results.append(_result(rule, "skipped", note=f"{rule.ref_table} not available"))
+        else:
+            resolved[id(rule)] = cols
+    active = [r for r in rules if id(r) in resolved]
+    key_cols = {k: _resolve(table, k) for k in keys_needed}
+    key_cols = {k: v for k, v in key_cols.items() if v is not None}
+    for rule in active:
+        if rule.kind == "unique":
+            key_cols.setdefault(rule.columns, resolved[id(rule)])
+
+    needed = list(dict.fromkeys([c for cols in resolved.values() for c in cols] +
+                                [c for cols in key_cols.values() for c in cols]))
+    counts = {id(r): 0 for r in active}
+    examples = {id(r): [] for r in active}
+    hashes = {k: [] for k in key_cols}
+    rows = 0
+
+    for part in iter_table(stem, columns=needed, batch_rows=batch_rows):
+        for k, cols in key_cols.items():
+            present = part[cols].notna().all(axis=1).to_numpy()
+            hashes[k].append(_hash_keys(part.loc[present, cols]))
+
+        for rule in active:
+            cols = resolved[id(rule)]
+            if rule.kind == "not_null":
+                bad = part[cols[0]].isna().to_numpy()
+                shown = (np.flatnonzero(bad) + rows).tolist()
+                label = "row"
+            elif rule.kind == "range":
+                values = pd.to_numeric(part[cols[0]], errors="coerce")
+                bad = np.zeros(len(part), dtype=bool)
+                if rule.low is not None:
+                    bad |= (values < rule.low).to_numpy()
+                if rule.high is not None:
+                    bad |= (values > rule.high).to_numpy()
+                shown = values[bad].tolist()
+                label = None
+            elif rule.kind == "foreign_key":
+                keys = part[cols]
+                present = keys.notna().all(axis=1).to_numpy()
+                placeholder = NO_PARENT.get((rule.table, rule.columns[0])) if len(cols) == 1 else None
+                if placeholder is not None:
+                    present &= (keys[cols[0]].astype(str) != placeholder).to_numpy()
+                missing = parent_keys[(rule.ref_table, rule.ref_columns)].get_indexer(
+                    _hash_keys(keys[present])) == -1
+                bad = np.zeros(len(part), dtype=bool)
+                bad[np.flatnonzero(present)[missing]] = True
+                shown = _key_labels(keys[bad].drop_duplicates().head(MAX_EXAMPLES))
+                label = None
+            else:
+                continue  # unique: decided after the scan
+            counts[id(rule)] += int(bad.sum())
+            room = MAX_EXAMPLES - len(examples[id(rule)])
+            if room > 0:
+                examples[id(rule)] += [f"{label} {v}" if label else v for v in shown[:room]]
+        rows += len(part)
+
+    all_hashes = {k: np.concatenate(v) if v else np.array([], dtype=np.uint64) for k, v in hashes.items()}
+    for k in keys_needed:
+        if k in all_hashes:
+            parent_keys[(table, k)] = pd.Index(pd.unique(all_hashes[k]))
+
+    for rule in active:
+        if rule.kind == "unique":
+            dup = pd.Series(all_hashes[rule.columns]).duplicated(keep=False).to_numpy()
+            counts[id(rule)] = int(dup.sum())
+            if dup.any():
+                examples[id(rule)] = _duplicate_examples(stem, resolved[id(rule)],
+                                                         all_hashes[rule.columns][dup], batch_rows)
+        status = "violations" if counts[id(rule)] else "ok"
+        results.append(_result(rule, status, rows, counts[id(rule)], examples[id(rule)]))
+    record_rows(rows_in=rows)
+    return results
+
+
+def _duplicate_examples(stem: str, cols: List[str], dup_hashes: np.ndarray, batch_rows: int) -> List[str]:
+    """Second read of just the key columns, to show a few duplicated key values."""
+    lookup = pd.Index(pd.unique(dup_hashes))
+    found: List[str] = []
+    for part in iter_table(stem, columns=cols, batch_rows=batch_rows):
+        keys = part[part[cols].notna().all(axis=1)]
+        hit = keys[lookup.get_indexer(_hash_keys(keys)) != -1]
+        for value in _key_labels(hit.drop_duplicates()):
+            if value not in found:
+                found.append(value)
+            if len(found) >= MAX_EXAMPLES:
+                return found
+    return found
+
+
+@instrumented()
+def check_integrity(tables: Optional[List[str]] = None,
+                    batch_rows: int = 100_000) -> List[Dict[str, object]]:
+    """
+    Check every rule on `tables` (default: all registered tables).
+
+    Parameters:
+        tables: registry table names to check as children, e.g. ["HOLDINGS"];
+            their parents are read too, for their keys only
+        batch_rows: rows per streamed partition
+
+    Returns:
+        list of per-rule dicts: rule, kind, table, status (ok/violations/skipped),
+        rows_checked, violations, examples, note
+    """
+    rules = build_rules(tables)
+    refs = {(r.ref_table, r.ref_columns) for r in rules if r.kind == "foreign_key"}
+    involved = list(dict.fromkeys([r.table for r in rules] + [t for t, _ in refs]))
+
+    results: List[Dict[str, object]] = []
+    parent_keys: Dict[Tuple[str, Tuple[str, ...]], pd.Index] = {}
+    for table in _visit_order(involved):
+        table_rules = [r for r in rules if r.table == table]
+        if not table_exists(_stem(table)):
+            results += [_result(r, "skipped", note=f"{_stem(table)} not generated") for r in table_rules]
+            continue
+        keys_needed = [cols for t, cols in refs if t == table]
+        results += _check_table(table, table_rules, parent_keys, keys_needed, batch_rows)
+    return results
+
+
+def format_results(results: List[Dict[str, object]]) -> str:
+    """Plain-text violation report, violations first."""
+    order = {"violations": 0, "ok": 1, "skipped": 2}
+    lines = [f"{'rule':<90} {'rows':>9} {'violations':>10}  status"]
+    for r in sorted(results, key=lambda r: (order[r["status"]], r["table"], r["rule"])):
+        lines.append(f"{r['rule']:<90} {r['rows_checked']:>9} {r['violations']:>10}  {r['status']}")
+        if r["examples"]:
+            lines.append(f"{'':<4}e.g. {', '.join(str(e) for e in r['examples'])}")
+        if r["note"]:
+            lines.append(f"{'':<4}{r['note']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    results = check_integrity(sys.argv[1:] or None)
+    print(format_results(results))
+
+    report_path = get_csv_path(REPORT_FILE)
+    with open(report_path, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+
+    failed = [r for r in results if r["status"] == "violations"]
+    if failed:
+        print(f"[WARNING] {len(failed)} rule(s) violated; see {report_path}")
+        sys.exit(1)
+    print(f"✅ All {sum(r['status'] == 'ok' for r in results)} rules passed ({report_path})")
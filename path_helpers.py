@@ -15,6 +15,9 @@ Usage:
 
     # Get path for writing
     output_path = get_csv_path('product_master.csv')
+
+    # Columnar copy of a table (see table_io.py for typed reads/writes)
+    holdings_parquet = get_table_path('holdings', 'parquet')
 """
 
 import os
@@ -34,3 +37,10 @@ def get_csv_path(filename: str) -> str:
     """
     return os.path.join(ensure_csvs_dir(), filename)
 
+
+def get_table_path(table: str, fmt: str = "parquet") -> str:
+    """
+    Returns the absolute path of a table file stored in the CSVs directory
+    in the given format, e.g. get_table_path('holdings') -> CSVs/holdings.parquet.
+    """
+    return get_csv_path(f"{table}.{fmt}")
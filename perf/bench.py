@@ -0,0 +1,349 @@
+"""
+perf/bench.py
+
+Benchmark suite for the hot paths of the data generators and analytics.
+Each case is timed at several input sizes so its scaling curve is visible,
+and results are saved as JSON so later runs can be compared against a
+stored baseline.
+
+| Case                  | Function                                        | Size = number of       |
+|-----------------------|-------------------------------------------------|------------------------|
+| `compute_irr`         | holdings_metrics.compute_irr                    | companies              |
+| `generate_holdings`   | holdings.generate_holdings_data                 | holdings               |
+| `assign_managers`     | FundManagerAssigner.assign_to_funds             | funds                  |
+| `simulate_exits`      | exit.simulate_exits                             | funds (10 holdings each) |
+| `map_accounts`        | portfolio_account_association.map_accounts_to_funds | accounts           |
+| `vc_price_series`     | benchmark_performance.simulate_vc_price_series  | quarters               |
+| `calculate_aggregates`| PortfolioPerformanceAnalyzer.calculate_aggregates | holdings             |
+| `validate_performance`| holdings_metrics.validate_performance           | companies              |
+
+Every size is run `--repeat` times and the fastest run is kept (least
+disturbed by other processes). The scaling exponent is the slope of
+log(time) against log(size): ~1 means linear, ~2 quadratic.
+
+`compare` matches cases and sizes between two result files and flags a
+regression when the current time exceeds the baseline by more than
+`--threshold` (default 25%); it exits with status 1 if any are found.
+Baselines are machine specific: record them on the machine you compare on.
+
+Usage:
+    python -m perf.bench run                                  # -> perf/results/latest.json
+    python -m perf.bench run --cases compute_irr --sizes 100 1000
+    python -m perf.bench run --save-baseline main             # also -> perf/baselines/main.json
+    python -m perf.bench compare                              # latest vs perf/baselines/main.json
+    python -m perf.bench compare --baseline perf/baselines/main.json --current other.json
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(ROOT, "perf", "results")
+BASELINES_DIR = os.path.join(ROOT, "perf", "baselines")
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+SEED = 0
+
+
+# --------------- Cases ----------------
+# Each setup builds inputs of the given size (untimed) and returns the
+# zero-argument callable that is timed.
+def _setup_compute_irr(n: int) -> Callable[[], object]:
+    from holdings.holdings_metrics import compute_irr, generate_distributions, generate_nav
+
+    random.seed(SEED)
+    cash_flows = []
+    for _ in range(n):
+        investment_date = datetime(2018, 1, 1).date()
+        amount = random.uniform(1_000_000, 10_000_000)
+        dates, amounts = generate_distributions(investment_date, amount)
+        nav, val_date = generate_nav(investment_date, dates, amounts, amount)
+        flows = [(-amount, investment_date)] + list(zip(amounts, dates))
+        if nav > 0:
+            flows.append((nav, val_date))
+        cash_flows.append(flows)
+    return lambda: [compute_irr(flows) for flows in cash_flows]
+
+
+def _setup_generate_holdings(n: int) -> Callable[[], object]:
+    from holdings.holdings import generate_holdings_data
+    from scale import make_ids, size
+
+    codes = make_ids("FND", max(1, n // size("holdings_per_fund", 1)))
+    return lambda: generate_holdings_data(n, codes)
+
+
+def _setup_assign_managers(n: int) -> Callable[[], object]:
+    from portfolio.fund_manager import FundManagerAssigner
+
+    random.seed(SEED)
+    # Same manager/fund ratio as scale.py (80 managers per 100 funds)
+    assigner = FundManagerAssigner(n_funds=n, n_managers=max(2, round(n * 0.8)))
+    assigner.build_manager_pool()
+
+    def run():
+        random.seed(SEED)
+        assigner.assign_to_funds()
+    return run
+
+
+def _setup_simulate_exits(n: int) -> Callable[[], object]:
+    from holdings.exit import simulate_exits
+    from holdings.holdings import generate_holdings_data
+    from portfolio.portfolio_general_info import generate_synthetic_portfolio
+
+    funds = generate_synthetic_portfolio(n=n, seed=SEED)[["PORTFOLIOCODE", "CLOSE_DATE"]]
+    holdings = generate_holdings_data(n * 10, funds["PORTFOLIOCODE"].tolist())
+    holdings = holdings[["PORTFOLIOCODE", "TICKER", "ISSUENAME"]]
+    return lambda: simulate_exits(holdings, funds, today=datetime(2025, 1, 1))
+
+
+def _setup_map_accounts(n: int) -> Callable[[], object]:
+    from portfolio.portfolio_account_association import map_accounts_to_funds
+    from scale import make_ids
+
+    rng = np.random.default_rng(SEED)
+    accounts = pd.DataFrame({
+        "Account ID": make_ids("ACC", n),
+        "Number of Funds": rng.integers(1, 3, n),
+    })
+    # Two funds per account, as at SCALE_FACTOR=1 (100 funds, 50 accounts)
+    codes = make_ids("FND", 2 * n)
+    return lambda: map_accounts_to_funds(codes, accounts)
+
+
+def _setup_vc_price_series(n: int) -> Callable[[], object]:
+    from benchmarks.benchmark_performance import simulate_vc_price_series
+
+    return lambda: simulate_vc_price_series(n)
+
+
+def _setup_calculate_aggregates(n: int) -> Callable[[], object]:
+    from product.performance import PortfolioPerformanceAnalyzer
+    from scale import make_ids
+
+    rng = np.random.default_rng(SEED)
+    codes = np.array(make_ids("FND", max(1, n // 10)))
+    invested = rng.uniform(1e6, 1e7, n)
+    analyzer = PortfolioPerformanceAnalyzer()
+    analyzer.df = pd.DataFrame({
+        "TICKER": [f"T{i}" for i in range(n)],
+        "PORTFOLIOCODE": codes[rng.integers(0, len(codes), n)],
+        "CASHINVESTED": invested,
+        "CASHDISTRIBUTED": invested * rng.uniform(0, 1.2, n),
+        "NAV": invested * rng.uniform(0, 1.5, n),
+        "IRR": rng.normal(0.1, 0.2, n),
+        "MOIC": rng.uniform(0, 4, n),
+    })
+    return analyzer.calculate_aggregates
+
+
+def _setup_validate_performance(n: int) -> Callable[[], object]:
+    from holdings.holdings_metrics import build_company_record, validate_performance
+
+    random.seed(SEED)
+    metrics = pd.DataFrame([build_company_record(f"T{i}") for i in range(n)])
+    return lambda: validate_performance(metrics)
+
+
+# name: setup function and default sizes (each a 10x step, for the scaling curve)
+CASES: Dict[str, Dict[str, object]] = {
+    "compute_irr":          {"setup": _setup_compute_irr,          "sizes": [100, 1_000, 10_000]},
+    "generate_holdings":    {"setup": _setup_generate_holdings,    "sizes": [100, 1_000, 10_000]},
+    "assign_managers":      {"setup": _setup_assign_managers,      "sizes": [100, 1_000, 10_000]},
+    "simulate_exits":       {"setup": _setup_simulate_exits,       "sizes": [100, 1_000, 10_000]},
+    "map_accounts":         {"setup": _setup_map_accounts,         "sizes": [50, 500, 5_000]},
+    "vc_price_series":      {"setup": _setup_vc_price_series,      "sizes": [48, 480, 4_800]},
+    "calculate_aggregates": {"setup": _setup_calculate_aggregates, "sizes": [1_000, 10_000, 100_000]},
+    "validate_performance": {"setup": _setup_validate_performance, "sizes": [100, 1_000, 10_000]},
+}
+
+
+# --------------- Running ----------------
+def time_call(fn: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> List[float]:
+    """Wall-clock seconds of `repeat` calls of `fn` (output suppressed)."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """Slope of log(seconds) vs log(size); None with fewer than two sizes."""
+    if len(sizes) < 2:
+        return None
+    slope = np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-9)), 1)[0]
+    return round(float(slope), 2)
+
+
+def run_suite(cases: Optional[List[str]] = None, sizes: Optional[List[int]] = None,
+              repeat: int = DEFAULT_REPEAT) -> Dict[str, object]:
+    """
+    Time the selected cases at each size.
+
+    Parameters:
+        cases: case names (default: all)
+        sizes: override every case's default sizes
+
+    Returns:
+        dict: {"meta": {...}, "results": [{case, size, min_s, median_s, runs}],
+               "scaling": {case: exponent}}
+    """
+    unknown = [c for c in cases or [] if c not in CASES]
+    if unknown:
+        raise KeyError(f"Unknown case(s): {', '.join(unknown)}")
+
+    results, scaling = [], {}
+    for name in cases or list(CASES):
+        case_sizes = sizes or CASES[name]["sizes"]
+        mins = []
+        for n in case_sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = CASES[name]["setup"](n)
+            times = time_call(fn, repeat)
+            mins.append(min(times))
+            results.append({
+                "case": name, "size": n,
+                "min_s": round(min(times), 6),
+                "median_s": round(statistics.median(times), 6),
+                "runs": len(times),
+            })
+            print(f"{name:<22} n={n:<8} min {min(times):>9.4f}s  median {statistics.median(times):>9.4f}s")
+        scaling[name] = scaling_exponent(case_sizes, mins)
+        if scaling[name] is not None:
+            print(f"{name:<22} scaling exponent {scaling[name]}")
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.node(),
+            "repeat": repeat,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+# --------------- Comparing ----------------
+def compare_results(baseline: Dict[str, object], current: Dict[str, object],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, object]]:
+    """
+    Compare fastest times per (case, size).
+
+    Returns:
+        list of dict: case, size, baseline_s, current_s, ratio and status
+        ("regression", "improved", "ok", or "new" when there is no baseline)
+    """
+    base = {(r["case"], r["size"]): r["min_s"] for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        key = (r["case"], r["size"])
+        if key not in base:
+            rows.append({"case": r["case"], "size": r["size"], "baseline_s": None,
+                         "current_s": r["min_s"], "ratio": None, "status": "new"})
+            continue
+        ratio = r["min_s"] / max(base[key], 1e-9)
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": r["case"], "size": r["size"], "baseline_s": base[key],
+                     "current_s": r["min_s"], "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def _load(path: str) -> Dict[str, object]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save(result: Dict[str, object], path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generator and analytics hot paths.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="time the cases and save the results")
+    run_p.add_argument("--cases", nargs="+", help=f"cases to run (default: all of {', '.join(CASES)})")
+    run_p.add_argument("--sizes", nargs="+", type=int, help="override the default sizes")
+    run_p.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per size")
+    run_p.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    run_p.add_argument("--save-baseline", metavar="NAME", help="also save as perf/baselines/NAME.json")
+
+    cmp_p = sub.add_parser("compare", help="compare results against a baseline")
+    cmp_p.add_argument("--baseline", default=os.path.join(BASELINES_DIR, "main.json"))
+    cmp_p.add_argument("--current", default=os.path.join(RESULTS_DIR, "latest.json"))
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="allowed slowdown before flagging, as a fraction")
+
+    args = parser.parse_args(argv)
+
+    # Generators read JSON/ and CSVs/ relative to the repository root
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    # Time the functions themselves, not the run-report writes (see instrument.py)
+    os.environ.setdefault("INSTRUMENT", "0")
+
+    if args.command == "run":
+        result = run_suite(args.cases, args.sizes, args.repeat)
+        _save(result, args.output)
+        print(f"✅ Results written to {args.output}")
+        if args.save_baseline:
+            baseline_path = os.path.join(BASELINES_DIR, f"{args.save_baseline}.json")
+            os.makedirs(BASELINES_DIR, exist_ok=True)
+            shutil.copyfile(args.output, baseline_path)
+            print(f"✅ Baseline saved to {baseline_path}")
+        return 0
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    rows = compare_results(baseline, current, args.threshold)
+    for r in rows:
+        base = "-" if r["baseline_s"] is None else f"{r['baseline_s']:.4f}s"
+        ratio = "-" if r["ratio"] is None else f"x{r['ratio']:.2f}"
+        print(f"{r['case']:<22} n={r['size']:<8} {base:>10} -> {r['current_s']:.4f}s  {ratio:>7}  {r['status']}")
+    for name, exponent in current.get("scaling", {}).items():
+        before = baseline.get("scaling", {}).get(name)
+        if exponent is not None and before is not None and exponent - before > 0.3:
+            print(f"[WARNING] {name} scales worse than the baseline: exponent {before} -> {exponent}")
+
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"[WARNING] {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
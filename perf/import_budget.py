@@ -0,0 +1,187 @@
+"""
+perf/import_budget.py
+
+Import-time budgets for the modules other code imports. Each module is
+imported in a fresh interpreter, and the check fails if the import takes
+longer than its budget or pulls in a heavy package that it does not need:
+
+| Module group            | Budget  | Heavy packages allowed at import |
+|-------------------------|---------|----------------------------------|
+| Helpers and registries  | 50 ms   | none                             |
+| DataFrame modules       | 800 ms  | pandas (with numpy and pyarrow)  |
+
+Heavy packages are those in HEAVY_PACKAGES: pandas, numpy, pyarrow, faker,
+matplotlib, numpy_financial, yfinance, requests, snowflake.snowpark and
+scipy. Anything else a module needs at first use is imported inside the
+function that uses it (e.g. `compute_irr` imports numpy_financial, and
+`plot_metrics` imports matplotlib).
+
+Scripts that generate their table at import time (account.py,
+benchmark_characteristics.py, product_master.py, ...) are not listed,
+because importing them runs them.
+
+Each module is imported `--repeat` times and the fastest run is kept.
+Budgets were measured on a laptop with headroom; on a slower machine pass
+`--slack 2` (or set IMPORT_BUDGET_SLACK) to scale them. The heavy-package
+check does not depend on the machine.
+
+Usage:
+    python -m perf.import_budget                              # check every module
+    python -m perf.import_budget --modules holdings.holdings_metrics
+    python -m perf.import_budget --importtime holdings.holdings   # slowest imports (-X importtime)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_REPEAT = 3
+DEFAULT_SLACK = float(os.getenv("IMPORT_BUDGET_SLACK", "1.0"))
+
+HEAVY_PACKAGES = [
+    "pandas", "numpy", "pyarrow", "faker", "matplotlib", "numpy_financial",
+    "yfinance", "requests", "snowflake.snowpark", "scipy",
+]
+
+LIGHT = {"budget_ms": 50, "allowed": []}
+# pandas imports numpy and pyarrow itself
+DATAFRAME = {"budget_ms": 800, "allowed": ["pandas", "numpy", "pyarrow"]}
+
+BUDGETS: Dict[str, Dict[str, object]] = {
+    # Helpers and registries
+    "path_helpers":                             LIGHT,
+    "scale":                                    LIGHT,
+    "instrument":                               LIGHT,
+    "pipeline":                                 {"budget_ms": 100, "allowed": []},
+    "holdings.holdings":                        LIGHT,
+    "holdings.holdings_metrics":                LIGHT,
+    "benchmarks.benchmark_general_information": LIGHT,
+    "snowflake.schema_registry":                LIGHT,
+    "dtype_policy":                             LIGHT,
+    "APIs.http_cache":                          LIGHT,
+    "APIs.manager_json":                        LIGHT,
+    "gics_index":                               {"budget_ms": 200, "allowed": ["numpy"]},
+    "snowflake.session_pool":                   LIGHT,
+    "snowflake.parallel_load":                  LIGHT,
+    # DataFrame modules
+    "table_io":                                 DATAFRAME,
+    "holdings.exit":                            DATAFRAME,
+    "portfolio.portfolio_general_info":         DATAFRAME,
+    "portfolio.portfolio_account_association":  DATAFRAME,
+    "portfolio.fund_manager":                   DATAFRAME,
+    "product.performance":                      DATAFRAME,
+    "benchmarks.benchmark_performance":         DATAFRAME,
+    "benchmarks.benchmark_store":               DATAFRAME,
+    "benchmarks.benchmark_risk":                DATAFRAME,
+    "benchmarks.benchmark_composite":           DATAFRAME,
+    "fx_store":                                 DATAFRAME,
+    "benchmarks.benchmark_universe_stats":      DATAFRAME,
+    "benchmarks.index_fetch":                   DATAFRAME,
+    "snowflake.snowflake_comp_test":            DATAFRAME,
+    "snowflake.bulk_load":                      DATAFRAME,
+    "snowflake.upsert":                         DATAFRAME,
+    "snowflake.arrow_read":                     DATAFRAME,
+    "snowflake.local_warehouse":                DATAFRAME,
+}
+
+# Runs in the child interpreter: time the import, then report which heavy packages it loaded
+_PROBE = (
+    "import json, sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "ms = (time.perf_counter() - t) * 1000\n"
+    "heavy = [p for p in {heavy!r} if p in sys.modules]\n"
+    "print(json.dumps({{'ms': ms, 'heavy': heavy}}))\n"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    env["INSTRUMENT"] = "0"
+    env.setdefault("MPLBACKEND", "Agg")
+    return env
+
+
+def measure_import(module: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, object]:
+    """
+    Import `module` in `repeat` fresh interpreters.
+
+    Returns:
+        dict: module, ms (fastest run), heavy (heavy packages in sys.modules afterwards)
+    """
+    code = _PROBE.format(module=module, heavy=HEAVY_PACKAGES)
+    best, heavy = None, []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=_env(),
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            last = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"import {module} failed: {last[0]}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        heavy = result["heavy"]
+        best = result["ms"] if best is None else min(best, result["ms"])
+    return {"module": module, "ms": round(best, 1), "heavy": heavy}
+
+
+def check_module(module: str, repeat: int = DEFAULT_REPEAT, slack: float = DEFAULT_SLACK) -> Dict[str, object]:
+    """Measure one module against BUDGETS; status is ok, slow or heavy."""
+    budget = BUDGETS[module]
+    result = measure_import(module, repeat)
+    limit = budget["budget_ms"] * slack
+    unneeded = [p for p in result["heavy"] if p not in budget["allowed"]]
+    status = "heavy" if unneeded else "slow" if result["ms"] > limit else "ok"
+    return {**result, "budget_ms": limit, "unneeded": unneeded, "status": status}
+
+
+def importtime_breakdown(module: str, top: int = 15) -> List[str]:
+    """The `top` slowest imports (cumulative) under `python -X importtime -c "import module"`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=_env(), capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return [f"{us / 1000:9.1f} ms  {name}" for us, name in rows[:top]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check import time and heavy imports per module.")
+    parser.add_argument("--modules", nargs="+", help="modules to check (default: every module in BUDGETS)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="fresh imports per module")
+    parser.add_argument("--slack", type=float, default=DEFAULT_SLACK, help="multiply every budget by this")
+    parser.add_argument("--importtime", metavar="MODULE", help="print the slowest imports of one module and exit")
+    args = parser.parse_args(argv)
+
+    if args.importtime:
+        print("\n".join(importtime_breakdown(args.importtime)))
+        return 0
+
+    modules = args.modules or list(BUDGETS)
+    unknown = [m for m in modules if m not in BUDGETS]
+    if unknown:
+        parser.error(f"no budget declared for {', '.join(unknown)}")
+
+    failures = 0
+    for module in modules:
+        r = check_module(module, args.repeat, args.slack)
+        note = f"  unneeded: {', '.join(r['unneeded'])}" if r["unneeded"] else ""
+        print(f"{module:<42} {r['ms']:8.1f} ms / {r['budget_ms']:6.0f} ms  {r['status']}{note}")
+        failures += r["status"] != "ok"
+
+    if failures:
+        print(f"[WARNING] {failures} module(s) over budget or importing unneeded heavy packages")
+        return 1
+    print("✅ All imports within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
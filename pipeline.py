@@ -0,0 +1,417 @@
+"""
+pipeline.py
+
+Single entry point that rebuilds the generated tables in dependency order.
+
+Every stage runs its script as a subprocess from the project root
+(`python -m <package>.<module>`), so relative paths such as `JSON/...` and
+`CSVs/...` resolve correctly regardless of where `pipeline.py` is invoked.
+Independent stages run in parallel. Before running a stage, its script and
+every project module it imports (found by parsing the imports, including
+those inside functions), its input files and its parameters are hashed;
+if that hash was computed before, the cached outputs are restored from
+`.pipeline_cache/` instead of re-running the script.
+
+### Stages
+
+| Stage                          | Script                                       | After                                        | Outputs                                      |
+|--------------------------------|----------------------------------------------|----------------------------------------------|----------------------------------------------|
+| portfolio_general_info         | portfolio/portfolio_general_info.py          |                                              | portfolio_general_info.csv                   |
+| accounts                       | portfolio/account.py                         |                                              | accounts.csv                                 |
+| fund_managers                  | portfolio/fund_manager.py                    |                                              | fund_managers.csv                            |
+| product_master                 | product/product_master.py                    | portfolio_general_info                       | product_master.csv                           |
+| portfolio_account_map          | portfolio/portfolio_account_association.py   | portfolio_general_info, accounts             | portfolio_account_map.csv                    |
+| holdings                       | holdings/holdings.py                         |                                              | holdings.csv                                 |
+| holdings_metrics               | holdings/holdings_metrics.py                 | holdings                                     | holdings_metrics.csv                         |
+| exit                           | holdings/exit.py                             | holdings, portfolio_general_info             | (printed only)                               |
+| fx_rates                       | fx_store.py                                  |                                              | fx_rates.csv                                 |
+| portfolio_performance          | product/performance.py                       | holdings, holdings_metrics, fx_rates         | (printed only)                               |
+| benchmark_general              | benchmarks/benchmark_general_information.py  |                                              | benchmark_general.csv                        |
+| benchmark_characteristics      | benchmarks/benchmark_characteristics.py      | benchmark_general, holdings, holdings_metrics | benchmark_characteristics.csv               |
+| benchmark_performance          | benchmarks/benchmark_performance.py          | benchmark_general, benchmark_characteristics | benchmark_performance.csv, store             |
+| benchmark_account_association  | benchmarks/benchmark_account_association.py  | benchmark_general, benchmark_performance     | benchmark_account_association.csv            |
+| benchmark_composite            | benchmarks/benchmark_composite.py            | benchmark_performance, benchmark_account_association | benchmark_composite_*.csv            |
+| benchmark_risk                 | benchmarks/benchmark_risk.py                 | benchmark_performance, benchmark_composite   | benchmark_risk.csv                           |
+| integrity                      | integrity.py                                 | every table stage                            | integrity_report.json                        |
+
+The integrity stage fails the run when a foreign key, uniqueness, null or
+range rule is violated (see `integrity.py`).
+
+The API scripts in `APIs/` are not stages: their JSON outputs are committed
+and are hashed as inputs of the stages that read them.
+
+Usage:
+    python pipeline.py                      # build everything
+    python pipeline.py holdings_metrics     # one stage plus everything upstream of it
+    python pipeline.py --force --jobs 8     # ignore the cache
+    python pipeline.py --list               # show stages and cache status
+    python pipeline.py --scale 10           # SF10 dataset (see scale.py)
+    python pipeline.py --profile            # plus a cProfile dump per stage (see instrument.py)
+"""
+
+import argparse
+import ast
+import functools
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+import instrument
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+CACHE_DIR = os.path.join(ROOT, ".pipeline_cache")
+DEFAULT_JOBS = 4
+# Code every stage depends on, and environment variables that affect every stage
+SHARED_CODE = ["path_helpers.py", "table_io.py", "snowflake/schema_registry.py", "dtype_policy.py", "scale.py"]
+SHARED_PARAMS = ["TABLE_FORMAT", "SCALE_FACTOR"]
+
+
+def _tables(*names: str) -> List[str]:
+    """Output files of tables written with table_io.write_table (CSV + Parquet copy)."""
+    exts = ["csv"] if os.getenv("TABLE_FORMAT", "parquet").lower() == "csv" else ["csv", "parquet"]
+    return [f"CSVs/{name}.{ext}" for name in names for ext in exts]
+
+# name: module to run, stages it runs after, data files it reads (relative to the
+# root; imported project code is found by `import_closure`), produced outputs,
+# and environment variables that act as parameters
+STAGES: Dict[str, Dict[str, List[str]]] = {
+    "portfolio_general_info": {
+        "module": "portfolio.portfolio_general_info",
+        "after": [], "inputs": [],
+        "outputs": _tables("portfolio_general_info"), "params": [],
+    },
+    "accounts": {
+        "module": "portfolio.account",
+        "after": [], "inputs": ["JSON/currency_lookup.json"],
+        "outputs": _tables("accounts"), "params": [],
+    },
+    "fund_managers": {
+        "module": "portfolio.fund_manager",
+        "after": [], "inputs": ["JSON/managers.jsonl"],
+        "outputs": _tables("fund_managers"), "params": [],
+    },
+    "product_master": {
+        "module": "product.product_master",
+        "after": ["portfolio_general_info"], "inputs": [],
+        "outputs": _tables("product_master"), "params": [],
+    },
+    "portfolio_account_map": {
+        "module": "portfolio.portfolio_account_association",
+        "after": ["portfolio_general_info", "accounts"], "inputs": [],
+        "outputs": _tables("portfolio_account_map"), "params": [],
+    },
+    "holdings": {
+        "module": "holdings.holdings",
+        "after": [],
+        "inputs": ["JSON/synthetic_countries.json", "JSON/gics.json", "JSON/currency_lookup.json"],
+        "outputs": _tables("holdings"), "params": [],
+    },
+    "holdings_metrics": {
+        "module": "holdings.holdings_metrics",
+        "after": ["holdings"], "inputs": [],
+        "outputs": _tables("holdings_metrics"), "params": [],
+    },
+    "exit": {
+        "module": "holdings.exit",
+        "after": ["holdings", "portfolio_general_info"], "inputs": [],
+        "outputs": [], "params": [],
+    },
+    "fx_rates": {
+        "module": "fx_store",
+        "after": [], "inputs": ["JSON/currency_lookup.json"],
+        "outputs": _tables("fx_rates"), "params": ["FX_PROVIDER", "FX_RATES_FILE"],
+    },
+    "portfolio_performance": {
+        "module": "product.performance",
+        "after": ["holdings", "holdings_metrics", "fx_rates"], "inputs": [],
+        "outputs": [], "params": ["PERFORMANCE_SOURCE", "PERFORMANCE_PUSHDOWN", "PERFORMANCE_CURRENCY"],
+    },
+    "benchmark_general": {
+        "module": "benchmarks.benchmark_general_information",
+        "after": [], "inputs": [],
+        "outputs": _tables("benchmark_general"), "params": [],
+    },
+    "benchmark_characteristics": {
+        "module": "benchmarks.benchmark_characteristics",
+        # holdings tables: read by benchmark_universe_stats in the data/streaming modes
+        "after": ["benchmark_general", "holdings", "holdings_metrics"],
+        "inputs": [],
+        "outputs": _tables("benchmark_characteristics"),
+        "params": ["BENCHMARK_CHARACTERISTICS_MODE", "INDEX_DATA_PROVIDER"],
+    },
+    "benchmark_performance": {
+        "module": "benchmarks.benchmark_performance",
+        "after": ["benchmark_general", "benchmark_characteristics"],
+        "inputs": [],
+        "outputs": _tables("benchmark_performance") + ["CSVs/benchmark_performance_store"],
+        "params": ["INDEX_DATA_PROVIDER"],
+    },
+    "benchmark_account_association": {
+        "module": "benchmarks.benchmark_account_association",
+        "after": ["benchmark_general", "benchmark_performance"], "inputs": [],
+        "outputs": _tables("benchmark_account_association"), "params": [],
+    },
+    "benchmark_composite": {
+        "module": "benchmarks.benchmark_composite",
+        "after": ["benchmark_performance", "benchmark_account_association"], "inputs": [],
+        "outputs": ["CSVs/benchmark_composite_performance.csv",
+                    "CSVs/benchmark_composite_account_map.csv",
+                    "CSVs/benchmark_composite_manifest.json"],
+        "params": [],
+    },
+    "benchmark_risk": {
+        "module": "benchmarks.benchmark_risk",
+        "after": ["benchmark_performance", "benchmark_composite"], "inputs": [],
+        "outputs": ["CSVs/benchmark_risk.csv"], "params": [],
+    },
+    "integrity": {
+        "module": "integrity",
+        "after": ["portfolio_general_info", "accounts", "fund_managers", "product_master",
+                  "portfolio_account_map", "holdings", "holdings_metrics", "fx_rates",
+                  "benchmark_general", "benchmark_characteristics", "benchmark_performance",
+                  "benchmark_account_association", "benchmark_composite", "benchmark_risk"],
+        "inputs": [],
+        "outputs": ["CSVs/integrity_report.json"], "params": [],
+    },
+}
+
+
+# --------------- Hashing ----------------
+def _hash_path(h, path: str) -> None:
+    """Feed a file, or every file under a directory, into hash `h`."""
+    full = os.path.join(ROOT, path)
+    if os.path.isdir(full):
+        for dirpath, _, files in sorted(os.walk(full)):
+            for name in sorted(files):
+                _hash_path(h, os.path.relpath(os.path.join(dirpath, name), ROOT))
+        return
+    h.update(path.encode("utf-8"))
+    if not os.path.exists(full):
+        h.update(b"<missing>")
+        return
+    with open(full, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+
+
+def _module_path(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+@functools.lru_cache(maxsize=None)
+def _local_imports(path: str) -> List[str]:
+    """Project files imported anywhere in `path` (including imports inside functions)."""
+    with open(os.path.join(ROOT, path), "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from pkg import mod` may import a submodule as well as a name
+            names += [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+    found = []
+    for module in names:
+        candidate = _module_path(module)
+        if os.path.isfile(os.path.join(ROOT, candidate)) and candidate not in found:
+            found.append(candidate)
+    return found
+
+
+def import_closure(module: str) -> List[str]:
+    """A module's file plus every project file it imports, directly or transitively."""
+    closure, todo = [], [_module_path(module)]
+    while todo:
+        path = todo.pop()
+        if path not in closure:
+            closure.append(path)
+            todo += _local_imports(path)
+    return sorted(closure)
+
+
+def stage_key(name: str, stages: Optional[Dict] = None) -> str:
+    """Content hash of a stage's code (and everything it imports), inputs (incl. upstream outputs) and parameters."""
+    stages = stages or STAGES
+    stage = stages[name]
+    h = hashlib.sha256(name.encode("utf-8"))
+    upstream = [out for dep in stage["after"] for out in stages[dep]["outputs"]]
+    code = import_closure(stage["module"])
+    for path in dict.fromkeys(code + SHARED_CODE + stage["inputs"] + upstream):
+        _hash_path(h, path)
+    params = {p: os.getenv(p) for p in SHARED_PARAMS + stage["params"]}
+    h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# --------------- Cache ----------------
+def _cache_entry(name: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, name, key)
+
+
+def _copy(src: str, dst: str) -> None:
+    if os.path.isdir(src):
+        if os.path.exists(dst):
+            shutil.rmtree(dst)
+        shutil.copytree(src, dst)
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+def save_outputs(name: str, key: str, stages: Optional[Dict] = None) -> None:
+    stages = stages or STAGES
+    entry = _cache_entry(name, key)
+    tmp = entry + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for out in stages[name]["outputs"]:
+        _copy(os.path.join(ROOT, out), os.path.join(tmp, out))
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)  # a half-written entry is never visible
+
+
+def restore_outputs(name: str, key: str, stages: Optional[Dict] = None) -> bool:
+    """Copy cached outputs back into place; False if there is no complete entry."""
+    stages = stages or STAGES
+    entry = _cache_entry(name, key)
+    if not os.path.isdir(entry):
+        return False
+    for out in stages[name]["outputs"]:
+        if not os.path.exists(os.path.join(entry, out)):
+            return False
+    for out in stages[name]["outputs"]:
+        _copy(os.path.join(entry, out), os.path.join(ROOT, out))
+    return True
+
+
+# --------------- Scheduling ----------------
+def select_stages(targets: Optional[List[str]] = None, stages: Optional[Dict] = None) -> List[str]:
+    """`targets` plus everything upstream of them (all stages when empty)."""
+    stages = stages or STAGES
+    if not targets:
+        return list(stages)
+    unknown = [t for t in targets if t not in stages]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    selected, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in selected:
+            selected.add(name)
+            todo.extend(stages[name]["after"])
+    return [s for s in stages if s in selected]
+
+
+def run_stage(name: str, stages: Optional[Dict] = None) -> None:
+    """Run one stage's script from the project root."""
+    stages = stages or STAGES
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    # Every stage appends to this run's report (see instrument.py)
+    env["RUN_ID"] = instrument.RUN_ID
+    env["INSTRUMENT_STAGE"] = name
+    env.setdefault("MPLBACKEND", "Agg")
+    proc = subprocess.run([sys.executable, "-m", stages[name]["module"]], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        tail = "\n".join((proc.stderr or proc.stdout).strip().splitlines()[-5:])
+        raise RuntimeError(f"exit code {proc.returncode}\n{tail}")
+    missing = [o for o in stages[name]["outputs"] if not os.path.exists(os.path.join(ROOT, o))]
+    if missing:
+        raise RuntimeError(f"did not produce {', '.join(missing)}")
+
+
+def run_pipeline(targets: Optional[List[str]] = None, jobs: int = DEFAULT_JOBS,
+                 force: bool = False, stages: Optional[Dict] = None) -> List[Dict[str, object]]:
+    """
+    Run the selected stages in dependency order, `jobs` at a time.
+
+    Returns:
+        list of per-stage dicts: stage, status (ran/cached/failed/skipped), key, seconds, error
+    """
+    stages = stages or STAGES
+    selected = select_stages(targets, stages)
+    pending = {s: [d for d in stages[s]["after"] if d in selected] for s in selected}
+    done, failed, report, running = set(), set(), [], {}
+
+    def execute(name):
+        # Keys are computed only once upstream outputs are final
+        start = time.perf_counter()
+        key = stage_key(name, stages)
+        if not force and restore_outputs(name, key, stages):
+            return "cached", key, time.perf_counter() - start
+        run_stage(name, stages)
+        save_outputs(name, key, stages)
+        return "ran", key, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in [s for s, deps in pending.items() if any(d in failed for d in deps)]:
+                del pending[name]
+                failed.add(name)
+                report.append({"stage": name, "status": "skipped", "key": None,
+                               "seconds": 0.0, "error": "upstream stage failed"})
+
+            for name in [s for s, deps in pending.items() if all(d in done for d in deps)]:
+                del pending[name]
+                running[pool.submit(execute, name)] = name
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, key, seconds = future.result()
+                    done.add(name)
+                    report.append({"stage": name, "status": status, "key": key,
+                                   "seconds": round(seconds, 2), "error": None})
+                    print(f"✅ {name} ({status}, {seconds:.2f}s)")
+                except Exception as e:
+                    failed.add(name)
+                    report.append({"stage": name, "status": "failed", "key": None,
+                                   "seconds": 0.0, "error": str(e)})
+                    print(f"[WARNING] Stage {name} failed: {e}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the generated VC tables.")
+    parser.add_argument("stages", nargs="*", help="stages to build (default: all)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="stages run in parallel")
+    parser.add_argument("--force", action="store_true", help="ignore cached outputs")
+    parser.add_argument("--list", action="store_true", help="list stages and cache status")
+    parser.add_argument("--scale", type=float, help="dataset scale factor (sets SCALE_FACTOR)")
+    parser.add_argument("--profile", action="store_true", help="write a cProfile dump per stage")
+    args = parser.parse_args(argv)
+
+    if args.scale is not None:
+        # Stage subprocesses inherit it, and it is part of every stage key
+        os.environ["SCALE_FACTOR"] = str(args.scale)
+
+    if args.list:
+        for name in select_stages(args.stages):
+            key = stage_key(name)
+            status = "cached" if os.path.isdir(_cache_entry(name, key)) else "stale"
+            print(f"{name:<32} {status:<7} after: {', '.join(STAGES[name]['after']) or '-'}")
+        return 0
+
+    if args.profile:
+        os.environ["INSTRUMENT_PROFILE"] = "1"
+
+    report = run_pipeline(args.stages, jobs=args.jobs, force=args.force)
+    if os.path.exists(instrument.report_path()):
+        print(f"\nRun report: {instrument.report_path()}")
+        print(instrument.format_report(instrument.load_report()))
+    return 1 if any(r["status"] in ("failed", "skipped") for r in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@
 # ### Account Types
 # - **Institutional LPs**: 25 named entities (e.g., CalPERS, CDPQ), each committing to 1–2 funds
 # - **Individual LPs**: 25 synthetic accounts using Faker, each committing to exactly 1 fund
+# - Both counts are multiplied by SCALE_FACTOR (`scale.py`); past 25 institutional
+#   accounts the named LPs repeat with a `#2`, `#3`, ... suffix
 #
 # ---
 #
@@ -44,7 +46,8 @@ import pandas as pd
 import random
 from faker import Faker
 import json
-from path_helpers import get_csv_path
+from table_io import write_table
+from scale import account_ids, size
 
 fake = Faker()
 
@@ -94,9 +97,14 @@ def get_currency_info(country):
         return "USD", "US Dollar", 1.0
 
 
+ACCOUNT_IDS = account_ids()
+
 # 3. Generate Institutional Accounts
 institutional_accounts = []
-for i, (name, lp_type, country) in enumerate(lp_data):
+for i in range(size("institutional_accounts")):
+    name, lp_type, country = lp_data[i % len(lp_data)]
+    if i >= len(lp_data):
+        name = f"{name} #{i // len(lp_data) + 1}"
     currency_code, currency_name, fx = get_currency_info(country)
     num_funds = random.randint(1, 2)
 
@@ -119,7 +127,7 @@ for i, (name, lp_type, country) in enumerate(lp_data):
     start_date = f"{year}-{month:02d}-{day:02d}"
 
     institutional_accounts.append({
-        "Account ID": f"ACC{i+1:04}",
+        "Account ID": ACCOUNT_IDS[i],
         "Investor Type": "Institutional",
         "Account Name": name,
         "Type": lp_type,
@@ -138,7 +146,7 @@ for i, (name, lp_type, country) in enumerate(lp_data):
 countries = ["United States", "United Kingdom", "Germany", "France", "Canada", "Australia", "Netherlands", "Japan", "India", "Brazil"]
 individual_accounts = []
 
-for i in range(25):
+for i in range(size("individual_accounts")):
     name = fake.name()
     country = random.choice(countries)
     currency_code, currency_name, fx = get_currency_info(country)
@@ -159,7 +167,7 @@ for i in range(25):
     start_date = f"{year}-{month:02d}-{day:02d}"
 
     individual_accounts.append({
-        "Account ID": f"ACC{i+len(institutional_accounts)+1:04}",
+        "Account ID": ACCOUNT_IDS[i + len(institutional_accounts)],
         "Investor Type": "Individual",
         "Account Name": name,
         "Type": "Private Individual",
@@ -180,5 +188,4 @@ if __name__ == "__main__":
     accounts_df = pd.DataFrame(institutional_accounts + individual_accounts)
 
     # Write the accounts_df to a CSV file in the CSVs folder
-    output_file_path = get_csv_path('accounts.csv')
-    accounts_df.to_csv(output_file_path, index=False)
+    write_table(accounts_df, 'accounts')
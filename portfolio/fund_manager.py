@@ -2,43 +2,63 @@
 OOP version of a synthetic fund manager assignment generator.
 This class simulates the process of assigning experienced managers
 from a randomly generated pool to a set of venture capital funds.
+
+Fund and manager counts default to the current SCALE_FACTOR (`scale.py`), and
+the fund IDs are the PORTFOLIOCODEs of portfolio_general_info. Managers are
+sampled from the line-delimited pool written by `APIs/manager_json.py`.
 """
 
 import pandas as pd
 import random
 import json
-from path_helpers import get_csv_path
+from APIs.manager_json import MANAGERS_PATH, sample_managers
+from table_io import write_table
+from scale import make_ids, size
+from instrument import instrumented, record_rows
 
 class FundManagerAssigner:
-    def __init__(self, n_funds=100, n_managers=80, json_path="JSON/manager_data.json"):
-        self.N_FUNDS = n_funds
-        self.N_MANAGERS = n_managers
+    def __init__(self, n_funds=None, n_managers=None, json_path=MANAGERS_PATH):
+        self.N_FUNDS = n_funds if n_funds is not None else size("funds")
+        self.N_MANAGERS = n_managers if n_managers is not None else size("managers")
         self.MIN_EXP = 15
         self.MAX_EXP = 30
         self.POSITIONS = ["Managing Partner", "Principal", "Investment Partner"]
-        self.FUND_IDS = [f"FUND{str(i).zfill(4)}" for i in range(1, self.N_FUNDS + 1)]
+        self.FUND_IDS = make_ids("FND", self.N_FUNDS)
         self.df_managers = None
         self.df_assignments = None
         self.manager_json = None
         self.json_path = json_path
 
     
+    @instrumented()
     def build_manager_pool(self):
-        """Load manager JSON from file and randomly sample N_MANAGERS to build manager DataFrame."""
-        with open(self.json_path, "r") as f:
-            full_json = json.load(f)
-
-        results = random.sample(full_json, self.N_MANAGERS)
-        names = [f"{u['name']['first']} {u['name']['last']}" for u in results]
+        """
+        Randomly sample N_MANAGERS from the manager pool to build the manager DataFrame.
+        A JSONL pool is sampled by line without parsing the rest; a full
+        randomuser JSON document is loaded whole.
+        """
+        # Past the size of the pool, names are drawn with replacement (IDs stay unique)
+        if self.json_path.endswith(".jsonl"):
+            results = sample_managers(self.json_path, self.N_MANAGERS)
+        else:
+            with open(self.json_path, "r") as f:
+                full_json = json.load(f)
+            if self.N_MANAGERS <= len(full_json):
+                results = [u["name"] for u in random.sample(full_json, self.N_MANAGERS)]
+            else:
+                results = [u["name"] for u in random.choices(full_json, k=self.N_MANAGERS)]
+        names = [f"{u['first']} {u['last']}" for u in results]
         exp = [random.randint(self.MIN_EXP, self.MAX_EXP) for _ in range(self.N_MANAGERS)]
-        ids = [f"MNGR{str(i+1).zfill(3)}" for i in range(self.N_MANAGERS)]
+        ids = make_ids("MNGR", self.N_MANAGERS, width=3)
 
         self.df_managers = pd.DataFrame({
             "ManagerID": ids,
             "ManagerName": names,
             "YearsExperience": exp
         })
+        record_rows(rows_out=self.N_MANAGERS)
 
+    @instrumented()
     def assign_to_funds(self):
         """Assign two managers to each fund while tracking max 3 assignments and experience."""
         if self.df_managers is None:
@@ -46,6 +66,7 @@ class FundManagerAssigner:
 
         assign_counts = {mid: 0 for mid in self.df_managers["ManagerID"]}
         years_left = {mid: int(exp) for mid, exp in zip(self.df_managers["ManagerID"], self.df_managers["YearsExperience"])}
+        managers = self.df_managers.set_index("ManagerID")
 
         records = []
         for fund in self.FUND_IDS:
@@ -57,7 +78,7 @@ class FundManagerAssigner:
 
             for rank, mid in enumerate(chosen, 1):
                 assign_counts[mid] += 1
-                mgr = self.df_managers[self.df_managers["ManagerID"] == mid].iloc[0]
+                mgr = managers.loc[mid]
                 role = random.choice(self.POSITIONS)
                 remaining = years_left[mid]
                 assignments_left = 3 - assign_counts[mid] + 1
@@ -76,6 +97,7 @@ class FundManagerAssigner:
                 })
 
         self.df_assignments = pd.DataFrame(records)
+        record_rows(rows_in=len(self.df_managers), rows_out=len(records))
 
     def get_assignments(self):
         """Return the final DataFrame of manager-fund assignments."""
@@ -90,5 +112,4 @@ if __name__ == '__main__':
     df = assigner.get_assignments()
     
     # Write the fund_managers to a CSV file in the CSVs folder
-    output_file_path = get_csv_path('fund_managers.csv')
-    df.to_csv(output_file_path, index=False)
\ No newline at end of file
+    write_table(df, 'fund_managers')
\ No newline at end of file
@@ -28,51 +28,57 @@ It reflects how each investor (institutional or individual) allocates capital ac
 
 import pandas as pd
 import random
-import os
-from path_helpers import get_csv_path
-
-# Load portfolio general info and accounts data through the OS
-portfolio_gen_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'portfolio_general_info.csv')
-accounts_path  = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'accounts.csv')
-
-portfolio_gen_path = os.path.abspath(portfolio_gen_path)
-accounts_path  = os.path.abspath(accounts_path)
-
-portfolio_general_info_df = pd.read_csv(portfolio_gen_path)
-accounts_df = pd.read_csv(accounts_path)
-
-# 1. Prepare portfolio and account ID lists
-portfolio_codes = portfolio_general_info_df["PORTFOLIOCODE"].tolist()
-account_ids = accounts_df["Account ID"].tolist()
-
-# Copy the full fund list to manage duplicates
-available_funds = portfolio_codes.copy()
-
-# 2. Create mapping between accounts and portfolios
-mapping = []
-for _, row in accounts_df.iterrows():
-    account_id = row["Account ID"]
-    num_funds = int(row["Number of Funds"])
-
-    # If not enough unique funds left, sample with replacement from full pool
-    if num_funds > len(available_funds):
-        selected_funds = random.sample(portfolio_codes, num_funds)
-    else:
-        selected_funds = random.sample(available_funds, num_funds)
-        # Remove selected funds to prevent reuse
-        available_funds = [f for f in available_funds if f not in selected_funds]
-
-    # Append account-fund pairs
-    for fund in selected_funds:
-        mapping.append({
-            "PORTFOLIOCODE": fund,
-            "ACCOUNTID": account_id
-        })
+from table_io import read_table, write_table
+from instrument import instrumented
+
+
+@instrumented()
+def map_accounts_to_funds(portfolio_codes, accounts_df):
+    """
+    Assign each account its "Number of Funds" funds, spreading accounts over
+    distinct funds until the pool runs out.
+
+    Parameters:
+        portfolio_codes (list): fund PORTFOLIOCODEs
+        accounts_df (pd.DataFrame): "Account ID" and "Number of Funds" per account
+
+    Returns:
+        pd.DataFrame: PORTFOLIOCODE / ACCOUNTID pairs
+    """
+    # Copy the full fund list to manage duplicates
+    available_funds = list(portfolio_codes)
+
+    # Create mapping between accounts and portfolios
+    mapping = []
+    for _, row in accounts_df.iterrows():
+        account_id = row["Account ID"]
+        num_funds = int(row["Number of Funds"])
+
+        # If not enough unique funds left, sample with replacement from full pool
+        if num_funds > len(available_funds):
+            selected_funds = random.sample(portfolio_codes, num_funds)
+        else:
+            selected_funds = random.sample(available_funds, num_funds)
+            # Remove selected funds to prevent reuse
+            available_funds = [f for f in available_funds if f not in selected_funds]
+
+        # Append account-fund pairs
+        for fund in selected_funds:
+            mapping.append({
+                "PORTFOLIOCODE": fund,
+                "ACCOUNTID": account_id
+            })
+
+    return pd.DataFrame(mapping)
+
 
 if __name__ == "__main__":
+    # Load portfolio general info and accounts data
+    portfolio_general_info_df = read_table('portfolio_general_info', columns=["PORTFOLIOCODE"])
+    accounts_df = read_table('accounts', columns=["Account ID", "Number of Funds"])
+
     # Map accounts to portfolios and export to CSV
-    portfolio_account_map_df = pd.DataFrame(mapping)
+    portfolio_account_map_df = map_accounts_to_funds(portfolio_general_info_df["PORTFOLIOCODE"].tolist(), accounts_df)
 
     # Write the product_master_df to a CSV file in the CSVs folder
-    output_file_path = get_csv_path('portfolio_account_map.csv')
-    portfolio_account_map_df.to_csv(output_file_path, index=False)
\ No newline at end of file
+    write_table(portfolio_account_map_df, 'portfolio_account_map')
\ No newline at end of file
@@ -44,7 +44,9 @@ It mimics enriched PitchBook-style data, maintaining internal consistency across
 
 import random
 import pandas as pd
-from path_helpers import get_csv_path
+from table_io import write_table
+from scale import fund_codes, make_ids
+from instrument import instrumented
 
 # Utility: Ensure unique FUND_NAMEs
 def generate_unique_fund_name(existing_names, firm, base_name):
@@ -56,8 +58,11 @@ def generate_unique_fund_name(existing_names, firm, base_name):
     return f"{base_name} #{i}"
 
 # Main generator function
-def generate_synthetic_portfolio(n=100, seed=42):
+@instrumented()
+def generate_synthetic_portfolio(n=None, seed=42):
+    # n defaults to the number of funds at the current SCALE_FACTOR
     random.seed(seed)
+    codes = fund_codes() if n is None else make_ids("FND", n)
 
     strategies = ["Early Stage", "General", "Later Stage"]
     strategy_abbr = {"Early Stage": "EARLY", "General": "GEN", "Later Stage": "LATE"}
@@ -92,7 +97,7 @@ def generate_synthetic_portfolio(n=100, seed=42):
     funds = []
     fund_names_set = set()
 
-    for i in range(n):
+    for code in codes:
         firm = random.choice(firms)
         strategy = random.choice(strategies)
 
@@ -130,7 +135,7 @@ def generate_synthetic_portfolio(n=100, seed=42):
         product_code = f"VC_{strategy_code}_{region}"
 
         fund = {
-            "PORTFOLIOCODE": f"FND{str(i+1).zfill(4)}",
+            "PORTFOLIOCODE": code,
             "FIRM_NAME": firm,
             "FUND_NAME": fund_name,
             "STRATEGY": strategy,
@@ -152,9 +157,8 @@ def generate_synthetic_portfolio(n=100, seed=42):
 
 if __name__ == "__main__":
     # Generate synthetic portfolio and export to CSV
-    portfolio_general_info_df = generate_synthetic_portfolio(n=100)
+    portfolio_general_info_df = generate_synthetic_portfolio()
 
     # Write the product_master_df to a CSV file in the CSVs folder
-    output_file_path = get_csv_path('portfolio_general_info.csv')
-    portfolio_general_info_df.to_csv(output_file_path, index=False)
+    write_table(portfolio_general_info_df, 'portfolio_general_info')
  
\ No newline at end of file
@@ -1,39 +1,88 @@
 """
 This script computes and visualizes portfolio-level performance metrics using synthetic holdings and performance data.
-It supports CSV-based input for local testing and will be adapted to use a Snowflake connection.
+It supports CSV-based input for local testing and a warehouse read path (Snowflake or the local warehouse).
 
 Functionality:
 - Aggregates investment metrics by portfolio
 - Calculates TVPI, DPI, RVPI
 - Computes weighted IRR and MOIC
 - Visualizes results with bar charts
+
+Warehouse input:
+- Only the needed columns are selected, HOLDINGS is joined in SQL, and the
+  result arrives as Arrow record batches converted to pandas once
+  (`snowflake/arrow_read.py`)
+- With pushdown=True the fund-level aggregation runs in SQL and only one row
+  per portfolio is transferred
+
+Set PERFORMANCE_SOURCE=warehouse (and optionally PERFORMANCE_PUSHDOWN=1) to
+use it from the command line.
+
+Set PERFORMANCE_CURRENCY (e.g. USD) to convert holdings amounts from their
+CURRENCYCODE at dated FX rates (`fx_store.py`) before aggregating.
 """
 
 import pandas as pd
 import numpy as np
 import os
-import matplotlib.pyplot as plt
+from instrument import instrumented, record_rows
+
+NUMERIC_COLS = ['MOIC', 'IRR', 'TVPI', 'DPI', 'CASHINVESTED', 'CASHDISTRIBUTED', 'NAV']
 
 class PortfolioPerformanceAnalyzer:
-    def __init__(self, holdings_path: str, metrics_path: str):
+    def __init__(self, holdings_path: str = None, metrics_path: str = None, session=None, pushdown: bool = False,
+                 reporting_currency: str = None):
         """
-        Initialize the analyzer with file paths to holdings and metrics data.
+        Initialize the analyzer with file paths to holdings and metrics data,
+        or with a warehouse session (HOLDINGS and HOLDINGS_METRICS tables).
+        Without either, the generated tables in CSVs/ are read.
+
+        With reporting_currency (e.g. 'USD'), amounts are converted from each
+        holding's CURRENCYCODE at the dated rate (`fx_store.py`): invested
+        cash as of INVESTMENT_DATE, NAV as of VALUATION_DATE. Local reads only.
         """
         self.holdings_path = holdings_path
         self.metrics_path = metrics_path
+        self.session = session
+        self.pushdown = pushdown and session is not None
+        self.reporting_currency = reporting_currency
         self.df = None
         self.portfolio_perf = None
         self.final_perf = None
 
+    @instrumented()
     def load_data(self):
         """
-        Load holdings and metrics CSV files and merge on TICKER.
+        Load holdings and metrics and attach each company's PORTFOLIOCODE.
+
+        The join is on the integer COMPANY_SK surrogate of TICKER, not on the
+        36-character TICKER strings. Without file paths the generated tables
+        are read through table_io (only the needed columns, SKs included).
         """
-        holdings_df = pd.read_csv(self.holdings_path)
-        metrics_df = pd.read_csv(self.metrics_path)
+        if self.session is not None:
+            if self.reporting_currency:
+                print("[WARNING] reporting_currency is ignored for warehouse reads")
+            if not self.pushdown:  # with pushdown the rows never leave the warehouse
+                self._load_from_warehouse()
+            return
+
+        holding_cols = ['PORTFOLIOCODE'] + (['CURRENCYCODE'] if self.reporting_currency else [])
+        if self.holdings_path is None and self.metrics_path is None:
+            from table_io import read_table
 
-        df = pd.merge(metrics_df, holdings_df[['TICKER', 'PORTFOLIOCODE']],
-                      on='TICKER', how='left')
+            holdings_df = read_table('holdings', columns=['COMPANY_SK'] + holding_cols)
+            metrics_df = read_table('holdings_metrics', columns=[
+                'COMPANY_SK', 'TICKER', 'INVESTMENT_DATE', 'INVESTMENT_AMOUNT', 'DISTRIBUTION_AMOUNTS',
+                'VALUATION_DATE', 'CURRENT_NAV', 'IRR', 'MOIC', 'DPI', 'TVPI'])
+        else:
+            from dtype_policy import surrogate_key
+
+            holdings_df = pd.read_csv(self.holdings_path, usecols=['TICKER'] + holding_cols)
+            metrics_df = pd.read_csv(self.metrics_path)
+            holdings_df['COMPANY_SK'] = surrogate_key(holdings_df.pop('TICKER'))
+            metrics_df['COMPANY_SK'] = surrogate_key(metrics_df['TICKER'])
+
+        df = pd.merge(metrics_df, holdings_df, on='COMPANY_SK', how='left').drop(columns='COMPANY_SK')
 
         df.rename(columns={
             'CURRENT_NAV': 'NAV',
@@ -41,15 +90,85 @@ class PortfolioPerformanceAnalyzer:
             'DISTRIBUTION_AMOUNTS': 'CASHDISTRIBUTED'
         }, inplace=True)
 
-        numeric_cols = ['MOIC', 'IRR', 'TVPI', 'DPI', 'CASHINVESTED', 'CASHDISTRIBUTED', 'NAV']
-        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        df[NUMERIC_COLS] = df[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce')
+        if self.reporting_currency:
+            self._convert_currency(df)
+
+        self.df = df
+        record_rows(rows_out=len(df))
+
+    def _convert_currency(self, df):
+        """
+        Convert CASHINVESTED and NAV to the reporting currency in place, in one
+        vectorized as-of lookup per column (only the holdings' currencies are loaded).
+        """
+        from fx_store import load_fx_store
+
+        currencies = df['CURRENCYCODE'].astype(str)
+        fx = load_fx_store(currencies=set(currencies) | {self.reporting_currency})
+        df['CASHINVESTED'] = fx.convert(df['CASHINVESTED'], currencies, df['INVESTMENT_DATE'],
+                                        to=self.reporting_currency)
+        df['NAV'] = fx.convert(df['NAV'], currencies, df['VALUATION_DATE'], to=self.reporting_currency)
 
+    def _load_from_warehouse(self):
+        """
+        Pull the joined, projected rows from the warehouse as Arrow batches.
+        """
+        from snowflake.arrow_read import fetch_pandas
+
+        df = fetch_pandas(self.session, """
+            SELECT M.TICKER, H.PORTFOLIOCODE,
+                   M.CURRENT_NAV AS NAV, M.INVESTMENT_AMOUNT AS CASHINVESTED,
+                   M.DISTRIBUTION_AMOUNTS AS CASHDISTRIBUTED,
+                   M.MOIC, M.IRR, M.TVPI, M.DPI
+            FROM HOLDINGS_METRICS M
+            LEFT JOIN HOLDINGS H ON M.TICKER = H.TICKER
+        """)
+        df[NUMERIC_COLS] = df[NUMERIC_COLS].apply(pd.to_numeric, errors='coerce')
         self.df = df
+        record_rows(rows_out=len(df))
 
+    def _aggregate_in_warehouse(self):
+        """
+        Run the fund-level aggregation in SQL; same results as calculate_aggregates.
+        """
+        from snowflake.arrow_read import fetch_pandas, try_to_number
+
+        # Non-numeric distributions count as missing, like pd.to_numeric(errors='coerce')
+        dist = try_to_number(self.session, "M.DISTRIBUTION_AMOUNTS")
+        final_perf = fetch_pandas(self.session, f"""
+            SELECT PORTFOLIOCODE, CASHINVESTED, CASHDISTRIBUTED, NAV,
+                   (CASHDISTRIBUTED + NAV) / CASHINVESTED AS TVPI,
+                   CASHDISTRIBUTED / CASHINVESTED AS DPI,
+                   IRR_X_INV / CASHINVESTED AS IRR,
+                   MOIC_X_INV / CASHINVESTED AS MOIC
+            FROM (
+                SELECT H.PORTFOLIOCODE,
+                       SUM(M.INVESTMENT_AMOUNT) AS CASHINVESTED,
+                       COALESCE(SUM({dist}), 0) AS CASHDISTRIBUTED,
+                       SUM(M.CURRENT_NAV) AS NAV,
+                       SUM(M.IRR * M.INVESTMENT_AMOUNT) AS IRR_X_INV,
+                       SUM(M.MOIC * M.INVESTMENT_AMOUNT) AS MOIC_X_INV
+                FROM HOLDINGS_METRICS M
+                JOIN HOLDINGS H ON M.TICKER = H.TICKER
+                GROUP BY H.PORTFOLIOCODE
+            ) P
+            ORDER BY PORTFOLIOCODE
+        """)
+        perf_cols = ['CASHINVESTED', 'CASHDISTRIBUTED', 'NAV', 'TVPI', 'DPI', 'IRR', 'MOIC']
+        final_perf[perf_cols] = final_perf[perf_cols].astype(float)
+        self.portfolio_perf = final_perf[['PORTFOLIOCODE', 'CASHINVESTED', 'CASHDISTRIBUTED', 'NAV', 'TVPI', 'DPI']]
+        self.final_perf = final_perf
+
+    @instrumented()
     def calculate_aggregates(self):
         """
         Aggregate and compute portfolio-level metrics.
         """
+        if self.pushdown:
+            self._aggregate_in_warehouse()
+            return
+
         df = self.df
 
         portfolio_perf = df.groupby('PORTFOLIOCODE').agg({
@@ -72,11 +191,15 @@ class PortfolioPerformanceAnalyzer:
         final_perf = pd.merge(portfolio_perf, weighted_perf, on='PORTFOLIOCODE', how='left')
         self.portfolio_perf = portfolio_perf
         self.final_perf = final_perf
+        record_rows(rows_in=len(df), rows_out=len(final_perf))
 
     def plot_metrics(self):
         """
         Generate bar plots for IRR and MOIC by portfolio.
         """
+        # matplotlib roughly doubles the import time of this module; only plots need it
+        import matplotlib.pyplot as plt
+
         sorted_perf = self.final_perf.sort_values(by="IRR", ascending=False)
 
         plt.figure(figsize=(10, 5))
@@ -98,16 +221,18 @@ class PortfolioPerformanceAnalyzer:
         plt.show()
 
 if __name__ == '__main__':
-    # Define paths to the CSV files
-    holdings_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'holdings.csv')
-    metrics_path  = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'holdings_metrics.csv')
-
-    holdings_path = os.path.abspath(holdings_path)
-    metrics_path  = os.path.abspath(metrics_path)
+    if os.getenv("PERFORMANCE_SOURCE", "csv") == "warehouse":
+        from snowflake.session_pool import pooled_session
 
-    analyzer = PortfolioPerformanceAnalyzer(holdings_path, metrics_path)
-    analyzer.load_data()
-    analyzer.calculate_aggregates()
+        with pooled_session() as session:
+            analyzer = PortfolioPerformanceAnalyzer(session=session,
+                                                    pushdown=os.getenv("PERFORMANCE_PUSHDOWN") == "1")
+            analyzer.load_data()
+            analyzer.calculate_aggregates()
+    else:
+        analyzer = PortfolioPerformanceAnalyzer(reporting_currency=os.getenv("PERFORMANCE_CURRENCY"))
+        analyzer.load_data()
+        analyzer.calculate_aggregates()
     print(analyzer.final_perf.head())
 
 
@@ -35,7 +35,7 @@ Each product represents a group of funds sharing the same **strategy** and **reg
 import os
 import pandas as pd
 import random
-from path_helpers import get_csv_path, ensure_csvs_dir
+from table_io import write_table
 
 # Load in the portfolio general info DataFrame
 portfolio_general_path = os.path.join(os.path.dirname(__file__), '..', 'CSVs', 'portfolio_general_info.csv')
@@ -107,5 +107,4 @@ if __name__ == "__main__":
     product_master_df.to_csv("CSVs/product_master.csv", index=False)
 
     # Write the product_master_df to a CSV file in the CSVs folder
-    output_file_path = get_csv_path('product_master.csv')
-    product_master_df.to_csv(output_file_path, index=False)
\ No newline at end of file
+    write_table(product_master_df, 'product_master')
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+scale.py
+
+One scale factor sizes the whole synthetic dataset, TPC-style. SCALE_FACTOR=1
+(the default) is the small development dataset; SF10, SF100 and beyond grow
+every table consistently, so the same analytics can be run at warehouse
+capacity-planning volumes.
+
+| Entity                  | SF1  | Growth | Used by                                   |
+|-------------------------|------|--------|-------------------------------------------|
+| `funds`                 | 100  | linear | portfolio_general_info, holdings, fund_manager |
+| `institutional_accounts`| 25   | linear | account                                   |
+| `individual_accounts`   | 25   | linear | account                                   |
+| `managers`              | 80   | linear | fund_manager                              |
+| `holdings_per_fund`     | 10   | fixed  | holdings (total grows with `funds`)       |
+| `synthetic_benchmarks`  | 7    | linear | benchmark_general_information             |
+| `history_quarters`      | 48   | log    | benchmark_characteristics, benchmark_performance |
+
+Linear entities are multiplied by the scale factor; `log` entities grow by
+their SF1 size for every 10x (48 quarters at SF1, 96 at SF10, 144 at SF100),
+so history deepens without dominating the row counts.
+
+Identifiers are derived here rather than read from other tables, so every
+generator agrees on them without extra pipeline dependencies: holdings,
+manager assignments and account associations always reference funds and
+accounts that exist at the same scale factor.
+
+Usage:
+    SCALE_FACTOR=10 python pipeline.py
+
+    from scale import size, fund_codes
+    n_funds = size("funds")
+"""
+
+import math
+import os
+from typing import List, Optional
+
+SCALE_FACTOR = float(os.getenv("SCALE_FACTOR", "1"))
+
+# entity: (size at SF1, growth with the scale factor)
+BASE_SIZES = {
+    "funds":                  (100, "linear"),
+    "institutional_accounts": (25, "linear"),
+    "individual_accounts":    (25, "linear"),
+    "managers":               (80, "linear"),
+    "holdings_per_fund":      (10, "fixed"),
+    "synthetic_benchmarks":   (7, "linear"),
+    "history_quarters":       (48, "log"),
+}
+
+
+def size(entity: str, scale_factor: Optional[float] = None) -> int:
+    """
+    Number of rows/items of `entity` at the given scale factor.
+
+    Parameters:
+        entity: key of BASE_SIZES
+        scale_factor: defaults to SCALE_FACTOR from the environment
+
+    Returns:
+        int: at least 1
+    """
+    if entity not in BASE_SIZES:
+        raise KeyError(f"Unknown scaled entity: {entity}")
+    sf = SCALE_FACTOR if scale_factor is None else scale_factor
+    if sf <= 0:
+        raise ValueError(f"Scale factor must be positive, got {sf}")
+    base, growth = BASE_SIZES[entity]
+    if growth == "linear":
+        return max(1, round(base * sf))
+    if growth == "log":
+        return max(1, round(base * (1 + math.log10(sf)))) if sf > 1 else base
+    return base
+
+
+def make_ids(prefix: str, n: int, width: int = 4) -> List[str]:
+    """IDs prefix0001..prefixN, widened when N needs more digits."""
+    width = max(width, len(str(n)))
+    return [f"{prefix}{i:0{width}d}" for i in range(1, n + 1)]
+
+
+def fund_codes(scale_factor: Optional[float] = None) -> List[str]:
+    """PORTFOLIOCODE values (FND0001, ...) of every fund at this scale."""
+    return make_ids("FND", size("funds", scale_factor))
+
+
+def account_ids(scale_factor: Optional[float] = None) -> List[str]:
+    """Account IDs (ACC0001, ...); institutional accounts first, then individuals."""
+    n = size("institutional_accounts", scale_factor) + size("individual_accounts", scale_factor)
+    return make_ids("ACC", n)
@@ -0,0 +1,71 @@
+"""
+Arrow-batch read path from the warehouse.
+
+`session.sql(q).collect()` returns one Python Row object per row, which is
+the bottleneck when pulling large tables into pandas. This module runs the
+query on the session's underlying connection and fetches the result as Arrow
+record batches instead:
+
+- fetch_arrow_table(session, query): concatenates the batches into one
+  `pa.Table` (column buffers are not copied)
+- fetch_pandas(session, query): a single `to_pandas` conversion of that table,
+  releasing Arrow buffers as columns are converted
+
+Works with Snowpark sessions (`session.connection` is a Snowflake connector
+connection with `fetch_arrow_batches`) and with `LocalSession`, which exposes
+the same cursor API.
+
+Usage:
+    from snowflake.arrow_read import fetch_pandas
+    df = fetch_pandas(session, "SELECT TICKER, IRR FROM HOLDINGS_METRICS")
+"""
+
+from typing import Optional
+import pandas as pd
+import pyarrow as pa
+from instrument import instrumented
+
+DEFAULT_BATCH_ROWS = 100_000
+
+
+def try_to_number(session, expr: str) -> str:
+    """SQL expression casting `expr` to a number, NULL when it is not numeric."""
+    if getattr(session, "dialect", "snowflake") == "sqlite":
+        return f"CASE WHEN typeof({expr}) IN ('integer', 'real') THEN {expr} END"
+    return f"TRY_TO_DOUBLE(TO_VARCHAR({expr}))"
+
+
+def fetch_arrow_table(session, query: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> pa.Table:
+    """
+    Run `query` and collect its result as Arrow record batches.
+
+    Returns:
+        pa.Table (empty, with the result's column names, when no rows match)
+    """
+    cursor = session.connection.cursor()
+    try:
+        cursor.execute(query)
+        if getattr(session, "dialect", "snowflake") == "sqlite":
+            batches = cursor.fetch_arrow_batches(batch_rows)
+        else:
+            batches = cursor.fetch_arrow_batches()
+
+        parts = []
+        for batch in batches:
+            if batch is None or batch.num_rows == 0:
+                continue
+            parts.append(pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch)
+
+        if not parts:
+            names = [d[0] for d in cursor.description or []]
+            return pa.table({name: pa.array([], type=pa.null()) for name in names})
+        return pa.concat_tables(parts, promote_options="permissive")
+    finally:
+        cursor.close()
+
+
+@instrumented()
+def fetch_pandas(session, query: str, batch_rows: Optional[int] = None) -> pd.DataFrame:
+    """Run `query` and convert the Arrow result to pandas exactly once."""
+    table = fetch_arrow_table(session, query, batch_rows or DEFAULT_BATCH_ROWS)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
@@ -0,0 +1,254 @@
+"""
+Bulk staged loading for Snowflake ingestion.
+
+Instead of pushing every table through `session.create_dataframe(df)`, which
+serializes the whole DataFrame through the client, this module:
+
+1. Writes the table as Snappy-compressed Parquet files in row chunks
+   (CSV sources are streamed with `pd.read_csv(chunksize=...)`, so a
+   multi-GB file is never fully in memory).
+2. Uploads all chunk files to a stage with one `PUT`.
+3. Loads them with a single `COPY INTO ... MATCH_BY_COLUMN_NAME` per table,
+   purging the staged files afterwards.
+
+Backends:
+- SnowflakeStageBackend(session): real Snowflake (temporary internal stage)
+- LocalStageBackend(root_dir): offline stand-in; the "stage" is a directory
+  and tables are Parquet part files, so the full chunk → stage → COPY path can
+  be exercised and timed without a Snowflake account.
+
+Conventions match `snowflake_comp_test.py`: column names are uppercased and
+target tables are created from `schema_registry.py` (chunks are cast to the
+registered types) or, for unregistered tables, from the first chunk's dtypes
+via `_PANDAS_TO_SF`.
+
+Usage:
+    from snowflake.bulk_load import SnowflakeStageBackend, bulk_load_csvs
+    backend = SnowflakeStageBackend(session)
+    bulk_load_csvs(backend, "CSVs")
+"""
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Dict, List, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from snowflake.schema_registry import coerce_frame, get_table_schema
+from instrument import annotate, instrumented, record_bytes, record_rows
+
+DEFAULT_CHUNK_ROWS = 500_000
+DEFAULT_COMPRESSION = "snappy"
+DEFAULT_STAGE = "VC_BULK_STAGE"
+
+
+# --------------- Chunked Parquet writer ----------------
+def _iter_chunks(source, chunk_rows: int):
+    """Yield DataFrame chunks from a DataFrame or a CSV path."""
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start:start + chunk_rows]
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+
+
+def write_parquet_chunks(source, out_dir: str, table_name: str,
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         compression: str = DEFAULT_COMPRESSION) -> Tuple[List[str], int, pd.DataFrame]:
+    """
+    Write `source` as compressed Parquet chunk files with uppercase columns.
+
+    Returns:
+        (file paths, total rows, first chunk) — the first chunk is used to
+        create the target table's schema.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    schema = get_table_schema(table_name)
+    paths, rows, first = [], 0, None
+    for i, chunk in enumerate(_iter_chunks(source, chunk_rows)):
+        chunk = chunk.rename(columns=lambda c: str(c).upper())
+        if schema is not None:
+            chunk = coerce_frame(chunk, schema)  # real dates/integers in the Parquet files
+        if first is None:
+            first = chunk
+        path = os.path.join(out_dir, f"{table_name.lower()}_{i:05d}.parquet")
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False), path, compression=compression)
+        paths.append(path)
+        rows += len(chunk)
+    if first is None or first.empty:
+        raise ValueError(f"No rows to load for {table_name}.")
+    return paths, rows, first
+
+
+# --------------- Backends ----------------
+class SnowflakeStageBackend:
+    """PUT/COPY against a Snowflake internal stage."""
+
+    def __init__(self, session, stage: str = DEFAULT_STAGE, parallel: int = 8):
+        self.session = session
+        self.stage = stage
+        self.parallel = parallel
+        self._stage_ready = False
+
+    def _ensure_stage(self):
+        if not self._stage_ready:
+            self.session.sql(
+                f"CREATE TEMPORARY STAGE IF NOT EXISTS {self.stage} "
+                f"FILE_FORMAT = (TYPE = PARQUET USE_LOGICAL_TYPE = TRUE)"
+            ).collect()
+            self._stage_ready = True
+
+    def create_table(self, df: pd.DataFrame, table_name: str, replace: bool) -> None:
+        from snowflake.snowflake_comp_test import create_table_from_df
+        create_table_from_df(self.session, df, table_name, replace=replace)
+
+    def put(self, paths: List[str], prefix: str) -> None:
+        self._ensure_stage()
+        pattern = os.path.join(os.path.dirname(paths[0]), "*.parquet")
+        self.session.file.put(pattern, f"@{self.stage}/{prefix}",
+                              auto_compress=False, parallel=self.parallel, overwrite=True)
+
+    def table_version(self, table_name: str):
+        """Creation and last-change time of `table_name`, or None if it does not exist."""
+        rows = self.session.sql(
+            f"SELECT CREATED, LAST_ALTERED FROM INFORMATION_SCHEMA.TABLES "
+            f"WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME = '{table_name.upper()}'"
+        ).collect()
+        if not rows:
+            return None
+        created, altered = rows[0][0], rows[0][1]
+        return f"{created}|{altered}"
+
+    def copy_into(self, table_name: str, prefix: str) -> int:
+        rows = self.session.sql(
+            f"COPY INTO {table_name} FROM @{self.stage}/{prefix}/ "
+            f"FILE_FORMAT = (TYPE = PARQUET USE_LOGICAL_TYPE = TRUE) "
+            f"MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PURGE = TRUE"
+        ).collect()
+        loaded = 0
+        for r in rows:
+            d = {k.lower(): v for k, v in r.as_dict().items()}
+            loaded += int(d.get("rows_loaded") or 0)
+        return loaded
+
+
+class LocalStageBackend:
+    """
+    Offline stand-in for a Snowflake stage. `root_dir/stage/` plays the stage,
+    `root_dir/tables/<TABLE>/` holds a `_schema.json` and Parquet part files.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.stage_dir = os.path.join(root_dir, "stage")
+        self.tables_dir = os.path.join(root_dir, "tables")
+        os.makedirs(self.stage_dir, exist_ok=True)
+        os.makedirs(self.tables_dir, exist_ok=True)
+
+    def _table_dir(self, table_name: str) -> str:
+        return os.path.join(self.tables_dir, table_name.upper())
+
+    def create_table(self, df: pd.DataFrame, table_name: str, replace: bool) -> None:
+        table_dir = self._table_dir(table_name)
+        if replace and os.path.exists(table_dir):
+            shutil.rmtree(table_dir)
+        if os.path.exists(table_dir):
+            return
+        os.makedirs(table_dir)
+        with open(os.path.join(table_dir, "_schema.json"), "w") as f:
+            json.dump([str(c).upper() for c in df.columns], f)
+
+    def put(self, paths: List[str], prefix: str) -> None:
+        target = os.path.join(self.stage_dir, prefix)
+        os.makedirs(target, exist_ok=True)
+        for path in paths:
+            shutil.copy2(path, target)
+
+    def copy_into(self, table_name: str, prefix: str) -> int:
+        table_dir = self._table_dir(table_name)
+        with open(os.path.join(table_dir, "_schema.json"), "r") as f:
+            columns = json.load(f)
+
+        staged = os.path.join(self.stage_dir, prefix)
+        loaded = 0
+        for path in sorted(glob.glob(os.path.join(staged, "*.parquet"))):
+            # MATCH_BY_COLUMN_NAME: missing columns -> NULL, extra columns dropped
+            data = pq.read_table(path)
+            arrays = [
+                data.column(c) if c in data.column_names else pa.nulls(data.num_rows)
+                for c in columns
+            ]
+            aligned = pa.Table.from_arrays(arrays, names=columns)
+            pq.write_table(aligned, os.path.join(table_dir, f"part_{uuid.uuid4().hex}.parquet"),
+                           compression=DEFAULT_COMPRESSION)
+            loaded += aligned.num_rows
+        shutil.rmtree(staged)  # PURGE = TRUE
+        return loaded
+
+    def table_version(self, table_name: str):
+        """Fingerprint of the table's files (changes on every load or replace), or None."""
+        table_dir = self._table_dir(table_name)
+        schema_path = os.path.join(table_dir, "_schema.json")
+        if not os.path.exists(schema_path):
+            return None
+        parts = sorted(os.path.basename(p) for p in glob.glob(os.path.join(table_dir, "*.parquet")))
+        return "|".join([str(os.stat(schema_path).st_mtime_ns)] + parts)
+
+    def read_table(self, table_name: str) -> pd.DataFrame:
+        table_dir = self._table_dir(table_name)
+        with open(os.path.join(table_dir, "_schema.json"), "r") as f:
+            columns = json.load(f)
+        parts = sorted(glob.glob(os.path.join(table_dir, "*.parquet")))
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        return pd.concat([pq.read_table(p).to_pandas() for p in parts], ignore_index=True)
+
+
+# --------------- Public API ----------------
+@instrumented()
+def bulk_load_table(backend, source, table_name: str, replace: bool = True,
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    compression: str = DEFAULT_COMPRESSION) -> Dict[str, object]:
+    """
+    Load a DataFrame or CSV path into `table_name` through the stage.
+    With replace=False rows are appended (table created if missing).
+
+    Returns:
+        dict: table, files, rows, bytes
+    """
+    table_name = table_name.upper()
+    annotate(table=table_name)
+    prefix = f"{table_name.lower()}/{uuid.uuid4().hex}"
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, rows, first = write_parquet_chunks(source, tmp, table_name, chunk_rows, compression)
+        size = sum(os.path.getsize(p) for p in paths)
+        record_bytes(size)
+        backend.create_table(first, table_name, replace)
+        backend.put(paths, prefix)
+        loaded = backend.copy_into(table_name, prefix)
+
+    if loaded != rows:
+        raise RuntimeError(f"COPY INTO {table_name} loaded {loaded} of {rows} rows.")
+    record_rows(rows_in=rows, rows_out=loaded)
+    print(f"✅ Bulk loaded {rows} rows ({len(paths)} files, {size:,} bytes) into {table_name}")
+    return {"table": table_name, "files": len(paths), "rows": rows, "bytes": size}
+
+
+def bulk_load_csvs(backend, csv_dir: str = "CSVs", replace: bool = True,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Dict[str, object]]:
+    """Bulk load every CSV in `csv_dir` into a table named after the file."""
+    results = []
+    for file in sorted(glob.glob(os.path.join(csv_dir, "*.csv"))):
+        table_name = os.path.splitext(os.path.basename(file))[0].upper()
+        results.append(bulk_load_table(backend, file, table_name, replace=replace, chunk_rows=chunk_rows))
+    return results
+
+
+if __name__ == "__main__":
+    # Offline dry run: load every CSV through the local stand-in stage
+    with tempfile.TemporaryDirectory() as root:
+        bulk_load_csvs(LocalStageBackend(root))
@@ -1,58 +1,33 @@
 # load_to_snowflake.py
 import pandas as pd
-from snowflake.snowpark import Session
-from dotenv import load_dotenv
 import os
 import glob
-
-
-def create_initial_snowflake_tables():
-    # Load the environment variables from the .env file
-    load_dotenv()
-
-    connection_params = {
-        "user": os.getenv("SNOWFLAKE_USER"),
-        "password": os.getenv("SNOWFLAKE_PASSWORD"),
-        "account": os.getenv("SNOWFLAKE_ACCOUNT"),
-        "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
-        "database": os.getenv("SNOWFLAKE_DATABASE"),
-        "schema": os.getenv("SNOWFLAKE_SCHEMA"),
-    }
-
-    # Create Snowflake session 
-    session = Session.builder.configs(connection_params).create()
-
-    for file in glob.glob("CSVs/*.csv"):
-        df = pd.read_csv(file)
-        table_name = os.path.splitext(os.path.basename(file))[0].upper()
-        session.create_dataframe(df).write.mode("overwrite").save_as_table(table_name)
-        print(f"✅ Loaded {file} into {table_name}")
-
-    # Close the session
-    session.close()
-
-def appending_snowflake_tables(file):
-    # Load the environment variables from the .env file
-    load_dotenv()
-
-    connection_params = {
-        "user": os.getenv("SNOWFLAKE_USER"),
-        "password": os.getenv("SNOWFLAKE_PASSWORD"),
-        "account": os.getenv("SNOWFLAKE_ACCOUNT"),
-        "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
-        "database": os.getenv("SNOWFLAKE_DATABASE"),
-        "schema": os.getenv("SNOWFLAKE_SCHEMA"),
-    }
-
-    # Create Snowflake session 
-    session = Session.builder.configs(connection_params).create()
+from snowflake.bulk_load import SnowflakeStageBackend, bulk_load_csvs
+from snowflake.session_pool import pooled_session, get_pool, close_pool
+
+
+def create_initial_snowflake_tables(bulk=True):
+    # Borrow a session from the shared pool (connection settings are read once)
+    with pooled_session() as session:
+        if bulk:
+            # Compressed Parquet chunks -> PUT to a stage -> one COPY INTO per table
+            bulk_load_csvs(SnowflakeStageBackend(session), "CSVs", replace=True)
+        else:
+            for file in glob.glob("CSVs/*.csv"):
+                df = pd.read_csv(file)
+                table_name = os.path.splitext(os.path.basename(file))[0].upper()
+                session.create_dataframe(df).write.mode("overwrite").save_as_table(table_name)
+                print(f"✅ Loaded {file} into {table_name}")
+
+def appending_snowflake_tables(file, table_name=None):
+    # Table name defaults to the CSV file name, as in create_initial_snowflake_tables
+    table_name = table_name or os.path.splitext(os.path.basename(file))[0].upper()
     df = pd.read_csv(file)
 
-    session.create_dataframe(df).write.mode("append").save_as_table()
+    with pooled_session() as session:
+        session.create_dataframe(df).write.mode("append").save_as_table(table_name)
 
 if __name__ == "__main__":
     create_initial_snowflake_tables()
-
-
-
-
+    print(f"Session setup: {get_pool().stats()}")
+    close_pool()
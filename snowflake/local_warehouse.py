@@ -0,0 +1,412 @@
+"""
+Local embedded warehouse that stands in for a Snowpark session.
+
+Everything in `snowflake/` talks to the warehouse through a handful of
+Snowpark calls. `LocalSession` implements exactly that surface on top of an
+SQLite file (standard library, no network), so the generate → load → query
+pipeline and its benchmarks run on a laptop or CI box:
+
+| Snowpark call                                         | Local behaviour                          |
+|-------------------------------------------------------|------------------------------------------|
+| `session.sql(q).collect()` / `.to_pandas()`           | SQLite query; rows support `.name`, `[i]`, `.as_dict()` |
+| `DESCRIBE TABLE t`                                    | `PRAGMA table_info` (name, type, kind)   |
+| `CREATE OR REPLACE TABLE` / `CREATE TABLE IF NOT EXISTS` | DDL from `_build_create_table_sql`; PRIMARY KEY / CLUSTER BY dropped |
+| `CREATE TEMPORARY STAGE`, `session.file.put(...)`     | Directory per stage, removed on close    |
+| `COPY INTO t FROM @stage/prefix/ ... PURGE = TRUE`    | Parquet files matched by column name     |
+| `MERGE INTO` (shape emitted by `upsert.build_merge_sql`) | DELETE matched keys + INSERT from staging |
+| `session.create_dataframe(df).write.mode(m).save_as_table(t)` | Create from df dtypes if needed, insert by column name |
+| `session.table(t).to_pandas()`                        | `SELECT *`                               |
+| `session.connection.cursor().fetch_arrow_batches()`   | Arrow record batches built per fetchmany |
+| `INFORMATION_SCHEMA.TABLES`, `CURRENT_SCHEMA()`       | Bookkeeping table of CREATED / LAST_ALTERED per table, schema `PUBLIC` |
+
+Columns are uppercased as in Snowflake. Select the backend with
+`WAREHOUSE_BACKEND=local` (database file: `LOCAL_WAREHOUSE_PATH`, default
+`.local_warehouse/warehouse.db`); `session_pool.pooled_session()` then hands
+out `LocalSession`s and no helper needs to change.
+
+Usage:
+    from snowflake.local_warehouse import LocalSession
+
+    session = LocalSession(":memory:")
+    session.create_dataframe(df).write.mode("overwrite").save_as_table("HOLDINGS")
+    session.sql("SELECT COUNT(*) AS N FROM HOLDINGS").collect()[0].N
+"""
+
+import glob
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_LOCAL_PATH = os.getenv(
+    "LOCAL_WAREHOUSE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".local_warehouse", "warehouse.db"),
+)
+
+_STAGE_RE = re.compile(r"CREATE\s+(?:TEMPORARY\s+)?STAGE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.I)
+_COPY_RE = re.compile(r"COPY\s+INTO\s+(\w+)\s+FROM\s+@(\w+)/?(\S*?)/?\s", re.I)
+_PRIMARY_KEY_RE = re.compile(r",\s*PRIMARY\s+KEY\s*\([^)]*\)", re.I)
+_CLUSTER_RE = re.compile(r"\s*CLUSTER\s+BY\s*\([^)]*\)", re.I)
+_CREATE_TABLE_RE = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?\"?(\w+)", re.I)
+_DROP_TABLE_RE = re.compile(r"DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?\"?(\w+)", re.I)
+_DML_RE = re.compile(r"(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE\s+(?:TABLE\s+)?)\s*\"?(\w+)", re.I)
+_INFORMATION_SCHEMA_RE = re.compile(r"\bINFORMATION_SCHEMA\.TABLES\b", re.I)
+# INFORMATION_SCHEMA.TABLES is emulated by this table in the database file
+_TABLES_CATALOG = "_INFORMATION_SCHEMA_TABLES"
+LOCAL_SCHEMA = "PUBLIC"
+
+_MERGE_RE = re.compile(
+    r"MERGE\s+INTO\s+(\w+)\s+T\s+USING\s+(\w+)\s+S\s+ON\s+(.+?)\s+"
+    r"(?:WHEN\s+MATCHED\s+THEN\s+UPDATE\s+SET\s+.+?\s+)?"
+    r"WHEN\s+NOT\s+MATCHED\s+THEN\s+INSERT\s+\((.+?)\)\s+VALUES\s+\((.+)\)\s*$",
+    re.I | re.S,
+)
+
+
+class Row(tuple):
+    """Result row with Snowpark-style access: r[0], r.NAME, r.as_dict()."""
+
+    def __new__(cls, values, fields):
+        row = super().__new__(cls, values)
+        row._fields = list(fields)
+        return row
+
+    def __getattr__(self, item):
+        for i, f in enumerate(self._fields):
+            if f == item or f.upper() == item.upper():
+                return self[i]
+        raise AttributeError(item)
+
+    def as_dict(self) -> Dict[str, object]:
+        return dict(zip(self._fields, self))
+
+
+def _to_records(df: pd.DataFrame, date_cols=()) -> List[tuple]:
+    """DataFrame -> list of tuples of plain Python values (NULL for NaN/NaT)."""
+    cols = []
+    for name, s in df.items():
+        if pd.api.types.is_datetime64_any_dtype(s):
+            fmt = "%Y-%m-%d" if name in date_cols else "%Y-%m-%d %H:%M:%S"
+            values = s.dt.strftime(fmt).astype(object)
+        else:
+            values = s.astype(object)
+        cols.append(values.where(s.notna(), None).tolist())
+    return list(zip(*cols))
+
+
+class _Result:
+    """Lazy query result, executed on collect()/to_pandas() like Snowpark."""
+
+    def __init__(self, session: "LocalSession", query: str):
+        self._session = session
+        self._query = query
+
+    def collect(self) -> List[Row]:
+        return self._session._run(self._query)
+
+    def to_pandas(self) -> pd.DataFrame:
+        rows = self.collect()
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame([tuple(r) for r in rows], columns=rows[0]._fields)
+
+
+class _Writer:
+    def __init__(self, session: "LocalSession", df: pd.DataFrame):
+        self._session = session
+        self._df = df
+        self._mode = "errorifexists"
+
+    def mode(self, mode: str) -> "_Writer":
+        self._mode = mode.lower()
+        return self
+
+    def save_as_table(self, table_name: str) -> None:
+        self._session._save(self._df, table_name, self._mode)
+
+
+class _LocalDataFrame:
+    def __init__(self, session: "LocalSession", df: pd.DataFrame):
+        self._df = df
+        self.write = _Writer(session, df)
+
+    def to_pandas(self) -> pd.DataFrame:
+        return self._df
+
+    def collect(self) -> List[Row]:
+        return [Row(r, self._df.columns) for r in _to_records(self._df)]
+
+
+class _FileOps:
+    def __init__(self, session: "LocalSession"):
+        self._session = session
+
+    def put(self, local_pattern: str, stage_location: str, auto_compress: bool = False,
+            parallel: int = 4, overwrite: bool = True) -> List[Row]:
+        stage, _, prefix = stage_location.lstrip("@").partition("/")
+        target = os.path.join(self._session._stage_dir(stage), prefix)
+        os.makedirs(target, exist_ok=True)
+        rows = []
+        for path in sorted(glob.glob(local_pattern)):
+            shutil.copy2(path, target)
+            rows.append(Row((os.path.basename(path), "UPLOADED"), ["source", "status"]))
+        return rows
+
+
+class _LocalCursor:
+    """Connector-style cursor: execute() then fetch_arrow_batches()."""
+
+    def __init__(self, session: "LocalSession"):
+        self._session = session
+        self._cursor = None
+        self.description = None
+
+    def execute(self, query: str, params=()) -> "_LocalCursor":
+        with self._session._lock:
+            self._cursor = self._session._conn.execute(query, params)
+        self.description = self._cursor.description
+        return self
+
+    def fetch_arrow_batches(self, batch_rows: int = 100_000):
+        names = [d[0] for d in self.description or []]
+        while True:
+            with self._session._lock:
+                rows = self._cursor.fetchmany(batch_rows)
+            if not rows:
+                return
+            arrays = []
+            for values in zip(*rows):
+                try:
+                    arrays.append(pa.array(values))
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    arrays.append(pa.array([None if v is None else str(v) for v in values]))
+            yield pa.RecordBatch.from_arrays(arrays, names=names)
+
+    def close(self) -> None:
+        if self._cursor is not None:
+            self._cursor.close()
+
+
+class _LocalConnection:
+    def __init__(self, session: "LocalSession"):
+        self._session = session
+
+    def cursor(self) -> _LocalCursor:
+        return _LocalCursor(self._session)
+
+
+class LocalSession:
+    """Snowpark-compatible session backed by an embedded SQLite database."""
+
+    dialect = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_LOCAL_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False,
+                                     isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.create_function("CURRENT_SCHEMA", 0, lambda: LOCAL_SCHEMA)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_TABLES_CATALOG} (TABLE_SCHEMA TEXT, TABLE_NAME TEXT PRIMARY KEY, "
+            f"CREATED TEXT, LAST_ALTERED TEXT)"
+        )
+        self._lock = threading.RLock()
+        self._last_stamp = 0
+        self._stages_root = tempfile.mkdtemp(prefix="local_stages_")
+        self.file = _FileOps(self)
+        self.connection = _LocalConnection(self)
+
+    # ---- Snowpark surface ----
+    def sql(self, query: str) -> _Result:
+        return _Result(self, query)
+
+    def table(self, table_name: str) -> _Result:
+        return _Result(self, f"SELECT * FROM {table_name}")
+
+    def create_dataframe(self, df: pd.DataFrame) -> _LocalDataFrame:
+        return _LocalDataFrame(self, df)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        shutil.rmtree(self._stages_root, ignore_errors=True)
+
+    # ---- internals ----
+    def _stage_dir(self, stage: str) -> str:
+        return os.path.join(self._stages_root, stage.upper())
+
+    def _execute(self, query: str, params=()) -> List[Row]:
+        with self._lock:
+            cur = self._conn.execute(query, params)
+            if cur.description is None:
+                return []
+            fields = [d[0] for d in cur.description]
+            return [Row(r, fields) for r in cur.fetchall()]
+
+    def _stamp(self) -> str:
+        """Strictly increasing timestamp, so two changes in one clock tick still differ."""
+        self._last_stamp = max(time.time_ns(), self._last_stamp + 1)
+        return str(self._last_stamp)
+
+    def _touch(self, table_name: str, created: bool = False) -> None:
+        """Record a change to `table_name` (and its creation) in the INFORMATION_SCHEMA emulation."""
+        name = table_name.upper()
+        with self._lock:
+            stamp = self._stamp()
+            if created:
+                self._conn.execute(f"INSERT OR REPLACE INTO {_TABLES_CATALOG} VALUES (?, ?, ?, ?)",
+                                   (LOCAL_SCHEMA, name, stamp, stamp))
+            else:
+                self._conn.execute(f"UPDATE {_TABLES_CATALOG} SET LAST_ALTERED = ? WHERE TABLE_NAME = ?",
+                                   (stamp, name))
+
+    def _forget(self, table_name: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {_TABLES_CATALOG} WHERE TABLE_NAME = ?", (table_name.upper(),))
+
+    def _columns(self, table_name: str) -> List[str]:
+        rows = self._execute(f'PRAGMA table_info("{table_name.upper()}")')
+        return [r.name for r in rows]
+
+    def _date_columns(self, table_name: str) -> List[str]:
+        rows = self._execute(f'PRAGMA table_info("{table_name.upper()}")')
+        return [r.name for r in rows if str(r.type).upper() == "DATE"]
+
+    def _run(self, query: str) -> List[Row]:
+        q = query.strip().rstrip(";").strip()
+        upper = q.upper()
+
+        if upper.startswith("DESCRIBE TABLE"):
+            table_name = q.split()[2]
+            rows = self._execute(f'PRAGMA table_info("{table_name.upper()}")')
+            fields = ["name", "type", "kind", "null?"]
+            return [Row((r.name, r.type, "COLUMN", "N" if r.notnull else "Y"), fields) for r in rows]
+
+        if upper.startswith("CREATE"):
+            # Snowflake-only clauses: keys are informational there, clustering has no equivalent
+            q = _CLUSTER_RE.sub("", _PRIMARY_KEY_RE.sub("", q))
+
+        if upper.startswith("CREATE OR REPLACE TABLE"):
+            table_name = q.split()[4]
+            with self._lock:
+                self._execute(f"DROP TABLE IF EXISTS {table_name}")
+                self._execute("CREATE TABLE" + q[len("CREATE OR REPLACE TABLE"):])
+                self._touch(table_name, created=True)
+            return [Row((f"Table {table_name.upper()} successfully created.",), ["status"])]
+
+        created = _CREATE_TABLE_RE.match(q)
+        if created:
+            with self._lock:
+                existed = bool(self._columns(created.group(1)))
+                rows = self._execute(q)
+                if not existed:
+                    self._touch(created.group(1), created=True)
+            return rows
+
+        dropped = _DROP_TABLE_RE.match(q)
+        if dropped:
+            with self._lock:
+                rows = self._execute(q)
+                self._forget(dropped.group(1))
+            return rows
+
+        stage = _STAGE_RE.match(q)
+        if stage:
+            os.makedirs(self._stage_dir(stage.group(1)), exist_ok=True)
+            return [Row((f"Stage area {stage.group(1).upper()} successfully created.",), ["status"])]
+
+        if upper.startswith("COPY INTO"):
+            return self._copy_into(q + " ")
+
+        if upper.startswith("MERGE INTO"):
+            return self._merge(q)
+
+        changed = _DML_RE.match(q)
+        if changed:
+            with self._lock:
+                rows = self._execute(q)
+                self._touch(changed.group(1))
+            return rows
+
+        return self._execute(_INFORMATION_SCHEMA_RE.sub(_TABLES_CATALOG, q))
+
+    def _insert(self, df: pd.DataFrame, table_name: str) -> int:
+        table_cols = self._columns(table_name)
+        by_upper = {str(c).upper(): c for c in df.columns}
+        cols = [c for c in table_cols if c in by_upper]
+        if not cols or df.empty:
+            return 0
+        names = ", ".join(f'"{c}"' for c in cols)
+        marks = ", ".join("?" for _ in cols)
+        aligned = df[[by_upper[c] for c in cols]].set_axis(cols, axis=1)
+        records = _to_records(aligned, set(self._date_columns(table_name)))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(f"INSERT INTO {table_name} ({names}) VALUES ({marks})", records)
+                self._touch(table_name)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(records)
+
+    def _save(self, df: pd.DataFrame, table_name: str, mode: str) -> None:
+        from snowflake.snowflake_comp_test import _build_create_table_sql
+
+        exists = bool(self._columns(table_name))
+        if exists and mode in ("errorifexists", "error"):
+            raise ValueError(f"Table {table_name} already exists.")
+        if exists and mode == "ignore":
+            return
+        if mode == "overwrite" or not exists:
+            self._run(_build_create_table_sql(df, table_name, replace=True))
+        self._insert(df, table_name)
+
+    def _copy_into(self, q: str) -> List[Row]:
+        m = _COPY_RE.match(q)
+        if not m:
+            raise ValueError(f"Unsupported COPY INTO statement: {q}")
+        table_name, stage, prefix = m.groups()
+        staged = os.path.join(self._stage_dir(stage), prefix)
+        rows = []
+        for path in sorted(glob.glob(os.path.join(staged, "*.parquet"))):
+            df = pq.read_table(path).to_pandas()
+            # MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE: unmatched columns stay NULL
+            loaded = self._insert(df.rename(columns=lambda c: str(c).upper()), table_name)
+            rows.append(Row((os.path.basename(path), "LOADED", loaded), ["file", "status", "rows_loaded"]))
+        if "PURGE = TRUE" in q.upper():
+            shutil.rmtree(staged, ignore_errors=True)
+        return rows
+
+    def _merge(self, q: str) -> List[Row]:
+        m = _MERGE_RE.match(q)
+        if not m:
+            raise ValueError(f"Unsupported MERGE statement: {q}")
+        target, staging, on, cols, vals = m.groups()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                updated = self._conn.execute(
+                    f"DELETE FROM {target} AS T WHERE EXISTS (SELECT 1 FROM {staging} S WHERE {on})"
+                ).rowcount
+                total = self._conn.execute(
+                    f"INSERT INTO {target} ({cols}) SELECT {vals} FROM {staging} S"
+                ).rowcount
+                self._touch(target)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        fields = ["number of rows inserted", "number of rows updated"]
+        return [Row((total - updated, updated), fields)]
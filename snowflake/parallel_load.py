@@ -0,0 +1,156 @@
+"""
+Parallel, dependency-aware warehouse load.
+
+`create_initial_snowflake_tables` loads one CSV at a time. Loading is I/O
+bound, so this loader runs independent tables concurrently on a bounded
+thread pool while still honouring foreign-key order: a table only starts
+once every table it references has finished loading.
+
+Each worker borrows its own session from `session_pool`, so concurrency is
+also bounded by `SNOWFLAKE_POOL_SIZE`.
+
+Load order comes from `FOREIGN_KEYS` in `schema_registry.py`: a child table
+is loaded after every parent it references (e.g. PORTFOLIO_GENERAL_INFO
+after PRODUCT_MASTER). Tables with no foreign keys, or whose parents are not
+part of the run, have no prerequisites. Every load reports rows, bytes and
+duration.
+
+Usage:
+    from snowflake.parallel_load import load_tables_parallel
+    report = load_tables_parallel("CSVs", max_workers=4)
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional
+from instrument import instrumented
+from snowflake.schema_registry import FOREIGN_KEYS, TABLE_SCHEMAS
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def table_dependencies() -> Dict[str, List[str]]:
+    """Child table -> parent tables it holds foreign keys into (from the schema registry)."""
+    graph: Dict[str, List[str]] = {}
+    for child, _, parent, _ in FOREIGN_KEYS:
+        if parent != child and parent not in graph.setdefault(child, []):
+            graph[child].append(parent)
+    return graph
+
+
+def _table_name(path: str) -> str:
+    """Registered table whose file is `path` (e.g. benchmark_general.csv -> BENCHMARK_GENERAL)."""
+    name = os.path.basename(path)
+    for schema in TABLE_SCHEMAS.values():
+        if schema.file == name:
+            return schema.name
+    return os.path.splitext(name)[0].upper()
+
+
+def resolve_load_order(tables: List[str], dependencies: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """
+    Restrict the dependency graph to `tables` and check it is acyclic.
+
+    Returns:
+        dict: table -> prerequisite tables that are part of this run
+    """
+    dependencies = table_dependencies() if dependencies is None else dependencies
+    wanted = set(tables)
+    graph = {t: [d for d in dependencies.get(t, []) if d in wanted] for t in tables}
+
+    # Kahn's algorithm purely as a cycle check
+    remaining = {t: set(deps) for t, deps in graph.items()}
+    while remaining:
+        ready = [t for t, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle among tables: {sorted(remaining)}")
+        for t in ready:
+            del remaining[t]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
+def _default_loader(path: str, table_name: str) -> Dict[str, object]:
+    """Bulk load one CSV through a pooled session."""
+    from snowflake.bulk_load import SnowflakeStageBackend, bulk_load_table
+    from snowflake.session_pool import pooled_session
+
+    with pooled_session() as session:
+        # One stage per table so concurrent COPYs never see each other's files
+        backend = SnowflakeStageBackend(session, stage=f"VC_BULK_STAGE_{table_name}")
+        return bulk_load_table(backend, path, table_name, replace=True)
+
+
+@instrumented()
+def load_tables_parallel(csv_dir: str = "CSVs", max_workers: int = DEFAULT_MAX_WORKERS,
+                         loader: Optional[Callable[[str, str], Dict[str, object]]] = None,
+                         dependencies: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, object]]:
+    """
+    Load every CSV in `csv_dir` concurrently, respecting foreign-key order.
+
+    Parameters:
+        loader: callable(path, table_name) -> dict with at least "rows" and
+            "bytes"; defaults to a staged bulk load on a pooled session.
+
+    Returns:
+        list of per-table dicts: table, status, rows, bytes, seconds, error
+    """
+    loader = loader or _default_loader
+    paths = {_table_name(p): p for p in sorted(glob.glob(os.path.join(csv_dir, "*.csv")))}
+    graph = resolve_load_order(list(paths), dependencies)
+
+    done, failed, report = set(), set(), []
+    pending = dict(graph)
+    running = {}
+
+    def run(table):
+        start = time.perf_counter()
+        result = loader(paths[table], table)
+        result = dict(result or {})
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            # Skip tables whose prerequisites failed
+            for table in [t for t, deps in pending.items() if any(d in failed for d in deps)]:
+                del pending[table]
+                failed.add(table)
+                report.append({"table": table, "status": "skipped", "rows": 0, "bytes": 0,
+                               "seconds": 0.0, "error": "prerequisite failed"})
+
+            for table in [t for t, deps in pending.items() if all(d in done for d in deps)]:
+                del pending[table]
+                running[pool.submit(run, table)] = table
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table = running.pop(future)
+                try:
+                    result = future.result()
+                    done.add(table)
+                    report.append({"table": table, "status": "loaded",
+                                   "rows": result.get("rows", 0), "bytes": result.get("bytes", 0),
+                                   "seconds": result["seconds"], "error": None})
+                except Exception as e:
+                    failed.add(table)
+                    report.append({"table": table, "status": "failed", "rows": 0, "bytes": 0,
+                                   "seconds": 0.0, "error": str(e)})
+                    print(f"[WARNING] Failed to load {table}: {e}")
+
+    for r in report:
+        print(f"{r['table']:<32} {r['status']:<8} rows={r['rows']:<10} bytes={r['bytes']:<12,} {r['seconds']:.2f}s")
+    return report
+
+
+if __name__ == "__main__":
+    from snowflake.session_pool import close_pool
+
+    load_tables_parallel("CSVs")
+    close_pool()
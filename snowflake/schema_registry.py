@@ -0,0 +1,351 @@
+"""
+Declarative schema registry for every table the project produces.
+
+`_build_create_table_sql` used to infer Snowflake types from pandas dtypes
+only, so date columns read from CSV became VARCHAR and every number FLOAT.
+Each table is declared here once with:
+
+- precise column types (DATE, NUMBER(p,s), FLOAT, VARCHAR) and nullability
+- its primary/natural key (emitted as PRIMARY KEY; informational in Snowflake)
+- clustering keys, so time-ranged queries prune micro-partitions
+- low-cardinality text columns, held as pandas categoricals
+
+Cross-table declarations:
+- FOREIGN_KEYS: child columns that must exist in a parent table (checked by
+  `integrity.py`)
+- NO_PARENT: the placeholder a foreign-key column holds on rows with no
+  parent, where the column is part of the primary key and so cannot be NULL
+- KEY_DOMAINS: the table that owns each join key (fund, account, company,
+  benchmark, product); `dtype_policy.py` gives every column of a domain the
+  same integer surrogate key
+
+The registry is used for:
+- DDL: `create_table_from_df` emits `create_table_sql(...)` for registered
+  tables and falls back to dtype inference for anything else
+- Typed local reads: `read_table_csv(...)` returns DATE columns as datetimes,
+  integer columns as the smallest nullable Int type their declared precision
+  fits (NUMBER(3,0) -> Int16) and categorical columns as `category`, instead
+  of strings/objects
+- Bulk loads: `coerce_frame(...)` types chunks before they are written to
+  Parquet, so COPY INTO loads real dates
+
+### Registered tables
+
+| Table                            | Key                                             | Cluster by                   |
+|----------------------------------|-------------------------------------------------|------------------------------|
+| ACCOUNTS                         | ACCOUNT ID                                      |                              |
+| PORTFOLIO_GENERAL_INFO           | PORTFOLIOCODE                                   |                              |
+| PORTFOLIO_ACCOUNT_MAP            | PORTFOLIOCODE, ACCOUNTID                        |                              |
+| PRODUCT_MASTER                   | PRODUCTCODE                                     |                              |
+| FUND_MANAGERS                    | FUNDID, MANAGERID                               |                              |
+| HOLDINGS                         | TICKER                                          | PORTFOLIOCODE                |
+| HOLDINGS_METRICS                 | TICKER                                          |                              |
+| EXITS                            | TICKER                                          | EXITDATE                     |
+| BENCHMARK_GENERAL                | BENCHMARK_CODE                                  |                              |
+| BENCHMARK_CHARACTERISTICS        | BENCHMARK_CODE, CHARACTERISTIC_NAME, HISTORY_DATE | BENCHMARK_CODE             |
+| BENCHMARK_PERFORMANCE            | BENCHMARK_CODE, HISTORY_DATE                    | BENCHMARK_CODE, HISTORY_DATE |
+| BENCHMARK_ACCOUNT_ASSOCIATION    | ACCOUNT_ID, BENCHMARK_CODE                      |                              |
+| BENCHMARK_COMPOSITE_PERFORMANCE  | COMPOSITE_CODE, HISTORY_DATE                    | COMPOSITE_CODE, HISTORY_DATE |
+| BENCHMARK_COMPOSITE_ACCOUNT_MAP  | ACCOUNT_ID, BENCHMARK_CODE                      |                              |
+| BENCHMARK_RISK                   | SERIES_CODE, BENCHMARK_CODE, FREQUENCY, WINDOW, HISTORY_DATE | SERIES_CODE, HISTORY_DATE |
+| FX_RATES                         | CURRENCY_CODE, HISTORY_DATE                     | CURRENCY_CODE, HISTORY_DATE  |
+
+Usage:
+    from snowflake.schema_registry import get_table_schema, read_table_csv
+
+    print(get_table_schema("BENCHMARK_PERFORMANCE").create_table_sql())
+    df = read_table_csv("BENCHMARK_PERFORMANCE")
+"""
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from path_helpers import get_csv_path
+
+if TYPE_CHECKING:
+    # The declarations and DDL need no pandas; it is imported by the readers below
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+    sf_type: str = "VARCHAR"
+    nullable: bool = True
+
+    @property
+    def pandas_dtype(self) -> Optional[str]:
+        """dtype for typed reads; None for DATE (parsed separately) and VARCHAR (object or category)."""
+        t = self.sf_type.upper()
+        if t.startswith("NUMBER"):
+            scale = re.search(r",\s*(\d+)\)", t)
+            if scale and int(scale.group(1)) > 0:
+                return "float64"
+            # Integers are downcast to the smallest type their declared precision fits
+            precision = re.search(r"\((\d+)", t)
+            digits = int(precision.group(1)) if precision else 38
+            return "Int8" if digits <= 2 else "Int16" if digits <= 4 else "Int32" if digits <= 9 else "Int64"
+        if t in ("FLOAT", "DOUBLE"):
+            return "float64"
+        if t == "BOOLEAN":
+            return "boolean"
+        return None
+
+    @property
+    def is_temporal(self) -> bool:
+        return self.sf_type.upper() in ("DATE", "TIMESTAMP_NTZ")
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    name: str
+    columns: Tuple[Column, ...]
+    primary_key: Tuple[str, ...] = ()
+    cluster_by: Tuple[str, ...] = ()
+    file: Optional[str] = None  # CSV produced by the generator scripts
+    categorical: Tuple[str, ...] = ()  # low-cardinality VARCHAR columns read as `category`
+
+    @property
+    def column_names(self) -> List[str]:
+        return [c.name for c in self.columns]
+
+    def column(self, name: str) -> Column:
+        for c in self.columns:
+            if c.name == name.upper():
+                return c
+        raise KeyError(f"{self.name} has no column {name}")
+
+    def create_table_sql(self, table_name: Optional[str] = None, replace: bool = False) -> str:
+        """CREATE TABLE statement with types, NOT NULL, PRIMARY KEY and CLUSTER BY."""
+        lines = [
+            f'"{c.name}" {c.sf_type}{"" if c.nullable else " NOT NULL"}'
+            for c in self.columns
+        ]
+        if self.primary_key:
+            lines.append("PRIMARY KEY (" + ", ".join(f'"{k}"' for k in self.primary_key) + ")")
+        action = "CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"
+        sep = ",\n  "
+        sql = f"{action} {table_name or self.name} (\n  {sep.join(lines)}\n)"
+        if self.cluster_by:
+            sql += " CLUSTER BY (" + ", ".join(f'"{k}"' for k in self.cluster_by) + ")"
+        return sql + ";"
+
+
+def _t(name, columns, primary_key=(), cluster_by=(), file=None, categorical=()) -> TableSchema:
+    cols = tuple(Column(c[0], *c[1:]) for c in columns)
+    return TableSchema(name, cols, tuple(primary_key), tuple(cluster_by), file, tuple(categorical))
+
+
+MONEY = "NUMBER(18,2)"
+
+TABLE_SCHEMAS: Dict[str, TableSchema] = {s.name: s for s in [
+    _t("ACCOUNTS", [
+        ("ACCOUNT ID", "VARCHAR", False), ("INVESTOR TYPE",), ("ACCOUNT NAME",), ("TYPE",),
+        ("COUNTRY",), ("ACCOUNT CURRENCY",), ("CURRENCY NAME",), ("FX TO USD", "NUMBER(18,6)"),
+        ("COMMITTED CAPITAL (LOCAL)", MONEY), ("COMMITTED CAPITAL (USD)", MONEY),
+        ("NUMBER OF FUNDS", "NUMBER(9,0)"), ("NAV (USD)", MONEY), ("START DATE", "DATE"),
+    ], ["ACCOUNT ID"], file="accounts.csv",
+        categorical=["INVESTOR TYPE", "TYPE", "COUNTRY", "ACCOUNT CURRENCY", "CURRENCY NAME"]),
+    _t("PORTFOLIO_GENERAL_INFO", [
+        ("PORTFOLIOCODE", "VARCHAR", False), ("FIRM_NAME",), ("FUND_NAME",), ("STRATEGY",),
+        ("VINTAGE_YEAR", "NUMBER(4,0)"), ("CLOSE_DATE", "DATE"), ("FUND_SIZE_MILLIONS", MONEY),
+        ("FUND_LOCATION",), ("COUNTRY",), ("BASECURRENCYCODE",), ("PRODUCTCODE",),
+        ("PORTFOLIOCATEGORY",), ("STRATEGY_ABBR",), ("REGION_BLOCK",),
+    ], ["PORTFOLIOCODE"], file="portfolio_general_info.csv",
+        categorical=["FIRM_NAME", "STRATEGY", "FUND_LOCATION", "COUNTRY", "BASECURRENCYCODE",
+                     "PORTFOLIOCATEGORY", "STRATEGY_ABBR", "REGION_BLOCK"]),
+    _t("PORTFOLIO_ACCOUNT_MAP", [
+        ("PORTFOLIOCODE", "VARCHAR", False), ("ACCOUNTID", "VARCHAR", False),
+    ], ["PORTFOLIOCODE", "ACCOUNTID"], file="portfolio_account_map.csv"),
+    _t("PRODUCT_MASTER", [
+        ("PRODUCTCODE", "VARCHAR", False), ("PRODUCTNAME",), ("STRATEGY",), ("VEHICLECATEGORY",),
+        ("VEHICLETYPE",), ("ASSETCLASS",), ("SHARECLASS",), ("REGION_BLOCK",),
+    ], ["PRODUCTCODE"], file="product_master.csv",
+        categorical=["STRATEGY", "VEHICLECATEGORY", "VEHICLETYPE", "ASSETCLASS", "SHARECLASS",
+                     "REGION_BLOCK"]),
+    _t("FUND_MANAGERS", [
+        ("FUNDID", "VARCHAR", False), ("MANAGERID", "VARCHAR", False), ("MANAGERNAME",),
+        ("POSITION",), ("RANK", "NUMBER(3,0)"), ("YEARSONFUND", "NUMBER(3,0)"),
+        ("YEARSEXPERIENCE", "NUMBER(3,0)"),
+    ], ["FUNDID", "MANAGERID"], file="fund_managers.csv", categorical=["POSITION"]),
+    _t("HOLDINGS", [
+        ("PORTFOLIOCODE", "VARCHAR", False), ("CURRENCYCODE",), ("CURRENCY",),
+        ("TICKER", "VARCHAR", False), ("ISSUENAME",), ("ISSUEDISPLAYNAME",), ("ASSETCLASSNAME",),
+        ("PRIMARYSECTORNAME",), ("PRIMARYINDUSTRYNAME",), ("PRIMARYINDUSTRYCODE", "NUMBER(8,0)"),
+        ("RISKCOUNTRYCODE",), ("RISKCOUNTRY",), ("REGIONNAME",),
+    ], ["TICKER"], ["PORTFOLIOCODE"], file="holdings.csv",
+        categorical=["CURRENCYCODE", "CURRENCY", "ASSETCLASSNAME", "PRIMARYSECTORNAME",
+                     "PRIMARYINDUSTRYNAME", "RISKCOUNTRYCODE", "RISKCOUNTRY", "REGIONNAME"]),
+    _t("HOLDINGS_METRICS", [
+        ("TICKER", "VARCHAR", False), ("INVESTMENT_DATE", "DATE"), ("INVESTMENT_AMOUNT", MONEY),
+        ("DISTRIBUTION_DATES",), ("DISTRIBUTION_AMOUNTS",), ("VALUATION_DATE", "DATE"),
+        ("CURRENT_NAV", MONEY), ("IRR", "FLOAT"), ("MOIC", "FLOAT"), ("DPI", "FLOAT"),
+        ("TVPI", "FLOAT"),
+    ], ["TICKER"], file="holdings_metrics.csv"),
+    _t("EXITS", [
+        ("PORTFOLIOCODE", "VARCHAR", False), ("TICKER", "VARCHAR", False), ("COMPANY",),
+        ("EXITTYPE",), ("ACQUIRERTYPE",), ("MOIC", "FLOAT"),
+        ("EXITVALUE_MILLION_USD", MONEY), ("EXITDATE", "DATE"),
+    ], ["TICKER"], ["EXITDATE"], file="exits.csv", categorical=["EXITTYPE", "ACQUIRERTYPE"]),
+    _t("BENCHMARK_GENERAL", [
+        ("BENCHMARK_CODE", "VARCHAR", False), ("BENCHMARK_NAME",),
+    ], ["BENCHMARK_CODE"], file="benchmark_general.csv"),
+    _t("BENCHMARK_CHARACTERISTICS", [
+        ("BENCHMARK_CODE", "VARCHAR", False), ("INCEPTION_YEAR", "NUMBER(4,0)"),
+        ("CURRENCY_CODE",), ("CURRENCY",), ("CATEGORY",), ("CATEGORY_NAME",),
+        ("CHARACTERISTIC_NAME", "VARCHAR", False), ("STATISTIC_TYPE",), ("UNIT",),
+        ("CHARACTERISTIC_VALUE", "NUMBER(18,4)"), ("HISTORY_DATE", "DATE", False),
+    ], ["BENCHMARK_CODE", "CHARACTERISTIC_NAME", "HISTORY_DATE"], ["BENCHMARK_CODE"],
+        file="benchmark_characteristics.csv",
+        categorical=["CURRENCY_CODE", "CURRENCY", "CATEGORY", "CATEGORY_NAME", "STATISTIC_TYPE", "UNIT"]),
+    _t("BENCHMARK_PERFORMANCE", [
+        ("BENCHMARK_CODE", "VARCHAR", False), ("PERFORMANCE_DATA_TYPE",), ("CURRENCY_CODE",),
+        ("CURRENCY",), ("PERFORMANCE_FREQUENCY",), ("VALUE", "NUMBER(18,6)"),
+        ("HISTORY_DATE", "DATE", False),
+    ], ["BENCHMARK_CODE", "HISTORY_DATE"], ["BENCHMARK_CODE", "HISTORY_DATE"],
+        file="benchmark_performance.csv",
+        categorical=["PERFORMANCE_DATA_TYPE", "CURRENCY_CODE", "CURRENCY", "PERFORMANCE_FREQUENCY"]),
+    _t("BENCHMARK_ACCOUNT_ASSOCIATION", [
+        ("ACCOUNT_ID", "VARCHAR", False), ("BENCHMARK_CODE", "VARCHAR", False),
+        ("RANK", "NUMBER(3,0)"),
+    ], ["ACCOUNT_ID", "BENCHMARK_CODE"], file="benchmark_account_association.csv"),
+    _t("BENCHMARK_COMPOSITE_PERFORMANCE", [
+        ("COMPOSITE_CODE", "VARCHAR", False), ("HISTORY_DATE", "DATE", False),
+        ("RETURN", "FLOAT"), ("VALUE", "FLOAT"),
+    ], ["COMPOSITE_CODE", "HISTORY_DATE"], ["COMPOSITE_CODE", "HISTORY_DATE"],
+        file="benchmark_composite_performance.csv"),
+    _t("BENCHMARK_COMPOSITE_ACCOUNT_MAP", [
+        ("ACCOUNT_ID", "VARCHAR", False), ("COMPOSITE_CODE", "VARCHAR", False),
+        ("BENCHMARK_CODE", "VARCHAR", False), ("RANK", "NUMBER(3,0)"), ("WEIGHT", "FLOAT"),
+    ], ["ACCOUNT_ID", "BENCHMARK_CODE"], file="benchmark_composite_account_map.csv"),
+    _t("BENCHMARK_RISK", [
+        ("SERIES_CODE", "VARCHAR", False), ("BENCHMARK_CODE", "VARCHAR", False),
+        ("FREQUENCY", "VARCHAR", False),
+        ("WINDOW", "NUMBER(5,0)", False), ("HISTORY_DATE", "DATE", False),
+        ("VOLATILITY", "FLOAT"), ("MAX_DRAWDOWN", "FLOAT"), ("BETA", "FLOAT"),
+        ("TRACKING_ERROR", "FLOAT"),
+    ], ["SERIES_CODE", "BENCHMARK_CODE", "FREQUENCY", "WINDOW", "HISTORY_DATE"],
+        ["SERIES_CODE", "HISTORY_DATE"], file="benchmark_risk.csv"),
+    _t("FX_RATES", [
+        ("CURRENCY_CODE", "VARCHAR", False), ("HISTORY_DATE", "DATE", False),
+        ("RATE_TO_USD", "NUMBER(18,6)", False),
+    ], ["CURRENCY_CODE", "HISTORY_DATE"], ["CURRENCY_CODE", "HISTORY_DATE"], file="fx_rates.csv",
+        categorical=["CURRENCY_CODE"]),
+]}
+
+
+# (child table, child columns, parent table, parent columns)
+FOREIGN_KEYS: List[Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]] = [
+    ("PORTFOLIO_GENERAL_INFO",          ("PRODUCTCODE",),    "PRODUCT_MASTER",         ("PRODUCTCODE",)),
+    ("PORTFOLIO_ACCOUNT_MAP",           ("PORTFOLIOCODE",),  "PORTFOLIO_GENERAL_INFO", ("PORTFOLIOCODE",)),
+    ("PORTFOLIO_ACCOUNT_MAP",           ("ACCOUNTID",),      "ACCOUNTS",               ("ACCOUNT ID",)),
+    ("FUND_MANAGERS",                   ("FUNDID",),         "PORTFOLIO_GENERAL_INFO", ("PORTFOLIOCODE",)),
+    ("HOLDINGS",                        ("PORTFOLIOCODE",),  "PORTFOLIO_GENERAL_INFO", ("PORTFOLIOCODE",)),
+    ("HOLDINGS_METRICS",                ("TICKER",),         "HOLDINGS",               ("TICKER",)),
+    ("EXITS",                           ("TICKER",),         "HOLDINGS",               ("TICKER",)),
+    ("EXITS",                           ("PORTFOLIOCODE",),  "PORTFOLIO_GENERAL_INFO", ("PORTFOLIOCODE",)),
+    ("BENCHMARK_CHARACTERISTICS",       ("BENCHMARK_CODE",), "BENCHMARK_GENERAL",      ("BENCHMARK_CODE",)),
+    ("BENCHMARK_PERFORMANCE",           ("BENCHMARK_CODE",), "BENCHMARK_GENERAL",      ("BENCHMARK_CODE",)),
+    ("BENCHMARK_ACCOUNT_ASSOCIATION",   ("ACCOUNT_ID",),     "ACCOUNTS",               ("ACCOUNT ID",)),
+    ("BENCHMARK_ACCOUNT_ASSOCIATION",   ("BENCHMARK_CODE",), "BENCHMARK_GENERAL",      ("BENCHMARK_CODE",)),
+    ("BENCHMARK_COMPOSITE_ACCOUNT_MAP", ("ACCOUNT_ID",),     "ACCOUNTS",               ("ACCOUNT ID",)),
+    ("BENCHMARK_COMPOSITE_ACCOUNT_MAP", ("BENCHMARK_CODE",), "BENCHMARK_GENERAL",      ("BENCHMARK_CODE",)),
+    ("BENCHMARK_RISK",                  ("BENCHMARK_CODE",), "BENCHMARK_GENERAL",      ("BENCHMARK_CODE",)),
+]
+
+# (child table, column): value meaning "no parent row". Primary key columns are
+# NOT NULL in Snowflake and NULL never matches in MERGE ... ON, so rows without
+# a parent (e.g. single-series risk statistics) use this instead of NULL.
+NO_PARENT: Dict[Tuple[str, str], str] = {
+    ("BENCHMARK_RISK", "BENCHMARK_CODE"): "NONE",
+}
+
+# Join-key domain: (owning table, key column). Every foreign key into the owner
+# belongs to the same domain.
+KEY_DOMAINS: Dict[str, Tuple[str, str]] = {
+    "FUND":      ("PORTFOLIO_GENERAL_INFO", "PORTFOLIOCODE"),
+    "ACCOUNT":   ("ACCOUNTS", "ACCOUNT ID"),
+    "COMPANY":   ("HOLDINGS", "TICKER"),
+    "BENCHMARK": ("BENCHMARK_GENERAL", "BENCHMARK_CODE"),
+    "PRODUCT":   ("PRODUCT_MASTER", "PRODUCTCODE"),
+}
+
+
+def key_columns(table_name: str) -> Dict[str, str]:
+    """Key columns of `table_name` that belong to a KEY_DOMAINS domain: column -> domain."""
+    table = table_name.upper()
+    owners = {owner: domain for domain, owner in KEY_DOMAINS.items()}
+    found = {column: domain for (owner, column), domain in owners.items() if owner == table}
+    for child, cols, parent, parent_cols in FOREIGN_KEYS:
+        if child == table and len(cols) == 1 and (parent, parent_cols[0]) in owners:
+            found[cols[0]] = owners[(parent, parent_cols[0])]
+    return found
+
+
+def get_table_schema(table_name: str) -> Optional[TableSchema]:
+    """Registered schema for `table_name` (case-insensitive), or None."""
+    return TABLE_SCHEMAS.get(table_name.upper())
+
+
+def coerce_frame(df: "pd.DataFrame", schema: TableSchema) -> "pd.DataFrame":
+    """
+    Cast the registered columns of `df` to their declared types (DATE ->
+    datetime64, NUMBER(3,0) -> Int16, categorical -> category, ...). Column names may use any case;
+    unregistered columns are left alone. Returns a new frame.
+    """
+    import pandas as pd
+
+    casts = {}
+    for name in df.columns:
+        try:
+            col = schema.column(str(name))
+        except KeyError:
+            continue
+        if col.is_temporal:
+            casts[name] = pd.to_datetime(df[name], errors="coerce")
+        elif col.name in schema.categorical:
+            casts[name] = df[name].astype("category")
+        elif col.pandas_dtype is not None and col.pandas_dtype.startswith("Int"):
+            casts[name] = pd.to_numeric(df[name], errors="coerce").round().astype(col.pandas_dtype)
+        elif col.pandas_dtype is not None:
+            casts[name] = pd.to_numeric(df[name], errors="coerce").astype(col.pandas_dtype)
+    return df.assign(**casts) if casts else df
+
+
+def read_table_csv(table_name: str, path: Optional[str] = None,
+                   columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    """
+    Read a generated CSV with the registry's types applied at parse time.
+
+    Parameters:
+        table_name: registered table, e.g. "BENCHMARK_PERFORMANCE"
+        path: CSV path (defaults to CSVs/<registered file>)
+        columns: optional subset of columns to read (case-insensitive)
+
+    Returns:
+        pd.DataFrame with the CSV's original column names
+    """
+    import pandas as pd
+
+    schema = get_table_schema(table_name)
+    if schema is None:
+        raise KeyError(f"No registered schema for {table_name}.")
+    path = path or get_csv_path(schema.file)
+
+    header = pd.read_csv(path, nrows=0).columns
+    wanted = {c.upper() for c in columns} if columns else None
+    usecols = [h for h in header if wanted is None or h.upper() in wanted]
+
+    dtypes, dates = {}, []
+    for h in usecols:
+        try:
+            col = schema.column(h)
+        except KeyError:
+            continue
+        if col.is_temporal:
+            dates.append(h)
+        elif col.name in schema.categorical:
+            dtypes[h] = "category"
+        elif col.pandas_dtype is not None:
+            dtypes[h] = col.pandas_dtype
+    return pd.read_csv(path, usecols=usecols, dtype=dtypes, parse_dates=dates)
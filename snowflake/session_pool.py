@@ -0,0 +1,200 @@
+"""
+Shared pool of authenticated Snowpark sessions.
+
+Every helper used to call `load_dotenv()` and build a brand-new `Session`
+(one authentication handshake per call). This module reads the connection
+settings once and hands out sessions from a small pool instead:
+
+- pooled_session(): context manager that borrows a session and returns it
+- get_pool(): the process-wide SessionPool (created on first use)
+- close_pool(): closes every pooled session (also registered with atexit)
+- SessionPool.stats(): sessions created plus per-connection setup timings
+- create_session(): one new session for the configured backend
+
+The backend is chosen with WAREHOUSE_BACKEND: `snowflake` (default) or
+`local`, an embedded database with the same API (see `local_warehouse.py`).
+
+Usage:
+    from snowflake.session_pool import pooled_session
+
+    with pooled_session() as session:
+        session.sql("SELECT 1").collect()
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from dotenv import load_dotenv
+
+DEFAULT_POOL_SIZE = int(os.getenv("SNOWFLAKE_POOL_SIZE", "4"))
+WAREHOUSE_BACKEND = os.getenv("WAREHOUSE_BACKEND", "snowflake").lower()
+
+_params_lock = threading.Lock()
+_connection_params: Optional[Dict[str, str]] = None
+
+
+def get_connection_params() -> Dict[str, str]:
+    """Read the Snowflake settings from .env once per process."""
+    global _connection_params
+    with _params_lock:
+        if _connection_params is None:
+            load_dotenv()
+            cfg = {
+                "user": os.getenv("SNOWFLAKE_USER"),
+                "password": os.getenv("SNOWFLAKE_PASSWORD"),
+                "account": os.getenv("SNOWFLAKE_ACCOUNT"),
+                "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
+                "database": os.getenv("SNOWFLAKE_DATABASE"),
+                "schema": os.getenv("SNOWFLAKE_SCHEMA"),
+            }
+            missing = [k for k, v in cfg.items() if v in (None, "")]
+            if missing:
+                raise ValueError(f"Missing Snowflake env vars: {', '.join(missing)}")
+            role = os.getenv("SNOWFLAKE_ROLE")
+            if role:
+                cfg["role"] = role
+            _connection_params = cfg
+        return dict(_connection_params)
+
+
+def create_snowflake_session():
+    """Open a new authenticated Snowpark session (one handshake)."""
+    from snowflake.snowpark import Session
+    return Session.builder.configs(get_connection_params()).create()
+
+
+def create_session():
+    """Open a new session for the backend selected by WAREHOUSE_BACKEND."""
+    if WAREHOUSE_BACKEND == "local":
+        from snowflake.local_warehouse import LocalSession
+        return LocalSession()
+    if WAREHOUSE_BACKEND == "snowflake":
+        return create_snowflake_session()
+    raise ValueError(f"Unknown WAREHOUSE_BACKEND: {WAREHOUSE_BACKEND}")
+
+
+class SessionPool:
+    """
+    Bounded pool of reusable sessions. At most `max_size` sessions exist at
+    once; `acquire` blocks until one is free.
+    """
+
+    def __init__(self, factory: Callable = create_session, max_size: int = DEFAULT_POOL_SIZE):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self._factory = factory
+        self.max_size = max_size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._all: List[object] = []
+        self._closed = False
+        self.setup_timings: List[float] = []
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a session, creating one if none is idle and the pool has room."""
+        if self._closed:
+            raise RuntimeError("Session pool is closed.")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No Snowflake session available within {timeout}s.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            start = time.perf_counter()
+            session = self._factory()
+            elapsed = time.perf_counter() - start
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._all.append(session)
+            self.setup_timings.append(elapsed)
+        return session
+
+    def release(self, session, discard: bool = False) -> None:
+        """Return a borrowed session; `discard=True` closes it instead (e.g. after a connection error)."""
+        try:
+            if discard or self._closed:
+                self._close_one(session)
+            else:
+                self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """Borrow a session for a `with` block; if the block raises, the session is discarded, not reused."""
+        s = self.acquire(timeout=timeout)
+        try:
+            yield s
+        except BaseException:
+            # A dropped connection or expired token must not reach the next caller
+            self.release(s, discard=True)
+            raise
+        self.release(s)
+
+    def _close_one(self, session) -> None:
+        with self._lock:
+            if session in self._all:
+                self._all.remove(session)
+        try:
+            session.close()
+        except Exception as e:
+            print(f"[WARNING] Failed to close Snowflake session: {e}")
+
+    def close(self) -> None:
+        """Close every idle session; sessions still borrowed close on release."""
+        self._closed = True
+        while True:
+            try:
+                self._close_one(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            timings = list(self.setup_timings)
+            open_sessions = len(self._all)
+        return {
+            "sessions_created": len(timings),
+            "sessions_open": open_sessions,
+            "sessions_idle": self._idle.qsize(),
+            "setup_seconds": [round(t, 4) for t in timings],
+            "total_setup_seconds": round(sum(timings), 4),
+        }
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SessionPool:
+    """Process-wide pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = SessionPool()
+        return _pool
+
+
+@contextmanager
+def pooled_session(timeout: Optional[float] = None):
+    """Borrow a session from the shared pool for the duration of a `with` block."""
+    with get_pool().session(timeout=timeout) as session:
+        yield session
+
+
+def close_pool() -> None:
+    """Close the shared pool's sessions deterministically."""
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+
+
+atexit.register(close_pool)
@@ -2,44 +2,46 @@
 Snowflake table creation and append utilities for CSV/DataFrame ingestion.
 
 This module provides:
-- get_session(): create a Snowpark session from .env variables
+- get_session(): create a session from .env variables (Snowpark, or the local
+  warehouse when WAREHOUSE_BACKEND=local)
+- pooled_session() (from session_pool): borrow a reusable session from the shared pool
 - create_table_from_df(session, df, table_name, replace=False): create table using df schema
 - append_df_to_table(session, df, table_name): append rows; fill missing cols with NULL; drop extras
+- invalidate_schema_cache(table_name=None): forget cached column lists (done automatically on DDL)
 
 Conventions:
 - Column names are normalized to UPPERCASE when writing to Snowflake
+- Tables declared in `schema_registry.py` are created with their registered
+  types (DATE, NUMBER(p,s)), keys and clustering; otherwise types are inferred:
 - VARCHAR is used for pandas 'object'/'string' dtypes
 - TIMESTAMP_NTZ is used for datetime64[ns]
+- Table column lists are cached per process after the first DESCRIBE TABLE;
+  `create_table_from_df` invalidates the entry for the table it touches
 
 Environment Variables required:
 SNOWFLAKE_USER, SNOWFLAKE_PASSWORD, SNOWFLAKE_ACCOUNT, SNOWFLAKE_WAREHOUSE,
 SNOWFLAKE_DATABASE, SNOWFLAKE_SCHEMA, (optional) SNOWFLAKE_ROLE
 """
 
-import os
-from typing import List, Dict
+import threading
+from typing import TYPE_CHECKING, List, Dict, Optional
 import pandas as pd
-from dotenv import load_dotenv
-from snowflake.snowpark import Session
+from snowflake.schema_registry import get_table_schema
+from snowflake.session_pool import create_session, pooled_session
+from instrument import instrumented
+
+if TYPE_CHECKING:
+    # Only needed for annotations; a local warehouse (WAREHOUSE_BACKEND=local) runs without Snowpark
+    from snowflake.snowpark import Session
 
 # ---------------- Connection ----------------
-def get_session() -> Session:
-    load_dotenv()
-    cfg = {
-        "user": os.getenv("SNOWFLAKE_USER"),
-        "password": os.getenv("SNOWFLAKE_PASSWORD"),
-        "account": os.getenv("SNOWFLAKE_ACCOUNT"),
-        "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
-        "database": os.getenv("SNOWFLAKE_DATABASE"),
-        "schema": os.getenv("SNOWFLAKE_SCHEMA"),
-    }
-    role = os.getenv("SNOWFLAKE_ROLE")
-    if role:
-        cfg["role"] = role
-    missing = [k for k, v in cfg.items() if v in (None, "")]
-    if missing:
-        raise ValueError(f"Missing Snowflake env vars: {', '.join(missing)}")
-    return Session.builder.configs(cfg).create()
+def get_session() -> "Session":
+    """
+    Open a dedicated session (caller closes it). Connection settings are read
+    from .env once per process; prefer `session_pool.pooled_session()` to
+    reuse authenticated sessions across helpers. Honours WAREHOUSE_BACKEND.
+    """
+    return create_session()
 
 # --------------- DDL helpers ----------------
 _PANDAS_TO_SF = {
@@ -57,6 +59,10 @@ def _infer_sf_type(dtype) -> str:
     return _PANDAS_TO_SF.get(str(dtype), "VARCHAR")
 
 def _build_create_table_sql(df: pd.DataFrame, table_name: str, replace: bool) -> str:
+    # Registered tables get their declared types, keys and clustering
+    schema = get_table_schema(table_name)
+    if schema is not None:
+        return schema.create_table_sql(table_name, replace)
     if df.empty:
         raise ValueError("DataFrame is empty; cannot infer schema.")
     cols_sql = []
@@ -68,7 +74,7 @@ def _build_create_table_sql(df: pd.DataFrame, table_name: str, replace: bool) ->
     cols_block = sep.join(cols_sql)
     return f"{action} {table_name} (\n  {cols_block}\n);"
 
-def _get_table_columns(session: Session, table_name: str) -> List[str]:
+def _describe_table_columns(session: "Session", table_name: str) -> List[str]:
     # Robust access for Snowpark Row
     rows = session.sql(f'DESCRIBE TABLE {table_name}').collect()
     cols = []
@@ -87,13 +93,54 @@ def _get_table_columns(session: Session, table_name: str) -> List[str]:
         raise ValueError(f"Could not read columns for table {table_name}.")
     return cols
 
+# --------------- Schema cache ----------------
+# All sessions in a process share one database/schema (see session_pool), so
+# entries are keyed by the uppercase table name.
+_SCHEMA_CACHE: Dict[str, List[str]] = {}
+_schema_lock = threading.Lock()
+
+def invalidate_schema_cache(table_name: Optional[str] = None) -> None:
+    """Drop the cached columns of `table_name` (or of every table)."""
+    with _schema_lock:
+        if table_name is None:
+            _SCHEMA_CACHE.clear()
+        else:
+            _SCHEMA_CACHE.pop(table_name.upper(), None)
+
+def _get_table_columns(session: "Session", table_name: str, refresh: bool = False) -> List[str]:
+    """Table columns in order; DESCRIBE TABLE runs only on a cache miss."""
+    key = table_name.upper()
+    with _schema_lock:
+        cols = None if refresh else _SCHEMA_CACHE.get(key)
+    if cols is None:
+        cols = _describe_table_columns(session, table_name)
+        with _schema_lock:
+            _SCHEMA_CACHE[key] = cols
+    return list(cols)
+
+def _align_to_table(df: pd.DataFrame, table_cols: List[str]) -> pd.DataFrame:
+    """
+    Upload frame in table column order with uppercase names. Existing columns
+    are referenced, not copied, and `df` itself is never modified.
+    """
+    df_cols_upper: Dict[str, str] = {str(c).upper(): c for c in df.columns}
+    data = {
+        col: df[df_cols_upper[col]] if col in df_cols_upper
+        else pd.Series(None, index=df.index, dtype="object")
+        for col in table_cols
+    }
+    return pd.DataFrame(data, index=df.index, copy=False)
+
 # --------------- Public API -----------------
-def create_table_from_df(session: Session, df: pd.DataFrame, table_name: str, replace: bool = False) -> None:
+@instrumented()
+def create_table_from_df(session: "Session", df: pd.DataFrame, table_name: str, replace: bool = False) -> None:
     ddl = _build_create_table_sql(df, table_name, replace)
+    invalidate_schema_cache(table_name)
     session.sql(ddl).collect()
     print(f"Table ready: {table_name} (replace={replace})")
 
-def append_df_to_table(session: Session, df: pd.DataFrame, table_name: str) -> None:
+@instrumented()
+def append_df_to_table(session: "Session", df: pd.DataFrame, table_name: str) -> None:
     """
     Append df to table. If table does not exist, create it.
     - Missing columns in df -> filled with NULL
@@ -114,32 +161,24 @@ def append_df_to_table(session: Session, df: pd.DataFrame, table_name: str) -> N
         table_cols = _get_table_columns(session, table_name)
         created = True
 
-    # Map current df columns to uppercase
-    df_cols_upper: Dict[str, str] = {c.upper(): c for c in df.columns}
-
-    # Add any missing table columns as None
-    for col in table_cols:
-        if col not in df_cols_upper:
-            df[col] = None
-            df_cols_upper[col] = col  # now present
+    # Missing columns -> NULL, extras dropped, order aligned; caller's df untouched
+    df_aligned = _align_to_table(df, table_cols)
 
-    # Keep only table columns and in correct order
-    ordered = [df_cols_upper[c] for c in table_cols]
-    df_aligned = df[ordered].copy()
-    df_aligned.columns = [c.upper() for c in df_aligned.columns]
-
-    # Append
-    session.create_dataframe(df_aligned).write.mode("append").save_as_table(table_name)
+    # Append; a failure may mean the table changed underneath the cache
+    try:
+        session.create_dataframe(df_aligned).write.mode("append").save_as_table(table_name)
+    except Exception:
+        invalidate_schema_cache(table_name)
+        raise
     print(f"{'Created and ' if created else ''}appended {len(df_aligned)} rows to {table_name}.")
 
 
 if __name__ == "__main__":
-    session = get_session()
     df = pd.read_csv("CSVs/df_benchmark_account_association.csv")
 
-    # Create new table if needed
-    create_table_from_df(session, df, "BENCHMARK_ACCOUNT_ASSOCIATION")
+    with pooled_session() as session:
+        # Create new table if needed
+        create_table_from_df(session, df, "BENCHMARK_ACCOUNT_ASSOCIATION")
 
-    # Append new data (missing columns will be NULL)
-    # append_df_to_table(session, df, "PORTFOLIO_GENERAL_INFO")
-    session.close()
\ No newline at end of file
+        # Append new data (missing columns will be NULL)
+        # append_df_to_table(session, df, "PORTFOLIO_GENERAL_INFO")
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Change-detected MERGE upserts keyed on each table's natural key.
+
+`create_initial_snowflake_tables` rewrites whole tables and
+`append_df_to_table` blindly appends, so every daily refresh either moves
+the full table or creates duplicates. An upsert instead:
+
+1. Hashes every row locally (`pd.util.hash_pandas_object`, vectorized) into
+   a KEY_HASH over the natural key and a ROW_HASH over all columns.
+2. Compares the hashes with the manifest written by the previous upsert
+   (`.upsert_state/<TABLE>.parquet`) — only new keys and changed rows are
+   kept.
+3. Bulk loads just those rows into a staging table unique to this call,
+   `<TABLE>_STAGING_<id>` (see `bulk_load.py`), so concurrent upserts of
+   one table never share staging data.
+4. Applies one `MERGE INTO <TABLE> USING <staging>`. The staging table is
+   dropped even when the load or MERGE fails; the manifest is updated only
+   after the MERGE succeeds.
+
+The manifest is local, so it records the warehouse table's version
+(`backend.table_version`: creation and last-change time in Snowflake) as of
+its MERGE. If the table has since been recreated (e.g. by
+`create_initial_snowflake_tables`) or changed by another writer, the
+versions differ and the manifest is ignored: every row is shipped, and the
+MERGE makes that safe.
+
+Keys that disappear from the source are reported but not deleted.
+
+Usage:
+    from snowflake.bulk_load import SnowflakeStageBackend
+    from snowflake.upsert import upsert_df
+
+    upsert_df(SnowflakeStageBackend(session), df, "BENCHMARK_PERFORMANCE")
+"""
+
+import json
+import os
+import shutil
+import uuid
+from typing import Dict, List, Optional
+import pandas as pd
+from snowflake.bulk_load import LocalStageBackend, bulk_load_table
+from snowflake.schema_registry import TABLE_SCHEMAS, coerce_frame, get_table_schema
+from instrument import annotate, instrumented, record_rows
+
+# Natural key of every table the project produces (declared in schema_registry.py)
+NATURAL_KEYS: Dict[str, List[str]] = {
+    name: list(schema.primary_key) for name, schema in TABLE_SCHEMAS.items()
+}
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".upsert_state")
+
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def row_hashes(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """KEY_HASH (natural key) and ROW_HASH (all columns) per row as uint64."""
+    return pd.DataFrame({
+        "KEY_HASH": pd.util.hash_pandas_object(df[keys], index=False).to_numpy(),
+        "ROW_HASH": pd.util.hash_pandas_object(df, index=False).to_numpy(),
+    })
+
+
+def detect_changes(df: pd.DataFrame, keys: List[str], previous: Optional[pd.DataFrame]):
+    """
+    Split `df` against the previous manifest.
+
+    Returns:
+        (changed rows, new manifest, counts dict with new/changed/unchanged/absent)
+    """
+    hashes = row_hashes(df, keys)
+    if hashes["KEY_HASH"].duplicated().any():
+        raise ValueError(f"Duplicate natural keys {keys} in source rows.")
+
+    if previous is None or previous.empty:
+        is_new = pd.Series(True, index=df.index)
+        is_changed = pd.Series(False, index=df.index)
+        absent = 0
+    else:
+        prior = pd.Series(previous["ROW_HASH"].to_numpy(), index=previous["KEY_HASH"].to_numpy())
+        prior_row = hashes["KEY_HASH"].map(prior)
+        is_new = pd.Series(prior_row.isna().to_numpy(), index=df.index)
+        is_changed = pd.Series((~prior_row.isna() & (prior_row != hashes["ROW_HASH"])).to_numpy(), index=df.index)
+        absent = int((~previous["KEY_HASH"].isin(hashes["KEY_HASH"])).sum())
+
+    counts = {
+        "new": int(is_new.sum()),
+        "changed": int(is_changed.sum()),
+        "unchanged": int(len(df) - is_new.sum() - is_changed.sum()),
+        "absent": absent,
+    }
+    return df[(is_new | is_changed).to_numpy()], hashes, counts
+
+
+def build_merge_sql(table_name: str, staging_name: str, keys: List[str], columns: List[str]) -> str:
+    """MERGE statement updating matched keys and inserting new ones."""
+    on = " AND ".join(f"T.{_quote(k)} = S.{_quote(k)}" for k in keys)
+    updates = ", ".join(f"T.{_quote(c)} = S.{_quote(c)}" for c in columns if c not in keys)
+    cols = ", ".join(_quote(c) for c in columns)
+    vals = ", ".join(f"S.{_quote(c)}" for c in columns)
+    matched = f"WHEN MATCHED THEN UPDATE SET {updates}\n" if updates else ""
+    return (
+        f"MERGE INTO {table_name} T USING {staging_name} S\n"
+        f"ON {on}\n"
+        f"{matched}"
+        f"WHEN NOT MATCHED THEN INSERT ({cols}) VALUES ({vals})"
+    )
+
+
+def _merge_local(backend: LocalStageBackend, table_name: str, staging_name: str, keys: List[str]) -> None:
+    """Pandas equivalent of the MERGE for the offline stand-in backend."""
+    target = backend.read_table(table_name)
+    staged = backend.read_table(staging_name)
+    staged = staged[target.columns]
+    schema = get_table_schema(table_name)
+    if schema is not None:
+        # The staging table is unregistered, so its key columns are untyped (e.g. dates as text)
+        staged = coerce_frame(staged, schema)
+    if not target.empty:
+        staged = pd.concat([target, staged], ignore_index=True).drop_duplicates(subset=keys, keep="last")
+    merged = staged
+    backend.create_table(merged, table_name, replace=True)
+    bulk_load_table(backend, merged, table_name, replace=False)
+
+
+def _drop_staging(backend, staging_name: str) -> None:
+    """Drop a staging table; a failure is reported, not raised, so it never hides the load's own error."""
+    try:
+        if isinstance(backend, LocalStageBackend):
+            shutil.rmtree(os.path.join(backend.tables_dir, staging_name), ignore_errors=True)
+        else:
+            from snowflake.snowflake_comp_test import invalidate_schema_cache
+            backend.session.sql(f"DROP TABLE IF EXISTS {staging_name}").collect()
+            invalidate_schema_cache(staging_name)
+    except Exception as e:
+        print(f"[WARNING] Could not drop staging table {staging_name}: {e}")
+
+
+def _read_manifest(state_path: str, table_version: Optional[str]) -> Optional[pd.DataFrame]:
+    """Previous hashes, or None when there are none or the warehouse table has changed since."""
+    version_path = os.path.splitext(state_path)[0] + ".json"
+    if not (os.path.exists(state_path) and os.path.exists(version_path)):
+        return None
+    with open(version_path, "r") as f:
+        recorded = json.load(f).get("table_version")
+    if table_version is None or recorded != table_version:
+        print(f"[WARNING] {os.path.basename(state_path)} does not match the warehouse table "
+              f"(recreated or changed elsewhere); shipping every row.")
+        return None
+    return pd.read_parquet(state_path)
+
+
+def _write_manifest(state_path: str, hashes: pd.DataFrame, table_version: Optional[str]) -> None:
+    # Write-then-rename, so an interrupted write never leaves a half manifest
+    version_path = os.path.splitext(state_path)[0] + ".json"
+    hashes.to_parquet(state_path + ".tmp", index=False)
+    with open(version_path + ".tmp", "w") as f:
+        json.dump({"table_version": table_version}, f)
+    os.replace(state_path + ".tmp", state_path)
+    os.replace(version_path + ".tmp", version_path)
+
+
+@instrumented()
+def upsert_df(backend, df: pd.DataFrame, table_name: str, keys: Optional[List[str]] = None,
+              state_dir: str = DEFAULT_STATE_DIR) -> Dict[str, object]:
+    """
+    Ship only new/changed rows of `df` and MERGE them into `table_name`.
+
+    Parameters:
+        backend: SnowflakeStageBackend or LocalStageBackend
+        keys: natural key columns; defaults to NATURAL_KEYS[table_name]
+
+    Returns:
+        dict: table, new, changed, unchanged, absent, rows_shipped, bytes
+    """
+    table_name = table_name.upper()
+    annotate(table=table_name)
+    df = df.rename(columns=lambda c: str(c).upper())
+    keys = [k.upper() for k in (keys or NATURAL_KEYS.get(table_name, []))]
+    if not keys:
+        raise ValueError(f"No natural key declared for {table_name}.")
+    missing = [k for k in keys if k not in df.columns]
+    if missing:
+        raise ValueError(f"Natural key columns missing from DataFrame: {missing}")
+
+    os.makedirs(state_dir, exist_ok=True)
+    state_path = os.path.join(state_dir, f"{table_name}.parquet")
+    previous = _read_manifest(state_path, backend.table_version(table_name))
+
+    changed, hashes, counts = detect_changes(df, keys, previous)
+    result = {"table": table_name, **counts, "rows_shipped": 0, "bytes": 0}
+
+    if not changed.empty:
+        staging_name = f"{table_name}_STAGING_{uuid.uuid4().hex[:12].upper()}"
+        backend.create_table(df, table_name, replace=False)
+        # The staging table is dropped whether or not the load and MERGE succeed
+        try:
+            stats = bulk_load_table(backend, changed, staging_name, replace=True)
+            if isinstance(backend, LocalStageBackend):
+                _merge_local(backend, table_name, staging_name, keys)
+            else:
+                backend.session.sql(build_merge_sql(table_name, staging_name, keys, list(df.columns))).collect()
+        finally:
+            _drop_staging(backend, staging_name)
+        result["rows_shipped"], result["bytes"] = stats["rows"], stats["bytes"]
+        record_rows(rows_out=stats["rows"])
+
+    # Record what the warehouse now holds only after the MERGE succeeded
+    _write_manifest(state_path, hashes, backend.table_version(table_name))
+    print(f"Upserted {table_name}: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged, {counts['absent']} absent from source.")
+    return result
+
+
+def upsert_csv(backend, path: str, table_name: Optional[str] = None,
+               state_dir: str = DEFAULT_STATE_DIR) -> Dict[str, object]:
+    """Upsert a CSV into the table named after the file (or `table_name`)."""
+    table_name = table_name or os.path.splitext(os.path.basename(path))[0].upper()
+    return upsert_df(backend, pd.read_csv(path), table_name, state_dir=state_dir)
+
+
+if __name__ == "__main__":
+    from snowflake.bulk_load import SnowflakeStageBackend
+    from snowflake.session_pool import pooled_session, close_pool
+
+    # Daily refresh of the fast-moving tables
+    with pooled_session() as session:
+        backend = SnowflakeStageBackend(session)
+        for name in ["benchmark_performance.csv", "holdings_metrics.csv"]:
+            upsert_csv(backend, os.path.join("CSVs", name))
+    close_pool()
@@ -0,0 +1,226 @@
+"""
+table_io.py
+
+Typed, columnar table I/O built on top of path_helpers.
+
+Every generated table is written as a compressed Parquet file next to its CSV
+(`CSVs/<table>.parquet`). The CSV export is kept for Snowflake uploads and
+for anyone opening the files by hand, but readers use the Parquet copy:
+
+- Types survive the round trip (dates, integers, list columns such as
+  DISTRIBUTION_DATES); registered tables are cast with `schema_registry`
+- Column projection: only the requested columns are decoded
+- Predicate pushdown: files are sorted by the table's clustering keys and
+  written in row groups with min/max statistics, so `filters` skip whole
+  row groups instead of parsing them
+- Integer join keys: the Parquet copy also holds the `<DOMAIN>_SK` surrogate
+  key of every join key (`dtype_policy.py`). They are returned only when
+  asked for by name, e.g. columns=['COMPANY_SK', 'FUND_SK']
+
+If a CSV is newer than its Parquet copy (e.g. written by an older script),
+the CSV is read instead, with the same projection and filters applied.
+Set TABLE_FORMAT=csv to read and write CSV only.
+
+Usage:
+    from table_io import write_table, read_table
+
+    write_table(df_holdings, 'holdings')          # holdings.parquet + holdings.csv
+    df = read_table('holdings', columns=['TICKER', 'PORTFOLIOCODE'],
+                    filters=[('PORTFOLIOCODE', '==', 'FND0001')])
+
+    for part in iter_table('holdings', columns=['TICKER']):  # row-group sized batches
+        ...
+"""
+
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+import pandas as pd
+from path_helpers import get_csv_path, get_table_path
+from snowflake.schema_registry import coerce_frame, get_table_schema, read_table_csv
+from instrument import annotate, instrumented, record_bytes
+from dtype_policy import add_surrogate_keys, surrogate_columns
+
+TABLE_FORMAT = os.getenv("TABLE_FORMAT", "parquet").lower()
+COMPRESSION = "zstd"
+ROW_GROUP_ROWS = 100_000
+
+Filter = Tuple[str, str, object]
+
+
+def _match_columns_names(columns: Sequence[str], names: Sequence[str]) -> List[str]:
+    """Map (uppercase) registry column names onto the file's own column names."""
+    by_upper = {str(c).upper(): c for c in columns}
+    return [by_upper[n.upper()] for n in names if n.upper() in by_upper]
+
+
+def _match_columns(df: pd.DataFrame, names: Sequence[str]) -> List[str]:
+    """Map (uppercase) registry column names onto the frame's own column names."""
+    return _match_columns_names(df.columns, names)
+
+
+@instrumented()
+def write_table(df: pd.DataFrame, name: str, csv: bool = True,
+                sort_by: Optional[List[str]] = None,
+                row_group_rows: int = ROW_GROUP_ROWS) -> str:
+    """
+    Write `df` as CSVs/<name>.parquet (and CSVs/<name>.csv when csv=True).
+
+    Parameters:
+        name: table file stem, e.g. 'holdings'
+        sort_by: Parquet sort order; defaults to the registered clustering keys
+
+    Returns:
+        str: path of the primary file written
+    """
+    annotate(table=name)
+    csv_path = get_csv_path(f"{name}.csv")
+    if TABLE_FORMAT == "csv":
+        df.to_csv(csv_path, index=False)
+        record_bytes(csv_path)
+        return csv_path
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = get_table_schema(name)
+    typed = add_surrogate_keys(coerce_frame(df, schema), name) if schema is not None else df
+    if sort_by is None and schema is not None:
+        sort_by = _match_columns(typed, schema.cluster_by)
+    if sort_by:
+        typed = typed.sort_values(sort_by, kind="stable")
+
+    # CSV first, so the Parquet copy is never older than it (see read_table)
+    if csv:
+        df.to_csv(csv_path, index=False)
+        record_bytes(csv_path)
+    path = get_table_path(name, "parquet")
+    pq.write_table(pa.Table.from_pandas(typed, preserve_index=False), path,
+                   compression=COMPRESSION, row_group_size=row_group_rows,
+                   write_statistics=True)
+    record_bytes(path)
+    return path
+
+
+def _apply_filters(df: pd.DataFrame, filters: Optional[List[Filter]]) -> pd.DataFrame:
+    """Evaluate pyarrow-style AND filters on a DataFrame."""
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in filters:
+        s = df[col]
+        if op in ("==", "="):
+            mask &= s == value
+        elif op == "!=":
+            mask &= s != value
+        elif op == "<":
+            mask &= s < value
+        elif op == "<=":
+            mask &= s <= value
+        elif op == ">":
+            mask &= s > value
+        elif op == ">=":
+            mask &= s >= value
+        elif op == "in":
+            mask &= s.isin(value)
+        elif op == "not in":
+            mask &= ~s.isin(value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return df[mask.to_numpy()].reset_index(drop=True)
+
+
+def _use_parquet(name: str) -> bool:
+    """True when the Parquet copy exists and is at least as new as the CSV."""
+    csv_path = get_csv_path(f"{name}.csv")
+    parquet_path = get_table_path(name, "parquet")
+    return (
+        TABLE_FORMAT != "csv"
+        and os.path.exists(parquet_path)
+        and (not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path))
+    )
+
+
+def table_exists(name: str) -> bool:
+    return os.path.exists(get_csv_path(f"{name}.csv")) or _use_parquet(name)
+
+
+@instrumented()
+def read_table(name: str, columns: Optional[List[str]] = None,
+               filters: Optional[List[Filter]] = None) -> pd.DataFrame:
+    """
+    Read a generated table, preferring its Parquet copy.
+
+    Parameters:
+        name: table file stem, e.g. 'holdings'
+        columns: columns to decode (all but the SK columns when None)
+        filters: AND-ed (column, op, value) predicates, e.g.
+            [('HISTORY_DATE', '>=', pd.Timestamp('2020-01-01'))]
+
+    Returns:
+        pd.DataFrame
+    """
+    annotate(table=name)
+    csv_path = get_csv_path(f"{name}.csv")
+    parquet_path = get_table_path(name, "parquet")
+
+    surrogates = surrogate_columns(name)
+    if _use_parquet(name):
+        import pyarrow.parquet as pq
+        stored = pq.read_schema(parquet_path).names
+        if columns is None:
+            return pq.read_table(parquet_path, columns=[c for c in stored if c not in surrogates],
+                                 filters=filters).to_pandas()
+        # SK columns missing from an older Parquet copy are derived from their key
+        missing = [c for c in columns if c in surrogates and c not in stored]
+        wanted = [c for c in columns if c not in missing]
+        wanted += [c for c in _match_columns_names(stored, [surrogates[m] for m in missing]) if c not in wanted]
+        df = pq.read_table(parquet_path, columns=wanted, filters=filters).to_pandas()
+        return add_surrogate_keys(df, name)[columns] if missing else df
+
+    # CSV fallback: read filter and key columns too, then drop them after filtering
+    wanted = None
+    if columns is not None:
+        wanted = list(dict.fromkeys(list(columns) + [f[0] for f in filters or []]))
+        sources = [surrogates[c] for c in wanted if c in surrogates]
+        wanted = [c for c in wanted if c not in surrogates]
+        header = list(pd.read_csv(csv_path, nrows=0).columns) if sources else []
+        wanted += [c for c in _match_columns_names(header, sources) if c not in wanted]
+    if get_table_schema(name) is not None:
+        df = add_surrogate_keys(read_table_csv(name, csv_path, wanted), name)
+    else:
+        df = pd.read_csv(csv_path, usecols=wanted)
+    df = _apply_filters(df, filters)
+    return df[columns] if columns is not None else df[[c for c in df.columns if c not in surrogates]]
+
+
+def table_columns(name: str) -> List[str]:
+    """Column names of a generated table, read from the file header only."""
+    if _use_parquet(name):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(get_table_path(name, "parquet")).names)
+    return list(pd.read_csv(get_csv_path(f"{name}.csv"), nrows=0).columns)
+
+
+def iter_table(name: str, columns: Optional[List[str]] = None,
+               batch_rows: int = ROW_GROUP_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Stream a generated table in batches of at most `batch_rows` rows, so a
+    table larger than memory can be scanned once.
+
+    Parameters:
+        name: table file stem, e.g. 'holdings'
+        columns: columns to decode (all when None)
+
+    Yields:
+        pd.DataFrame per batch (registered types, as read_table returns them)
+    """
+    if _use_parquet(name):
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(get_table_path(name, "parquet"))
+        for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    schema = get_table_schema(name)
+    for chunk in pd.read_csv(get_csv_path(f"{name}.csv"), usecols=columns, chunksize=batch_rows):
+        yield coerce_frame(chunk, schema) if schema is not None else chunk